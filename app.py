@@ -1,7 +1,6 @@
 import streamlit as st
-from PIL import Image
-import requests
-from io import BytesIO
+
+import content
 
 # --- Configuration ---
 st.set_page_config(
@@ -10,888 +9,7 @@ st.set_page_config(
     initial_sidebar_state="expanded"
 )
 
-# --- Helper Functions ---
-def display_image_from_url(image_url, caption=""):
-    """Displays an image from a URL."""
-    try:
-        response = requests.get(image_url)
-        img = Image.open(BytesIO(response.content))
-        st.image(img, caption=caption, use_container_width=True)
-    except Exception as e:
-        st.error(f"Error loading image: {e}")
-
-def feature_card(icon, title, description):
-    """Creates a styled feature card."""
-    st.markdown(f"""
-    <div style="padding: 1.5rem; background: linear-gradient(135deg, #667eea 0%, #764ba2 100%); 
-                border-radius: 10px; margin: 1rem 0; color: white;">
-        <h3 style="margin: 0; color: white;">{icon} {title}</h3>
-        <p style="margin-top: 0.5rem; color: rgba(255,255,255,0.9);">{description}</p>
-    </div>
-    """, unsafe_allow_html=True)
-
 # --- Main Application ---
-st.title("🎯 Meticulous Systems")
-st.markdown("""
-<div style="font-size: 1.2rem; padding: 2rem; background: linear-gradient(135deg, #667eea 0%, #764ba2 100%); 
-            border-radius: 15px; color: white; margin-bottom: 2rem;">
-    <h2 style="color: white; margin-top: 0;">The Ultimate All-in-One Digital Business Platform</h2>
-    <p style="font-size: 1.1rem; line-height: 1.6;">
-    <strong>Meticulous Systems</strong> is your complete business solution that seamlessly integrates course creation, 
-    project management, appointment scheduling, customer relationship management, e-commerce, and powerful automations. 
-    Built for entrepreneurs, agencies, and businesses of all sizes who demand efficiency, scalability, and professional results.
-    </p>
-</div>
-""", unsafe_allow_html=True)
-
-# --- Tab Definitions ---
-tab_titles = [
-    "📚 Course Management",
-    "📊 Project Management", 
-    "📅 Appointments",
-    "🤝 CRM System",
-    "🛒 E-commerce",
-    "💰 Finance & Payments",
-    "📝 Forms & Funnels",
-    "🔗 Integrations",
-    "🎨 Page Builder",
-    "📈 Analytics & Reports",
-    "📁 Media Library"
-]
-
-tabs = st.tabs(tab_titles)
-
-# --- 1. Course Management (Academy LMS Pro) ---
-with tabs[0]:
-    st.header("📚 Advanced Learning Management System")
-    
-    st.markdown("""
-    ### Transform Your Knowledge Into Profitable Online Courses
-    
-    Meticulous Systems provides a **complete learning management solution** that rivals the best standalone LMS platforms. 
-    Whether you're an educator, coach, or enterprise trainer, our course management module gives you everything needed 
-    to create, deliver, and monetize educational content.
-    """)
-    
-    col1, col2 = st.columns(2)
-    
-    with col1:
-        st.markdown("""
-        #### 🎓 Core Course Features
-        - **Unlimited Course Creation**: Build as many courses as you need with no restrictions
-        - **Multi-Tier Content Structure**: Organize content into courses, modules, lessons, and topics
-        - **Rich Content Support**: Embed videos, audio, documents, quizzes, and interactive elements
-        - **Drip Content Scheduling**: Release lessons on a schedule to improve completion rates
-        - **Course Prerequisites**: Create learning paths by requiring course completion before advancement
-        - **Certificate Generation**: Automatically issue certificates upon course completion
-        - **Student Progress Tracking**: Monitor individual and group learning progress in real-time
-        - **Quiz & Assessment Engine**: Create multiple choice, true/false, and open-ended questions
-        - **Grading & Feedback System**: Provide detailed feedback and manual grading options
-        """)
-    
-    with col2:
-        st.markdown("""
-        #### 👨‍🏫 Instructor Management
-        - **Multi-Instructor Support**: Allow multiple teachers to manage courses
-        - **Instructor Profiles**: Showcase expertise with detailed instructor bios
-        - **Commission Settings**: Set up revenue sharing with course instructors
-        - **Performance Analytics**: Track instructor effectiveness and student satisfaction
-        - **Content Collaboration**: Enable team teaching and collaborative course creation
-        
-        #### 📊 Student Experience
-        - **Intuitive Student Dashboard**: Clean interface showing enrolled courses and progress
-        - **Personalized Learning Paths**: Recommend courses based on interests and history
-        - **Discussion Forums**: Foster community with course-specific discussion boards
-        - **Private Messaging**: Enable direct communication between students and instructors
-        - **Wishlist & Favorites**: Let students save courses for later enrollment
-        """)
-    
-    st.markdown("---")
-    st.subheader("Course Management Dashboard")
-    
-    col1, col2 = st.columns(2)
-    with col1:
-        display_image_from_url(
-            "https://hebbkx1anhila5yf.public.blob.vercel-storage.com/IMG_0376-50zas4gIR3kh7e7ym6rUCjgZz3hGjp.png",
-            "Performance Overview - Track sales and course metrics"
-        )
-    with col2:
-        display_image_from_url(
-            "https://hebbkx1anhila5yf.public.blob.vercel-storage.com/IMG_0370-FEG2x22kbqC3QmQh7ZKfrNjYNGZkO6.png",
-            "Sales Reports - Detailed revenue analytics"
-        )
-
-# --- 2. Project Management (WP Manager) ---
-with tabs[1]:
-    st.header("📊 Professional Project & Task Management")
-    
-    st.markdown("""
-    ### Keep Every Project On Track and On Budget
-    
-    Built for teams that need more than basic task lists, our **project management module** provides enterprise-grade 
-    tools for planning, executing, and delivering complex projects. From solo entrepreneurs to large teams, 
-    manage work efficiently with multiple views and collaboration features.
-    """)
-    
-    display_image_from_url(
-        "https://hebbkx1anhila5yf.public.blob.vercel-storage.com/IMG_0390-4HbOVpUTjqLZ0hV1EN8mnlvfAmdAy9.png",
-        "Project Task Management with Kanban Boards"
-    )
-    
-    col1, col2, col3 = st.columns(3)
-    
-    with col1:
-        feature_card("📋", "Task Lists", 
-                    "Create unlimited projects with detailed task lists, priorities, and status tracking")
-    
-    with col2:
-        feature_card("🎯", "Kanban Boards", 
-                    "Visualize workflow with drag-and-drop Kanban boards for agile project management")
-    
-    with col3:
-        feature_card("📅", "Gantt Charts", 
-                    "Plan timelines and track dependencies with interactive Gantt chart views")
-    
-    st.markdown("---")
-    
-    col1, col2 = st.columns(2)
-    
-    with col1:
-        st.markdown("""
-        #### 🎯 Project Features
-        - **Multiple Project Views**: Switch between list, board, timeline, and calendar views
-        - **Task Dependencies**: Link related tasks and create workflow dependencies
-        - **Milestone Tracking**: Set and monitor key project milestones
-        - **Time Tracking**: Built-in time logging for accurate project costing
-        - **File Attachments**: Attach documents, images, and files directly to tasks
-        - **Custom Fields**: Add project-specific fields for specialized tracking
-        - **Task Templates**: Save time with reusable task templates
-        - **Recurring Tasks**: Automate repetitive tasks with recurrence settings
-        - **Priority Levels**: Mark tasks as low, medium, high, or urgent priority
-        - **Progress Indicators**: Visual progress bars show completion status
-        """)
-    
-    with col2:
-        st.markdown("""
-        #### 👥 Team Collaboration
-        - **Team Member Assignment**: Assign tasks to specific team members
-        - **Role-Based Permissions**: Control who can view, edit, or delete projects
-        - **Discussion Threads**: Keep all project communication in one place
-        - **@Mentions**: Tag team members to get their attention
-        - **Activity Logs**: Track all changes and updates to projects
-        - **Email Notifications**: Automatic alerts for assignments and updates
-        - **Workload Management**: Balance team capacity with visual workload views
-        - **Guest Access**: Invite clients to view project progress without full access
-        - **Commenting System**: Discuss tasks with threaded comments
-        - **File Sharing**: Centralized file storage for all project documents
-        """)
-    
-    display_image_from_url(
-        "https://hebbkx1anhila5yf.public.blob.vercel-storage.com/IMG_0390-4HbOVpUTjqLZ0hV1EN8mnlvfAmdAy9.png",
-        "Active Projects Dashboard"
-    )
-
-    st.markdown("---")
-    st.subheader("Multiple Project Views")
-    display_image_from_url(
-        "https://hebbkx1anhila5yf.public.blob.vercel-storage.com/IMG_0390-4HbOVpUTjqLZ0hV1EN8mnlvfAmdAy9.png",
-        "Active Projects Dashboard - Task Lists, Kanban Boards & More"
-    )
-
-# --- 3. Appointments (Amelia Booking Pro) ---
-with tabs[2]:
-    st.header("📅 Smart Appointment Scheduling System")
-    
-    st.markdown("""
-    ### Automate Your Booking Process and Eliminate No-Shows
-    
-    Our **appointment scheduling system** is perfect for service-based businesses, consultants, healthcare providers, 
-    salons, and any business that takes bookings. Reduce no-shows with automated reminders and give clients 
-    24/7 self-service booking capabilities.
-    """)
-    
-    display_image_from_url(
-        "https://hebbkx1anhila5yf.public.blob.vercel-storage.com/IMG_0382-e4dsM2fpQ6vCqMKG0Qe6dMOdEiaomh.png",
-        "Services Management Dashboard"
-    )
-    
-    col1, col2 = st.columns(2)
-    
-    with col1:
-        st.markdown("""
-        #### 📅 Booking Features
-        - **Online Calendar**: Beautiful calendar interface for customers to book appointments
-        - **Service Categories**: Organize services into logical categories
-        - **Variable Duration**: Set different durations for different services
-        - **Buffer Times**: Add prep/cleanup time between appointments
-        - **Group Bookings**: Allow multiple people to book the same time slot
-        - **Recurring Appointments**: Enable weekly, monthly, or custom recurring bookings
-        - **Waiting Lists**: Automatically fill cancellations from waiting lists
-        - **Deposit Payments**: Require deposits at booking to reduce no-shows
-        - **Package Deals**: Sell bundles of appointments at discounted rates
-        - **Multiple Locations**: Manage bookings across different business locations
-        """)
-    
-    with col2:
-        st.markdown("""
-        #### 👨‍💼 Employee Management
-        - **Staff Scheduling**: Assign services to specific team members
-        - **Employee Calendars**: Individual calendars for each staff member
-        - **Availability Settings**: Set working hours, breaks, and time off
-        - **Capacity Management**: Limit appointments per staff member
-        - **Employee Services**: Assign specialized services to qualified staff
-        - **Performance Tracking**: Monitor bookings per employee
-        
-        #### 🔔 Smart Notifications
-        - **Email Reminders**: Automated email confirmations and reminders
-        - **SMS Notifications**: Text message reminders to reduce no-shows
-        - **WhatsApp Integration**: Send booking confirmations via WhatsApp
-        - **Customizable Templates**: Brand your notification messages
-        - **Multi-Language Support**: Send notifications in customer's language
-        """)
-    
-    st.markdown("---")
-    st.subheader("Team & Employee Management")
-    display_image_from_url(
-        "https://hebbkx1anhila5yf.public.blob.vercel-storage.com/IMG_0381-f6zUEOTAyHNyc87YrT4ejVhrEBqauS.png",
-        "Employee Management - Staff Members, Scheduling & Availability"
-    )
-    
-    st.markdown("---")
-    st.subheader("🎨 Customer Booking Experience")
-    st.markdown("""
-    - **Modern Booking Widget**: Embed a beautiful booking form on any page
-    - **Calendar Sync**: Automatic sync with Google Calendar, Outlook, and iCal
-    - **Time Zone Detection**: Automatically adjusts for customer time zones
-    - **Mobile Responsive**: Perfect booking experience on all devices
-    - **Customer Portal**: Clients can view and manage their appointments
-    - **Rescheduling**: Easy self-service rescheduling reduces admin work
-    - **Cancellation Policies**: Set cancellation rules and deadlines
-    - **Custom Fields**: Collect specific information at booking time
-    """)
-
-# --- 4. CRM (Fluent CRM Pro) ---
-with tabs[3]:
-    st.header("🤝 Customer Relationship Management")
-    
-    st.markdown("""
-    ### Build Stronger Relationships and Drive More Sales
-    
-    Our **CRM system** gives you a complete view of every customer interaction. Track leads through your sales funnel, 
-    segment audiences for targeted marketing, and automate follow-ups to never miss an opportunity.
-    """)
-    
-    col1, col2 = st.columns(2)
-    
-    with col1:
-        st.markdown("""
-        #### 👥 Contact Management
-        - **Unlimited Contacts**: Store unlimited customer and prospect data
-        - **Custom Fields**: Track any data point important to your business
-        - **Contact Tagging**: Organize contacts with unlimited tags
-        - **List Segmentation**: Create dynamic lists based on any criteria
-        - **Activity Timeline**: See all interactions with each contact in one place
-        - **Contact Scoring**: Automatically score leads based on engagement
-        - **Duplicate Detection**: Prevent duplicate contact entries
-        - **Import/Export**: Bulk import from CSV and export contact data
-        - **Contact Notes**: Add internal notes visible only to your team
-        - **Contact Assignments**: Assign contacts to specific team members
-        """)
-    
-    with col2:
-        st.markdown("""
-        #### 📧 Email Marketing
-        - **Campaign Builder**: Create beautiful email campaigns with drag-and-drop editor
-        - **Email Templates**: Professional templates for every occasion
-        - **A/B Testing**: Test subject lines and content for better results
-        - **Automation Sequences**: Drip campaigns that run on autopilot
-        - **Personalization**: Dynamic content based on contact data
-        - **Delivery Optimization**: Smart sending times for better open rates
-        - **Unsubscribe Management**: Automatic compliance with email regulations
-        - **Email Analytics**: Track opens, clicks, and conversions
-        - **Spam Testing**: Check emails before sending to improve deliverability
-        - **List Cleaning**: Automatically remove inactive subscribers
-        """)
-    
-    st.markdown("---")
-    
-    col1, col2, col3 = st.columns(3)
-    
-    with col1:
-        feature_card("🎯", "Lead Generation", 
-                    "Capture leads from forms, landing pages, and integrate with all marketing channels")
-    
-    with col2:
-        feature_card("🔄", "Sales Pipeline", 
-                    "Visual pipeline to track deals from prospect to closed customer")
-    
-    with col3:
-        feature_card("📊", "Reports & Analytics", 
-                    "Comprehensive reports on customer lifetime value, retention, and engagement")
-    
-    st.markdown("""
-    #### 🤖 Marketing Automation
-    - **Behavioral Triggers**: Automate actions based on customer behavior
-    - **Conditional Logic**: Create complex automation workflows with if/then logic
-    - **Multi-Channel Campaigns**: Coordinate email, SMS, and web experiences
-    - **Goal Tracking**: Measure automation performance against business goals
-    - **Journey Mapping**: Visualize customer journeys through your funnels
-    - **Smart Delays**: Add timing delays for natural communication flow
-    - **Action Triggers**: Trigger automations from purchases, clicks, page visits, and more
-    """)
-
-# --- 5. E-commerce (WooCommerce) ---
-with tabs[4]:
-    st.header("🛒 Complete E-commerce Platform")
-    
-    st.markdown("""
-    ### Sell Physical Products, Digital Goods, and Subscriptions
-    
-    Turn your website into a powerful **online store** with unlimited selling capabilities. From simple product catalogs 
-    to complex subscription models, our e-commerce module handles everything you need to sell online.
-    """)
-    
-    display_image_from_url(
-        "https://hebbkx1anhila5yf.public.blob.vercel-storage.com/IMG_0376-50zas4gIR3kh7e7ym6rUCjgZz3hGjp.png",
-        "E-commerce Overview Dashboard - Sales, Orders & Performance Metrics"
-    )
-    
-    col1, col2 = st.columns(2)
-    
-    with col1:
-        st.markdown("""
-        #### 🏪 Store Management
-        - **Unlimited Products**: List as many products as your business needs
-        - **Product Variations**: Size, color, and custom variation options
-        - **Digital Downloads**: Sell ebooks, software, music, and digital content
-        - **Subscription Products**: Recurring billing for subscription boxes and memberships
-        - **Bundle Products**: Create product bundles and kits
-        - **Inventory Tracking**: Real-time stock management with low stock alerts
-        - **SKU Management**: Unique identifiers for all product variants
-        - **Backorder Settings**: Allow orders when out of stock
-        - **Product Categories**: Organize with unlimited nested categories
-        - **Product Tags**: Tag products for better search and filtering
-        - **Related Products**: Automatic and manual product recommendations
-        - **Product Reviews**: Built-in review system with moderation
-        """)
-    
-    with col2:
-        st.markdown("""
-        #### 💳 Payment & Checkout
-        - **Multiple Payment Gateways**: Accept Stripe, PayPal, and 100+ payment methods
-        - **One-Click Checkout**: Speed up purchases with saved payment methods
-        - **Guest Checkout**: Allow purchases without account creation
-        - **Cart Recovery**: Email abandoned cart reminders automatically
-        - **Coupon System**: Create percentage, fixed, and conditional discount codes
-        - **Tax Calculation**: Automatic tax calculation by location
-        - **Shipping Zones**: Configure shipping rates by region
-        - **Free Shipping Rules**: Set conditions for free shipping offers
-        - **Digital Delivery**: Automatic delivery of digital products
-        - **Invoice Generation**: Automatic invoice creation for all orders
-        - **Refund Processing**: Easy refund management from admin panel
-        - **Multi-Currency**: Sell in multiple currencies worldwide
-        """)
-    
-    st.markdown("---")
-    st.subheader("Product Organization & Tags")
-    display_image_from_url(
-        "https://hebbkx1anhila5yf.public.blob.vercel-storage.com/IMG_0373-1UfNgnp2iBKxccZpIIFtM64onnIn2F.png",
-        "Product Tags Management - Organize products with tags and slugs"
-    )
-    
-    st.markdown("---")
-    
-    st.subheader("Product Attributes & Variations")
-    display_image_from_url(
-        "https://hebbkx1anhila5yf.public.blob.vercel-storage.com/IMG_0374-ESzBTzR3iJOQ2Rb2YMdV9UWcpgVaBr.png",
-        "Product Attributes Configuration - Size, color, and custom variations"
-    )
-    
-    st.markdown("""
-    #### 👥 Customer Management
-    - **Customer Accounts**: Customer portal for order history and tracking
-    - **Wishlist Feature**: Let customers save products for later
-    - **Purchase History**: Complete order history for every customer
-    - **Loyalty Programs**: Reward repeat customers with points and discounts
-    - **Customer Groups**: Segment customers for targeted pricing and promotions
-    - **Lifetime Value Tracking**: Monitor customer lifetime value and profitability
-    """)
-
-# --- 6. Finance & Payments ---
-with tabs[5]:
-    st.header("💰 Financial Management & Tracking")
-    
-    st.markdown("""
-    ### Take Control of Your Business Finances
-    
-    Monitor cash flow, track payments, and manage invoicing all in one place. Our **finance module** provides 
-    the visibility you need to make informed business decisions.
-    """)
-    
-    display_image_from_url(
-        "https://hebbkx1anhila5yf.public.blob.vercel-storage.com/IMG_0385-sV7VspVgRJVLz5wUSVC4XQ2ZhNA8GZ.png",
-        "Finance Dashboard - Payment & Invoice Tracking"
-    )
-    
-    col1, col2 = st.columns(2)
-    
-    with col1:
-        st.markdown("""
-        #### 💵 Payment Processing
-        - **Centralized Payment View**: All payments from all sources in one dashboard
-        - **Payment Status Tracking**: Monitor pending, completed, and failed payments
-        - **Multiple Payment Methods**: Support all major payment processors
-        - **Recurring Billing**: Automate subscription and membership billing
-        - **Payment Reminders**: Automatic reminders for overdue invoices
-        - **Payment Reports**: Detailed reports on payment performance
-        - **Refund Management**: Process refunds with complete audit trails
-        - **Payment Disputes**: Handle chargebacks and disputes efficiently
-        """)
-    
-    with col2:
-        st.markdown("""
-        #### 🧾 Invoicing System
-        - **Professional Invoices**: Automatically generated branded invoices
-        - **Custom Invoice Numbers**: Sequential numbering with custom prefixes
-        - **Invoice Templates**: Multiple templates for different business needs
-        - **Due Date Tracking**: Monitor overdue invoices automatically
-        - **Invoice Reminders**: Automatic payment reminder emails
-        - **Partial Payments**: Accept installment payments on invoices
-        - **Credit Notes**: Issue credit notes for returns and adjustments
-        - **Tax Management**: Automatic tax calculation and reporting
-        - **PDF Invoices**: Download and email PDF invoices
-        - **Payment Links**: Shareable payment links for easy collection
-        """)
-    
-    st.markdown("""
-    #### 📊 Financial Reporting
-    - **Revenue Reports**: Track revenue by day, week, month, or custom period
-    - **Expense Tracking**: Log and categorize business expenses
-    - **Profit & Loss**: Generate P&L statements automatically
-    - **Sales Tax Reports**: Simplify tax filing with automated reports
-    - **Commission Tracking**: Monitor affiliate and sales team commissions
-    - **Financial Forecasting**: Project future revenue based on trends
-    - **Export Capabilities**: Export financial data to accounting software
-    """)
-
-# --- 7. Forms & Funnels ---
-with tabs[6]:
-    st.header("📝 Form Builder & Sales Funnels")
-    
-    st.markdown("""
-    ### Convert Visitors Into Customers With Optimized Funnels
-    
-    Create high-converting forms and multi-step sales funnels without coding. Our **form and funnel builder** 
-    integrates seamlessly with all other modules to capture leads and drive sales.
-    """)
-    
-    col1, col2 = st.columns(2)
-    
-    with col1:
-        st.markdown("""
-        #### 📋 Advanced Form Builder
-        - **Drag & Drop Builder**: Create complex forms with an intuitive visual builder
-        - **40+ Form Fields**: Text, email, file upload, payment, and custom fields
-        - **Multi-Step Forms**: Break long forms into steps to improve completion rates
-        - **Conditional Logic**: Show/hide fields based on user responses
-        - **Form Templates**: Start with professional templates for common use cases
-        - **Payment Integration**: Accept payments directly through forms
-        - **File Uploads**: Allow users to upload documents and images
-        - **Electronic Signatures**: Collect legally binding signatures
-        - **Form Analytics**: Track views, starts, completions, and conversions
-        - **Spam Protection**: Built-in captcha and honeypot spam prevention
-        - **Email Notifications**: Send form submissions to multiple recipients
-        - **Confirmation Messages**: Custom success messages and redirects
-        - **Save & Resume**: Let users save progress and return later
-        """)
-    
-    with col2:
-        st.markdown("""
-        #### 🎯 Sales Funnel Builder
-        - **Visual Funnel Designer**: Map out customer journeys visually
-        - **Landing Page Templates**: High-converting landing page designs
-        - **Order Bumps**: Increase average order value with one-click upsells
-        - **One-Click Upsells**: Offer additional products after initial purchase
-        - **Down-Sells**: Alternative offers for customers who decline upsells
-        - **A/B Testing**: Test different funnel variations for optimal performance
-        - **Analytics Dashboard**: Track funnel performance and conversion rates
-        - **Checkout Optimization**: Multi-step checkout for better conversions
-        - **Exit Intent Popups**: Capture leaving visitors with special offers
-        - **Funnel Templates**: Pre-built funnels for common business models
-        - **Mobile Optimization**: Funnels that convert on all devices
-        - **Thank You Pages**: Custom post-purchase experiences
-        """)
-    
-    st.markdown("""
-    #### 🔗 Integration Capabilities
-    - **CRM Integration**: Automatically add form submissions to your CRM
-    - **Email Marketing Sync**: Add subscribers to email lists instantly
-    - **Payment Processing**: Collect payments through forms and funnels
-    - **Webhook Support**: Connect to external services via webhooks
-    - **Zapier Integration**: Connect to 3,000+ apps through Zapier
-    - **Calendar Integration**: Schedule appointments directly from forms
-    - **Course Enrollment**: Automatically enroll students from forms
-    """)
-
-# --- 8. Integrations (BitIntegrations Pro) ---
-with tabs[7]:
-    st.header("🔗 System Integrations & Automation Engine")
-    
-    st.markdown("""
-    ### Connect Everything and Automate Workflows
-    
-    The real power of Meticulous Systems comes from its **integration and automation capabilities**. 
-    With hundreds of pre-built integrations and a flexible automation engine, connect all your tools 
-    and eliminate manual data entry forever.
-    """)
-    
-    col1, col2, col3 = st.columns(3)
-    
-    with col1:
-        st.markdown("""
-        #### 📧 Marketing Integrations
-        - Email Marketing Platforms
-        - Marketing Automation Tools
-        - SMS Marketing Services
-        - Social Media Platforms
-        - Advertising Networks
-        - Analytics Platforms
-        - Webinar Software
-        - Landing Page Builders
-        """)
-    
-    with col2:
-        st.markdown("""
-        #### 💼 Business Tools
-        - CRM Systems
-        - Project Management
-        - Team Communication
-        - File Storage Services
-        - Accounting Software
-        - Payment Processors
-        - Invoicing Tools
-        - HR & Payroll Systems
-        """)
-    
-    with col3:
-        st.markdown("""
-        #### 🛠️ Developer Tools
-        - Webhook Support
-        - API Access
-        - Custom Integrations
-        - Database Connections
-        - Cloud Services
-        - Development Platforms
-        - Version Control
-        - CI/CD Tools
-        """)
-    
-    st.markdown("---")
-    
-    st.subheader("🤖 Automation Workflows")
-    st.markdown("""
-    Create powerful automation workflows that trigger based on any action in your system:
-    
-    - **Trigger-Based Automation**: When X happens, automatically do Y
-    - **Multi-Step Workflows**: Chain multiple actions together in sequence
-    - **Conditional Branching**: Different actions based on specific conditions
-    - **Delays & Scheduling**: Add time delays between actions
-    - **Data Transformation**: Format and transform data between systems
-    - **Error Handling**: Automatic retry and fallback options
-    - **Workflow Templates**: Pre-built workflows for common scenarios
-    - **Testing Mode**: Test workflows before activating them
-    - **Activity Logs**: Complete logs of all automation executions
-    - **Performance Metrics**: Track automation success rates and timing
-    """)
-    
-    col1, col2 = st.columns(2)
-    
-    with col1:
-        feature_card("⚡", "Instant Sync", 
-                    "Real-time data synchronization between all connected systems")
-    
-    with col2:
-        feature_card("🔒", "Secure Connections", 
-                    "Enterprise-grade security for all integration connections")
-    
-    st.markdown("""
-    #### Common Automation Examples
-    1. **New Customer Onboarding**: When someone purchases, add them to CRM, enroll in welcome course, and start email sequence
-    2. **Lead Nurturing**: When form is submitted, add to CRM, tag based on interests, and trigger drip campaign
-    3. **Appointment Follow-up**: After appointment, send thank you email, request review, and schedule follow-up
-    4. **Course Completion**: When student completes course, issue certificate, add to graduate list, and recommend next course
-    5. **Order Fulfillment**: When order is placed, update inventory, notify warehouse, add customer to post-purchase sequence
-    6. **Project Management**: When task is completed, notify team, update client, and create invoice
-    """)
-
-# --- 9. Page Builder (Divi) ---
-with tabs[8]:
-    st.header("🎨 Visual Page Builder & Design System")
-    
-    st.markdown("""
-    ### Design Beautiful Websites Without Code
-    
-    Create stunning, professional websites with our **visual page builder**. No coding required - 
-    just drag, drop, and customize to create exactly what you envision.
-    """)
-    
-    col1, col2 = st.columns(2)
-    
-    with col1:
-        st.markdown("""
-        #### 🎨 Design Features
-        - **Drag & Drop Editor**: Intuitive visual editor with real-time preview
-        - **500+ Pre-Made Layouts**: Professional templates for every industry
-        - **40+ Content Modules**: Buttons, images, galleries, forms, pricing tables, and more
-        - **Global Elements**: Create once, use everywhere, update globally
-        - **Custom CSS Control**: Add custom CSS for advanced styling
-        - **Animation Effects**: Entrance animations and scroll effects
-        - **Hover Effects**: Interactive hover states for engaging experiences
-        - **Color Customization**: Unlimited color options with color picker
-        - **Typography Control**: Google Fonts integration with advanced typography settings
-        - **Responsive Design**: Perfect display on desktop, tablet, and mobile
-        - **Mobile-Specific Editing**: Different layouts for different screen sizes
-        - **Undo/Redo**: Unlimited undo/redo for worry-free design
-        """)
-    
-    with col2:
-        st.markdown("""
-        #### 🏗️ Layout Options
-        - **Section & Row System**: Flexible grid-based layout system
-        - **Custom Column Layouts**: Any column configuration imaginable
-        - **Full-Width Sections**: Break out of containers for impact
-        - **Parallax Scrolling**: Engaging depth effects on scroll
-        - **Background Options**: Colors, gradients, images, videos, and patterns
-        - **Border & Shadow Controls**: Precise styling for all elements
-        - **Spacing Controls**: Pixel-perfect padding and margin control
-        
-        #### 🚀 Performance Features
-        - **Lazy Loading**: Images load as users scroll for faster pages
-        - **Code Optimization**: Clean, lightweight code for fast loading
-        - **Critical CSS**: Inline critical CSS for instant rendering
-        - **Module Disable**: Turn off unused features to reduce load
-        - **CDN Integration**: Serve assets from global CDN for speed
-        """)
-    
-    st.markdown("""
-    #### 📱 Pre-Built Layout Packs
-    - **Landing Pages**: High-converting landing page templates
-    - **Business Websites**: Complete website templates for all industries
-    - **Portfolio Layouts**: Showcase work with beautiful gallery layouts
-    - **Blog Designs**: Magazine-style and minimal blog layouts
-    - **E-commerce Pages**: Product showcases and checkout pages
-    - **Course Pages**: Educational content and course landing pages
-    - **About Pages**: Team showcases and company story templates
-    - **Contact Pages**: Contact forms with maps and information
-    """)
-
-# --- 10. Analytics & Reports ---
-with tabs[9]:
-    st.header("📈 Analytics & Business Intelligence")
-    
-    st.markdown("""
-    ### Make Data-Driven Decisions With Comprehensive Reporting
-    
-    Understanding your business performance is critical to growth. Our **analytics and reporting module** 
-    provides deep insights into every aspect of your operations.
-    """)
-    
-    display_image_from_url(
-        "https://hebbkx1anhila5yf.public.blob.vercel-storage.com/IMG_0370-FEG2x22kbqC3QmQh7ZKfrNjYNGZkO6.png",
-        "Sales Reports & Analytics Dashboard - Comprehensive business insights"
-    )
-    
-    col1, col2 = st.columns(2)
-    
-    with col1:
-        st.markdown("""
-        #### 📊 E-commerce Analytics
-        - **Revenue Reports**: Daily, weekly, monthly revenue tracking
-        - **Product Performance**: Best and worst-selling products
-        - **Customer Analytics**: New vs returning customers
-        - **Average Order Value**: Track AOV trends over time
-        - **Conversion Rates**: Monitor funnel conversion rates
-        - **Cart Abandonment**: Identify and recover lost sales
-        - **Refund Reports**: Track refunds and return rates
-        - **Inventory Reports**: Stock levels and turnover rates
-        - **Sales by Category**: Performance by product category
-        - **Tax Reports**: Automated tax collection reports
-        """)
-    
-    with col2:
-        st.markdown("""
-        #### 🎓 Course Analytics
-        - **Enrollment Reports**: New enrollments over time
-        - **Completion Rates**: Course completion percentages
-        - **Student Progress**: Individual and group progress tracking
-        - **Quiz Performance**: Average scores and question analysis
-        - **Engagement Metrics**: Time spent, lessons completed
-        - **Revenue by Course**: Which courses generate the most revenue
-        - **Instructor Performance**: Ratings and student satisfaction
-        - **Certificate Issuance**: Tracking of issued certificates
-        """)
-    
-    st.markdown("---")
-    
-    st.subheader("Performance Dashboard Views")
-    col1, col2 = st.columns(2)
-    with col1:
-        display_image_from_url(
-            "https://hebbkx1anhila5yf.public.blob.vercel-storage.com/IMG_0376-50zas4gIR3kh7e7ym6rUCjgZz3hGjp.png",
-            "Overview Dashboard - Key performance indicators"
-        )
-    with col2:
-        display_image_from_url(
-            "https://hebbkx1anhila5yf.public.blob.vercel-storage.com/IMG_0370-FEG2x22kbqC3QmQh7ZKfrNjYNGZkO6.png",
-            "Sales by Date - Track revenue trends over time"
-        )
-    
-    col1, col2 = st.columns(2)
-    
-    with col1:
-        st.markdown("""
-        #### 📅 Appointment Analytics
-        - **Booking Volume**: Appointments scheduled over time
-        - **No-Show Rates**: Track and reduce no-shows
-        - **Service Performance**: Most and least booked services
-        - **Employee Utilization**: Capacity and booking rates per staff
-        - **Revenue by Service**: Income generated per service type
-        - **Peak Times**: Identify busiest booking times
-        - **Cancellation Analysis**: Reasons and patterns for cancellations
-        """)
-    
-    with col2:
-        st.markdown("""
-        #### 🤝 CRM Analytics
-        - **Lead Sources**: Where your best leads come from
-        - **Pipeline Performance**: Conversion rates by stage
-        - **Customer Lifetime Value**: CLV calculations and trends
-        - **Email Campaign Performance**: Opens, clicks, conversions
-        - **Contact Growth**: Database growth over time
-        - **Engagement Scores**: Contact engagement metrics
-        - **Sales Team Performance**: Individual and team metrics
-        """)
-    
-    st.markdown("""
-    #### 📑 Report Features
-    - **Custom Date Ranges**: Analyze any time period
-    - **Comparison Views**: Compare periods side-by-side
-    - **Export Capabilities**: Export to PDF, CSV, or Excel
-    - **Scheduled Reports**: Email reports automatically
-    - **Dashboard Widgets**: Customizable dashboard views
-    - **Real-Time Updates**: Live data refreshing
-    - **Goal Tracking**: Set and monitor business goals
-    - **Forecasting**: Predictive analytics for planning
-    """)
-
-# --- 11. Media Library ---
-with tabs[10]:
-    st.header("📁 Centralized Media Management")
-    
-    st.markdown("""
-    ### Organize and Manage All Your Digital Assets
-    
-    Keep all your images, videos, documents, and files organized in one central **media library**. 
-    Easily find, edit, and use media across your entire platform.
-    """)
-    
-    display_image_from_url(
-        "https://hebbkx1anhila5yf.public.blob.vercel-storage.com/IMG_0396-7AJiOtv3pzGKyVzTjw9tQ6OMvv8dW6.png",
-        "Media Library - Centralized Asset Management with images and videos"
-    )
-    
-    col1, col2 = st.columns(2)
-    
-    with col1:
-        st.markdown("""
-        #### 📸 Media Features
-        - **Unlimited Storage**: Store as many files as you need
-        - **Multiple File Types**: Images, videos, PDFs, documents, audio files
-        - **Grid & List Views**: Switch between visual grid and detailed list view
-        - **Drag & Drop Upload**: Easy file uploading with drag and drop
-        - **Bulk Upload**: Upload multiple files at once
-        - **Search & Filter**: Find files quickly with powerful search
-        - **Folders & Organization**: Organize files into custom folders
-        - **File Details**: View file size, dimensions, upload date
-        - **Quick Edit**: Crop, resize, and adjust images in the browser
-        - **Alternative Text**: Add alt text for accessibility and SEO
-        """)
-    
-    with col2:
-        st.markdown("""
-        #### 🎥 Video Management
-        - **Video Hosting**: Host videos directly in the platform
-        - **Video Thumbnails**: Automatic thumbnail generation
-        - **Streaming Support**: Adaptive streaming for smooth playback
-        - **External Embeds**: Integrate YouTube, Vimeo, and other platforms
-        - **Video Player**: Customizable video player with controls
-        
-        #### 🔒 Access & Permissions
-        - **Permission Controls**: Control who can upload and delete files
-        - **Private Files**: Mark files as private or public
-        - **Usage Tracking**: See where each file is used
-        - **Version History**: Keep track of file versions
-        - **Duplicate Detection**: Avoid duplicate uploads
-        - **Secure Delivery**: Protected file delivery for paid content
-        """)
-    
-    st.markdown("---")
-    st.subheader("🎬 Complete Media Asset Overview")
-    display_image_from_url(
-        "https://hebbkx1anhila5yf.public.blob.vercel-storage.com/IMG_0396-7AJiOtv3pzGKyVzTjw9tQ6OMvv8dW6.png",
-        "Full Media Library View - Store and organize all your digital assets"
-    )
-    
-    st.markdown("""
-    ### Media Library Capabilities
-    The media library shown above demonstrates the comprehensive asset management system with:
-    - **Visual Grid Layout**: Easily browse through images and videos
-    - **Multiple File Types**: Support for images, videos, documents, and more
-    - **Quick Preview**: Thumbnail previews for instant recognition
-    - **Organized Storage**: Keep all marketing materials, course content, and business assets in one place
-    - **Fast Search**: Find any file quickly with intelligent search
-    """)
-    
-    st.markdown("""
-    #### 🖼️ Image Optimization
-    - **Automatic Resizing**: Generate multiple sizes for responsive images
-    - **Lazy Loading**: Load images as users scroll for better performance
-    - **Format Conversion**: Automatic WebP conversion for modern browsers
-    - **Compression**: Smart compression for faster loading without quality loss
-    - **CDN Integration**: Serve images from global CDN for speed
-    """)
-
-# --- Footer ---
-st.markdown("---")
-st.markdown("""
-<div style="text-align: center; padding: 2rem; background: #f8f9fa; border-radius: 10px; margin-top: 2rem;">
-    <h2 style="color: #667eea;">Ready to Transform Your Business?</h2>
-    <p style="font-size: 1.1rem; color: #666;">
-    Meticulous Systems brings together everything you need to run a modern digital business. 
-    From courses and e-commerce to CRM and automations, it's all integrated and ready to scale with you.
-    </p>
-    <p style="margin-top: 1rem;">
-    <strong>One Platform. Unlimited Possibilities. </strong>
-    </p>
-</div>
-""", unsafe_allow_html=True)
-
-st.sidebar.markdown("---")
-st.sidebar.info("🚀 **Meticulous Systems** v2.0 - All-in-One Business Platform")
-st.sidebar.markdown("""
-### Quick Navigation
-Use the tabs above to explore each module in detail.
-
-### Platform Highlights
-- ✅ Course Management
-- ✅ Project Tools  
-- ✅ Appointments
-- ✅ CRM System
-- ✅ E-commerce
-- ✅ Finance Tools
-- ✅ Forms & Funnels
-- ✅ Integrations
-- ✅ Page Builder
-- ✅ Analytics
-- ✅ Media Library
-""")
+# Every module's copy, cards and screenshots live in content.json under
+# "showcase"; content.py compiles them once and replays the selected module.
+content.render_app("showcase")
@@ -0,0 +1,179 @@
+"""Maps screenshot references (blob-store URLs, paths or file names) onto the bundled images/ directory."""
+import base64
+import functools
+import json
+import math
+import os
+
+# --- Configuration ---
+IMAGES_DIR = os.environ.get(
+    "METSYS_IMAGES_DIR", os.path.join(os.path.dirname(os.path.abspath(__file__)), "images")
+)
+MANIFEST_PATH = os.environ.get("METSYS_MANIFEST", os.path.join(IMAGES_DIR, "manifest.json"))
+# Responsive derivatives written by tools/build_derivatives.py.
+DERIVED_DIR = os.path.join(IMAGES_DIR, "derived")
+DERIVED_INDEX = os.path.join(DERIVED_DIR, "index.json")
+# Widths that exactly fill a 3-, 2- and 1-column slot of the widest content area
+# Streamlit renders (MAXIMUM_CONTENT_WIDTH, i.e. 730px at 2x density).
+DISPLAY_WIDTH = 1460
+VARIANT_WIDTHS = (496, 736, 1104, 1460)
+VARIANT_FORMATS = tuple(os.environ.get("METSYS_IMAGE_FORMATS", "avif,webp").split(","))
+MIME_TYPES = {"avif": "image/avif", "webp": "image/webp", "png": "image/png", "jpeg": "image/jpeg"}
+# Fingerprinted copies written by tools/publish_static.py, served by Streamlit's static
+# file serving (server.enableStaticServing) at /app/static/img/, or by any web server or
+# CDN that static/img/ is synced to when METSYS_STATIC_URL points there.
+STATIC_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "static", "img")
+STATIC_INDEX = os.path.join(STATIC_DIR, "index.json")
+STATIC_URL = os.environ.get("METSYS_STATIC_URL", "/app/static/img/")
+# Reference published copies by URL instead of sending image bytes over the websocket.
+STATIC_IMAGES = os.environ.get("METSYS_STATIC_IMAGES", "") == "1"
+# Strict offline mode: never touch the network, even when a bundled file is missing.
+OFFLINE = os.environ.get("METSYS_OFFLINE", "") == "1"
+
+
+class AssetNotAvailable(FileNotFoundError):
+    """Raised when an image is neither bundled locally nor allowed to come from the network."""
+
+
+def is_url(ref):
+    return ref.startswith(("http://", "https://"))
+
+
+def load_manifest(path=MANIFEST_PATH):
+    """Loads the asset manifest, or an empty one if the file does not exist."""
+    try:
+        with open(path) as f:
+            return json.load(f)
+    except FileNotFoundError:
+        return {"assets": {}}
+
+
+def load_variants(path=DERIVED_INDEX):
+    """Loads the derivative index, or an empty one if the pipeline has not been run."""
+    try:
+        with open(path) as f:
+            return json.load(f)
+    except FileNotFoundError:
+        return {"sources": {}}
+
+
+def load_static_index(path=STATIC_INDEX):
+    """Loads the index of published static copies, or an empty one if nothing is published."""
+    return load_variants(path)
+
+
+def pick_variant(candidates, columns):
+    """Returns the smallest of `candidates` that fills a slot 1/`columns` of the page wide.
+
+    Falls back to the widest candidate when none is wide enough, and prefers the
+    smaller file between formats of the same width.
+    """
+    target = math.ceil(DISPLAY_WIDTH / columns)
+    fitting = [v for v in candidates if v["width"] >= target]
+    width = min(v["width"] for v in fitting) if fitting else max(v["width"] for v in candidates)
+    return min((v for v in candidates if v["width"] == width), key=lambda v: v["bytes"])
+
+
+@functools.lru_cache(maxsize=256)
+def data_uri(path, mime):
+    """Returns a file's contents as a data: URI, which st.image passes through untouched."""
+    with open(path, "rb") as f:
+        return f"data:{mime};base64,{base64.b64encode(f.read()).decode('ascii')}"
+
+
+class AssetResolver:
+    """Serves bundled files when available and hands out network URLs only on a miss."""
+
+    def __init__(self, manifest, images_dir=IMAGES_DIR, offline=OFFLINE, variants=None, static=None):
+        self.assets = manifest["assets"]
+        self.images_dir = images_dir
+        self.offline = offline
+        self.variants = (variants or {"sources": {}})["sources"]
+        self.static = (static or {"sources": {}})["sources"]
+        self.by_url = {entry["url"]: name for name, entry in self.assets.items() if entry.get("url")}
+        self._verified = {}
+
+    def name(self, ref):
+        """Returns the images/ file name `ref` refers to, or None for an unknown URL."""
+        return self.by_url.get(ref) if is_url(ref) else os.path.basename(ref)
+
+    def local_path(self, ref):
+        """Returns the bundled file behind `ref`, or None if there isn't one."""
+        if not is_url(ref) and os.path.isfile(ref):
+            return ref
+        name = self.name(ref)
+        if name is None:
+            return None
+        path = os.path.join(self.images_dir, name)
+        return path if os.path.isfile(path) else None
+
+    def info(self, ref):
+        """Returns the manifest entry (sha256, bytes, mime, width, height) for `ref`'s bundled file.
+
+        Entries are trusted only while the file's size still matches, checked once per file,
+        so a stale manifest degrades to sniffing rather than to wrong dimensions.
+        """
+        name = self.name(ref)
+        if name not in self._verified:
+            entry = self.assets.get(name, {})
+            path = os.path.join(self.images_dir, name) if name else None
+            fresh = "sha256" in entry and path and os.path.isfile(path) and os.path.getsize(path) == entry["bytes"]
+            self._verified[name] = entry if fresh else None
+        return self._verified[name]
+
+    def variant(self, ref, columns=1, formats=VARIANT_FORMATS):
+        """Returns the smallest derivative that fills a slot 1/`columns` of the page wide, or None.
+
+        The result is a dict with the variant's `path`, `mime`, `width` and `height`.
+        """
+        entry = self.variants.get(self.name(ref))
+        if not entry:
+            return None
+        candidates = [v for v in entry["variants"] if v["format"] in formats]
+        if not candidates:
+            return None
+        best = pick_variant(candidates, columns)
+        path = os.path.join(self.images_dir, "derived", best["file"])
+        if not os.path.isfile(path):
+            return None
+        return {"path": path, "mime": MIME_TYPES[best["format"]], "width": best["width"], "height": best["height"]}
+
+    def static_url(self, ref, columns=1, formats=VARIANT_FORMATS):
+        """Returns the URL of the published static copy that best fills the slot, or None."""
+        entry = self.static.get(self.name(ref))
+        if not entry:
+            return None
+        candidates = [v for v in entry["variants"] if v["format"] in formats]
+        return STATIC_URL + (pick_variant(candidates, columns) if candidates else entry)["file"]
+
+    def placeholder(self, ref):
+        """Returns a tiny data: URI with `ref`'s aspect ratio to show while it loads.
+
+        That is the blurred thumbnail from the derivative index when there is one,
+        otherwise a flat grey SVG at the image's size (or 4:3 if that is unknown).
+        """
+        entry = self.variants.get(self.name(ref))
+        if entry and entry.get("placeholder"):
+            return entry["placeholder"]
+        entry = entry or self.info(ref)
+        width, height = (entry["width"], entry["height"]) if entry and entry["width"] else (4, 3)
+        svg = (
+            f'<svg xmlns="http://www.w3.org/2000/svg" viewBox="0 0 {width} {height}">'
+            f'<rect width="100%" height="100%" fill="#eef0f4"/></svg>'
+        )
+        return f"data:image/svg+xml;base64,{base64.b64encode(svg.encode()).decode('ascii')}"
+
+    def remote_url(self, ref):
+        """Returns the URL to fetch `ref` from when it is not bundled."""
+        url = ref if is_url(ref) else self.assets.get(os.path.basename(ref), {}).get("url")
+        if url is None:
+            raise AssetNotAvailable(f"Image not found: {ref}")
+        if self.offline:
+            raise AssetNotAvailable(f"Image not bundled and offline mode is on: {ref}")
+        return url
+
+    def remote(self, refs):
+        """Returns the URLs among `refs` that must come from the network, for prefetching."""
+        if self.offline:
+            return []
+        return [ref for ref in refs if is_url(ref) and self.local_path(ref) is None]
@@ -0,0 +1,251 @@
+"""Rendering helpers shared by app.py and 1app.py."""
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor, as_completed
+
+import streamlit as st
+
+import imaging
+import metrics
+from assets import STATIC_IMAGES, AssetResolver, data_uri, load_manifest, load_static_index, load_variants
+from image_cache import FetchFailed, ImageCache
+
+# Load every image of the app once in the background after the first run, so
+# later runs find downloads, downscales and data URIs already cached.
+WARMUP = os.environ.get("METSYS_WARMUP", "1") == "1"
+# Progressive mode: each image slot shows a blurred placeholder at the final size while
+# the image loads in the background, and is filled in once the rest of the page is out.
+PROGRESSIVE = os.environ.get("METSYS_PROGRESSIVE", "") == "1"
+
+# Per-run state. Each session's script run executes on its own thread, so
+# everything a run accumulates (prefetched downloads, loaded images) lives here.
+_run = threading.local()
+
+
+@st.cache_resource
+def get_image_cache():
+    """Returns the image cache shared by every session on this server."""
+    cache = ImageCache()
+    metrics.register_gauges(
+        lambda: {(f"metsys_image_cache_{name}", ()): value for name, value in cache.stats().items()}
+    )
+    return cache
+
+
+@st.cache_resource
+def get_asset_resolver():
+    """Returns the resolver mapping image references onto the bundled images/ directory."""
+    static = load_static_index() if STATIC_IMAGES else None
+    return AssetResolver(load_manifest(), variants=load_variants(), static=static)
+
+
+@st.cache_resource
+def get_load_pool():
+    """Returns the threads that fetch and decode images for progressive slots."""
+    return ThreadPoolExecutor(max_workers=8, thread_name_prefix="image-load")
+
+
+def begin_run():
+    """Resets the per-run state; called once at the top of every script run."""
+    _run.assets = imaging.RunAssets()
+    _run.prefetched = {}
+    _run.pending = []
+
+
+def finish_run():
+    """Replaces each progressive placeholder with its image, in the order the loads complete."""
+    waiting = {}
+    for slot, ref, caption, future, error_message in _run.pending:
+        waiting.setdefault(future, []).append((slot, ref, caption, error_message))
+    _run.pending = []
+    with metrics.timer("metsys_progressive_fill_seconds"):
+        for future in as_completed(waiting):
+            for slot, ref, caption, error_message in waiting[future]:
+                try:
+                    image, output_format = future.result()
+                    slot.image(image, caption=caption, use_container_width=True, output_format=output_format)
+                except FetchFailed:
+                    _unavailable(slot, ref, caption)
+                except Exception as e:
+                    slot.error(error_message(e))
+
+
+def run_assets():
+    """Returns the registry of images loaded during the current run."""
+    return _run.assets
+
+
+def prefetch(refs):
+    """Starts concurrent downloads for every reference in `refs` that is not bundled."""
+    _run.prefetched.update(get_image_cache().prefetch(get_asset_resolver().remote(refs)))
+
+
+def _loader(ref, columns, resolver, cache, prefetched):
+    """Returns (source, key, load) for `ref`, trying the cheapest source first.
+
+    That is a published static URL, then a pre-built variant, then the bundled file,
+    then a download.
+    """
+    static_url = resolver.static_url(ref, columns)
+    if static_url:
+        return "static", static_url, lambda: (static_url, "auto")
+    variant = resolver.variant(ref, columns)
+    local_path = resolver.local_path(ref)
+    if variant:
+        return "variant", variant["path"], lambda: (data_uri(variant["path"], variant["mime"]), "auto")
+    if local_path:
+        info = resolver.info(ref)
+        # Keyed by content hash when the manifest knows it, so copies of one file load once.
+        key = info["sha256"] if info else local_path
+        return "local", key, lambda: imaging.prepare(path=local_path, info=info, columns=columns)
+    key = resolver.remote_url(ref)
+    pending = prefetched.get(key)
+    return "remote", key, lambda: imaging.prepare(
+        data=pending.result() if pending else cache.get(key), columns=columns
+    )
+
+
+def _prepared_image(ref, columns):
+    """Returns st.image arguments for `ref`, loading it at most once per run."""
+    source, key, load = _loader(ref, columns, get_asset_resolver(), get_image_cache(), _run.prefetched)
+    if not metrics.ENABLED:
+        return _run.assets.get(key, load)
+    loads = _run.assets.loads
+    prepared = _run.assets.get(key, load)
+    size = _image_bytes(prepared[0])
+    outcome = "loaded" if _run.assets.loads > loads else "reused"
+    metrics.count("metsys_images_total", source=source, outcome=outcome)
+    if size is not None:
+        metrics.count("metsys_image_bytes_total", size, source=source)
+    return prepared
+
+
+def _image_bytes(image):
+    """Bytes the app sends for an st.image argument, or None for a URL the browser fetches itself."""
+    if isinstance(image, bytes):
+        return len(image)
+    if image.startswith("data:"):
+        return len(image)
+    if os.path.isfile(image):
+        return os.path.getsize(image)
+    return None
+
+
+def _warm(slots, resolver, cache):
+    prefetched = cache.prefetch(resolver.remote([ref for ref, _ in slots]))
+    for ref, columns in slots:
+        try:
+            _loader(ref, columns, resolver, cache, prefetched)[2]()
+        except Exception:
+            continue  # the run that displays it reports the error
+        metrics.count("metsys_warmup_images_total")
+
+
+@st.cache_resource(show_spinner=False)
+def start_warmup(slots):
+    """Starts loading every (ref, columns) image slot on a daemon thread, once per process."""
+    if not WARMUP:
+        return None
+    thread = threading.Thread(
+        target=_warm, args=(slots, get_asset_resolver(), get_image_cache()), name="metsys-warmup", daemon=True
+    )
+    thread.start()
+    return thread
+
+
+def _unavailable(container, ref, caption):
+    """Shows the placeholder in place of an image whose host is failing, instead of an error."""
+    metrics.count("metsys_images_unavailable_total")
+    note = "image temporarily unavailable"
+    caption = f"{caption} ({note})" if caption else note.capitalize()
+    container.image(get_asset_resolver().placeholder(ref), caption=caption, use_container_width=True)
+
+
+def _display(ref, caption, columns, error_message):
+    """Shows `ref` in the current container, or in progressive mode a placeholder to fill later."""
+    if not PROGRESSIVE:
+        try:
+            image, output_format = _prepared_image(ref, columns)
+            st.image(image, caption=caption, use_container_width=True, output_format=output_format)
+        except FetchFailed:
+            _unavailable(st, ref, caption)
+        except Exception as e:
+            st.error(error_message(e))
+        return
+    slot = st.empty()
+    resolver = get_asset_resolver()
+    try:
+        source, key, load = _loader(ref, columns, resolver, get_image_cache(), _run.prefetched)
+    except Exception as e:
+        slot.error(error_message(e))
+        return
+    if source == "static":
+        slot.image(load()[0], caption=caption, use_container_width=True)
+        return
+    slot.image(resolver.placeholder(ref), caption=caption, use_container_width=True)
+    future = _run.assets.get(key, lambda: get_load_pool().submit(load))
+    _run.pending.append((slot, ref, caption, future, error_message))
+
+
+def _url_error(e):
+    metrics.count("metsys_errors_total", section="display_image_from_url")
+    return f"Error loading image: {e}"
+
+
+@metrics.timed("display_image_from_url")
+def display_image_from_url(image_url, caption="", columns=1):
+    """Displays an image from a URL, serving the bundled copy when there is one.
+
+    `columns` is how many image slots share the row, so the smallest
+    pre-built variant that still fills the slot can be sent instead.
+    """
+    _display(image_url, caption, columns, _url_error)
+
+
+@metrics.timed("display_image")
+def display_image(image_path, caption="", columns=1):
+    """Displays an image from the local 'images' directory, fetching it only if it is missing.
+
+    `columns` is how many images share the row, so the smallest pre-built
+    variant that still fills the slot can be sent instead.
+    """
+    def error_message(e):
+        metrics.count("metsys_errors_total", section="display_image")
+        if isinstance(e, FileNotFoundError):
+            return f"Image not found: {image_path}"
+        return f"Error loading image {image_path}: {e}"
+
+    _display(image_path, caption, columns, error_message)
+
+
+def feature_card_html(icon, title, description):
+    """Returns the HTML for a styled feature card."""
+    return f"""
+    <div style="padding: 1.5rem; background: linear-gradient(135deg, #667eea 0%, #764ba2 100%);
+                border-radius: 10px; margin: 1rem 0; color: white;">
+        <h3 style="margin: 0; color: white;">{icon} {title}</h3>
+        <p style="margin-top: 0.5rem; color: rgba(255,255,255,0.9);">{description}</p>
+    </div>
+    """
+
+
+@metrics.timed("feature_card")
+def feature_card(icon, title, description):
+    """Creates a styled feature card."""
+    st.markdown(feature_card_html(icon, title, description), unsafe_allow_html=True)
+
+
+@metrics.timed("feature_section")
+def feature_section(title, features, image_files):
+    """Creates a feature section with a title, features, and associated images."""
+    st.header(title)
+    st.markdown(features)
+
+    # Display images in a 3-column layout
+    num_cols = min(len(image_files), 3)
+    if num_cols > 0:
+        cols = st.columns(num_cols)
+        # Iterate over the images and assign them to columns cyclically
+        for i, file in enumerate(image_files):
+            with cols[i % num_cols]:
+                display_image(os.path.join("images", file), columns=num_cols)
@@ -0,0 +1,220 @@
+"""Compiles content.json into render plans once, then replays the selected module on each rerun.
+
+content.json describes each app ("showcase" is app.py, "overview" is 1app.py) as a title,
+intro, footer and sidebar plus a list of modules, each a list of blocks:
+
+    {"type": "header" | "subheader" | "info", "text": "..."}
+    {"type": "markdown", "text": ["line", ...], "html": true}
+    {"type": "image", "src": "IMG_0390" | "path/or/url", "caption": "..."}
+    {"type": "card", "icon": "...", "title": "...", "description": "..."}
+    {"type": "columns", "columns": [[block, ...], [block, ...]]}
+    {"type": "feature_section", "title": "...", "text": ["line", ...], "images": ["IMG_0399.png", ...]}
+    {"type": "demo", "name": "analytics"}   (a live demo from the demos package)
+
+Image sources are looked up in the app's "images" table, so a name can stand for a
+blob-store URL. Compiled plans are cached for every session and rebuilt only when the
+file's modification time or size changes, together with each app's search index
+(search.py); adding a module means editing data only.
+"""
+import json
+import os
+
+import streamlit as st
+
+import components
+import demos
+import metrics
+import search
+from assets import is_url
+
+# --- Configuration ---
+CONTENT_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "content.json")
+# "sidebar" renders only the selected module; "tabs" renders all of them in st.tabs.
+NAV_MODE = os.environ.get("METSYS_NAV_MODE", "sidebar")
+
+
+# --- Compilation ---
+def compile_blocks(blocks, images, columns=1):
+    """Compiles content blocks into a plan: a list of (op, *args) tuples ready to replay."""
+    plan = []
+    for block in blocks:
+        kind = block["type"]
+        if kind == "markdown":
+            plan.append(("markdown", "\n".join(block["text"]), block.get("html", False)))
+        elif kind in ("header", "subheader", "info"):
+            plan.append((kind, block["text"]))
+        elif kind == "image":
+            plan.append(("image", images.get(block["src"], block["src"]), block.get("caption", ""), columns))
+        elif kind == "card":
+            html = components.feature_card_html(block["icon"], block["title"], block["description"])
+            plan.append(("card", html))
+        elif kind == "columns":
+            width = len(block["columns"])
+            plan.append(("columns", [compile_blocks(col, images, columns * width) for col in block["columns"]]))
+        elif kind == "feature_section":
+            plan.append(("feature_section", block["title"], "\n".join(block["text"]), block["images"]))
+        elif kind == "demo":
+            if block["name"] not in demos.DEMOS:
+                raise ValueError(f"Unknown demo {block['name']!r}")
+            plan.append(("demo", block["name"]))
+        else:
+            raise ValueError(f"Unknown content block type {kind!r}")
+    return plan
+
+
+def plan_slots(plan):
+    """Returns (ref, columns) for every image a plan will display, in order."""
+    slots = []
+    for op in plan:
+        if op[0] == "image":
+            slots.append((op[1], op[3]))
+        elif op[0] == "columns":
+            for sub in op[1]:
+                slots.extend(plan_slots(sub))
+        elif op[0] == "feature_section":
+            columns = min(len(op[3]), 3)
+            slots.extend((os.path.join("images", file), columns) for file in op[3])
+    return slots
+
+
+def plan_images(plan):
+    """Returns every image reference a plan will display, in order and without repeats."""
+    return list(dict.fromkeys(ref for ref, _ in plan_slots(plan)))
+
+
+def compile_app(spec):
+    """Compiles one app's content into plans for its intro, modules, footer and sidebar."""
+    images = spec.get("images", {})
+    modules = {}
+    for module in spec["modules"]:
+        plan = compile_blocks(module["blocks"], images)
+        modules[module["slug"]] = {"title": module["title"], "plan": plan, "images": plan_images(plan)}
+    slots = [slot for module in modules.values() for slot in plan_slots(module["plan"])]
+    return {
+        "title": spec["title"],
+        "slots": tuple(dict.fromkeys(slots)),
+        "intro": compile_blocks(spec.get("intro", []), images),
+        "modules": modules,
+        "footer": compile_blocks(spec.get("footer", []), images),
+        "sidebar": compile_blocks(spec.get("sidebar", []), images),
+    }
+
+
+@st.cache_resource(max_entries=4)
+def _compiled(path, mtime_ns, size):
+    with open(path, encoding="utf-8") as f:
+        doc = json.load(f)
+    return {
+        "apps": {name: compile_app(spec) for name, spec in doc["apps"].items()},
+        "search": {name: search.build_index(spec) for name, spec in doc["apps"].items()},
+    }
+
+
+def load_plans(path=CONTENT_PATH):
+    """Returns the compiled content, recompiling only if the file has changed since last time."""
+    stat = os.stat(path)
+    return _compiled(path, stat.st_mtime_ns, stat.st_size)
+
+
+# --- Replay ---
+def _markdown(text, html):
+    st.markdown(text, unsafe_allow_html=html)
+
+
+@metrics.timed("feature_card")
+def _card(html):
+    st.markdown(html, unsafe_allow_html=True)
+
+
+def _image(src, caption, columns):
+    if is_url(src):
+        components.display_image_from_url(src, caption, columns=columns)
+    else:
+        components.display_image(src, caption, columns=columns)
+
+
+def _columns(subplans):
+    for col, sub in zip(st.columns(len(subplans)), subplans):
+        with col:
+            replay(sub)
+
+
+RENDERERS = {
+    "markdown": _markdown,
+    "card": _card,
+    "header": st.header,
+    "subheader": st.subheader,
+    "info": st.info,
+    "image": _image,
+    "columns": _columns,
+    "feature_section": components.feature_section,
+    "demo": demos.render,
+}
+
+
+def replay(plan):
+    """Renders a compiled plan into the current container."""
+    for op in plan:
+        RENDERERS[op[0]](*op[1:])
+
+
+# --- Navigation ---
+def select_module(modules):
+    """Returns the slug chosen in the sidebar, honouring ?module= deep links."""
+    slugs = list(modules)
+    # The radio keeps a fixed key (an `index` derived from the URL would change its widget
+    # ID on every switch and reset it), so ?module= only seeds a fresh session.
+    if st.session_state.get("module") not in slugs:
+        requested = st.query_params.get("module")
+        st.session_state["module"] = requested if requested in slugs else slugs[0]
+    active = st.sidebar.radio(
+        "Modules",
+        slugs,
+        key="module",
+        format_func=lambda slug: modules[slug]["title"],
+    )
+    st.query_params["module"] = active
+    return active
+
+
+def render_app(name, path=CONTENT_PATH):
+    """Renders the app called `name` in content.json."""
+    with metrics.timer("metsys_run_seconds", app=name, nav=NAV_MODE):
+        _render_app(name, path)
+    metrics.end_run()
+
+
+def _render_app(name, path):
+    components.begin_run()
+    plans = load_plans(path)
+    app = plans["apps"][name]
+    modules = app["modules"]
+    search.sidebar_search(plans["search"][name])
+
+    st.title(app["title"])
+    replay(app["intro"])
+
+    if NAV_MODE == "tabs":
+        # Legacy layout: every module body runs on every rerun.
+        components.prefetch([ref for module in modules.values() for ref in module["images"]])
+        tabs = st.tabs([module["title"] for module in modules.values()])
+        for tab, (slug, module) in zip(tabs, modules.items()):
+            with tab, metrics.timer("metsys_module_seconds", module=slug):
+                replay(module["plan"])
+    else:
+        active = select_module(modules)
+        components.prefetch(modules[active]["images"])
+        with metrics.timer("metsys_module_seconds", module=active):
+            replay(modules[active]["plan"])
+
+    replay(app["footer"])
+    with st.sidebar:
+        replay(app["sidebar"])
+        assets = components.run_assets()
+        st.caption(
+            f"🖼️ {assets.loads} images loaded this run, "
+            f"{assets.duplicates_avoided} duplicate loads avoided"
+        )
+    components.finish_run()
+    metrics.debug_panel()
+    components.start_warmup(app["slots"])
@@ -0,0 +1,25 @@
+"""Live demos embedded in module pages with a {"type": "demo", "name": "..."} content block.
+
+Each demo is a module here with a render() function; it is imported the first time its
+block is rendered, so pages without demos never load pandas or generate sample data.
+Sample data is synthetic and seeded (METSYS_DEMO_SEED), so every visitor and every
+benchmark sees the same numbers.
+"""
+import importlib
+import os
+
+# --- Configuration ---
+SEED = int(os.environ.get("METSYS_DEMO_SEED", 7))
+DEMOS = {
+    "analytics": "demos.analytics",
+    "appointments": "demos.appointments",
+    "catalog": "demos.catalog",
+    "crm": "demos.crm",
+    "crm_import": "demos.crm_import",
+    "projects": "demos.projects",
+}
+
+
+def render(name):
+    """Renders the demo called `name` into the current container."""
+    importlib.import_module(DEMOS[name]).render()
@@ -0,0 +1,316 @@
+"""Appointments demo: a live availability engine over a year of synthetic staff calendars.
+
+Each employee's bookable time is kept as a sorted array of disjoint free intervals
+(minutes since FIRST_DAY): working hours minus breaks minus bookings, with each
+booking's buffer time included. "Next free slots for service X" bisects every eligible
+employee's array to the requested time and merges their slot streams with a heap, so
+only the intervals near the answer are ever looked at. A booking splits one interval
+in place, so the index is never rebuilt. Group services (classes with a capacity) are
+separate sorted session lists with a seat count.
+
+The engine is shared by every session, so a booking made in the demo is visible to
+all visitors until the process restarts.
+"""
+import bisect
+import datetime
+import heapq
+import itertools
+import os
+import threading
+import time
+
+import numpy as np
+import streamlit as st
+
+from demos import SEED
+
+# --- Configuration ---
+STAFF = int(os.environ.get("METSYS_DEMO_STAFF", 300))
+FIRST_DAY = datetime.date(2025, 1, 6)
+DAYS = 365
+# The demo's "now": bookings before it are history, after it the calendar to book into.
+TODAY = FIRST_DAY + datetime.timedelta(days=150)
+SLOT_STEP = 15
+LOCATIONS = ("Downtown", "Uptown", "Riverside", "Online")
+# name: (minutes, buffer minutes after, capacity; 1 for one-to-one appointments)
+SERVICES = {
+    "Initial Consultation": (30, 10, 1),
+    "Strategy Session": (60, 15, 1),
+    "Coaching Call": (45, 5, 1),
+    "Hair Cut & Style": (45, 15, 1),
+    "Massage Therapy": (90, 15, 1),
+    "Dental Check-up": (30, 10, 1),
+    "Group Yoga Class": (60, 0, 12),
+    "Weekend Workshop": (120, 0, 20),
+}
+ONE_TO_ONE = [name for name, (_, _, capacity) in SERVICES.items() if capacity == 1]
+# Recurring group sessions: service -> (weekdays, start hour).
+CLASS_TIMES = {"Group Yoga Class": ((0, 2, 4), 18), "Weekend Workshop": ((5,), 10)}
+FIRST_NAMES = ("Ana", "Ben", "Chloe", "Dev", "Elena", "Farid", "Grace", "Hugo", "Iris", "Jamal",
+               "Kim", "Luca", "Maya", "Noah", "Olga", "Priya", "Quinn", "Rosa", "Sam", "Tariq")
+LAST_INITIALS = "ABCDEFGHJKLMNPRSTVW"
+
+
+def to_datetime(minute):
+    return datetime.datetime.combine(FIRST_DAY, datetime.time()) + datetime.timedelta(minutes=int(minute))
+
+
+def to_minute(when):
+    return int((when - datetime.datetime.combine(FIRST_DAY, datetime.time())).total_seconds() // 60)
+
+
+class AvailabilityEngine:
+    """Free-interval index per employee plus capacity-limited group sessions."""
+
+    def __init__(self, staff, free, sessions):
+        self.staff = staff
+        # employee id -> ([interval starts], [interval ends]), sorted and disjoint.
+        self.free = free
+        # service -> ([session starts], [session dicts]), sorted by start.
+        self.sessions = sessions
+        self.by_service = {
+            name: [e for e, person in enumerate(staff) if name in person["services"]] for name in SERVICES
+        }
+        self.bookings = 0
+        self._lock = threading.Lock()
+
+    def free_intervals(self):
+        return sum(len(starts) for starts, _ in self.free.values())
+
+    def _employee_slots(self, employee, after, need):
+        """Yields (start, employee) for every grid-aligned start at or after `after` that fits `need` minutes.
+
+        Callers hold self._lock while consuming it.
+        """
+        starts, ends = self.free[employee]
+        i = bisect.bisect_right(ends, after)
+        while i < len(starts):
+            start = max(starts[i], after)
+            start += -start % SLOT_STEP
+            last = ends[i] - need
+            while start <= last:
+                yield start, employee
+                start += SLOT_STEP
+            i += 1
+
+    def next_slots(self, service, after, limit=10, location=None, employee=None):
+        """Returns the earliest `limit` bookable slots for `service` at or after minute `after`.
+
+        Each slot is a dict with start (minute), employee (index into staff) and, for
+        group services, seats_left.
+        """
+        # book() rewrites an employee's starts and ends one after the other, so read under its lock.
+        with self._lock:
+            minutes, buffer, capacity = SERVICES[service]
+            if capacity > 1:
+                starts, sessions = self.sessions[service]
+                found = []
+                for session in sessions[bisect.bisect_left(starts, after):]:
+                    if session["booked"] < capacity and (
+                        location is None or self.staff[session["employee"]]["location"] == location
+                    ) and (employee is None or session["employee"] == employee):
+                        found.append({"start": session["start"], "employee": session["employee"],
+                                      "seats_left": capacity - session["booked"]})
+                        if len(found) == limit:
+                            break
+                return found
+            eligible = [
+                e for e in self.by_service[service]
+                if (location is None or self.staff[e]["location"] == location)
+                and (employee is None or e == employee)
+            ]
+            streams = [self._employee_slots(e, after, minutes + buffer) for e in eligible]
+            return [
+                {"start": start, "employee": e, "seats_left": None}
+                for start, e in itertools.islice(heapq.merge(*streams), limit)
+            ]
+
+    def book(self, service, start, employee):
+        """Books a slot, updating the index in place; raises ValueError if it is no longer free."""
+        minutes, buffer, capacity = SERVICES[service]
+        with self._lock:
+            if capacity > 1:
+                starts, sessions = self.sessions[service]
+                i = bisect.bisect_left(starts, start)
+                while i < len(starts) and starts[i] == start:
+                    session = sessions[i]
+                    if session["employee"] == employee and session["booked"] < capacity:
+                        session["booked"] += 1
+                        self.bookings += 1
+                        return
+                    i += 1
+                raise ValueError("That session is full.")
+            end = start + minutes + buffer
+            starts, ends = self.free[employee]
+            i = bisect.bisect_right(starts, start) - 1
+            if i < 0 or end > ends[i]:
+                raise ValueError("That slot has just been taken.")
+            _carve(starts, ends, start, end)
+            self.bookings += 1
+
+
+def _carve(starts, ends, start, end):
+    """Removes [start, end) from a sorted free-interval list, wherever it overlaps."""
+    i = bisect.bisect_right(ends, start)
+    j = bisect.bisect_left(starts, end)
+    if i >= j:
+        return
+    pieces = [(s, e) for s, e in ((starts[i], start), (end, ends[j - 1])) if e > s]
+    starts[i:j] = [s for s, _ in pieces]
+    ends[i:j] = [e for _, e in pieces]
+
+
+def generate(staff_count=STAFF, seed=SEED, utilisation=0.7):
+    """Builds an engine over a year of seeded schedules, breaks and bookings."""
+    rng = np.random.default_rng(seed)
+    staff = []
+    for e in range(staff_count):
+        services = set(rng.choice(ONE_TO_ONE, size=rng.integers(2, 5), replace=False).tolist())
+        staff.append({
+            "name": f"{FIRST_NAMES[e % len(FIRST_NAMES)]} {LAST_INITIALS[(e * 7) % len(LAST_INITIALS)]}.",
+            "location": LOCATIONS[int(rng.integers(len(LOCATIONS)))],
+            "services": services,
+            "days_off": set(rng.choice(7, size=2, replace=False).tolist()),
+            "shift_start": int(rng.choice([7, 8, 9, 10])) * 60,
+        })
+    for e in rng.choice(staff_count, size=max(1, staff_count // 15), replace=False):
+        staff[e]["services"].update(CLASS_TIMES)
+
+    weekday0 = FIRST_DAY.weekday()
+    one_to_one = [SERVICES[name][0] + SERVICES[name][1] for name in ONE_TO_ONE]
+    free = {}
+    bookings = 0
+    for e, person in enumerate(staff):
+        lengths = [SERVICES[name][0] + SERVICES[name][1] for name in person["services"] if name in ONE_TO_ONE]
+        lengths = lengths or one_to_one
+        starts, ends = [], []
+        shift_start = person["shift_start"]
+        for day in range(DAYS):
+            if (weekday0 + day) % 7 in person["days_off"]:
+                continue
+            base = day * 1440
+            lunch = base + 12 * 60 + int(rng.integers(0, 5)) * 15
+            windows = ((base + shift_start, lunch), (lunch + 45, base + shift_start + 8 * 60 + 45))
+            # Walk each window, alternating gaps and bookings drawn at the target utilisation.
+            draws = rng.random(40)
+            picks = rng.integers(0, len(lengths), 40)
+            k = 0
+            for window_start, window_end in windows:
+                cursor = free_start = window_start
+                while cursor < window_end and k < 40:
+                    length = lengths[picks[k]]
+                    if draws[k] < utilisation and cursor + length <= window_end:
+                        if cursor > free_start:
+                            starts.append(free_start)
+                            ends.append(cursor)
+                        cursor += length
+                        free_start = cursor
+                        bookings += 1
+                    else:
+                        cursor += SLOT_STEP
+                    k += 1
+                if window_end > free_start:
+                    starts.append(free_start)
+                    ends.append(window_end)
+        free[e] = (starts, ends)
+
+    sessions = {}
+    for service, (weekdays, hour) in CLASS_TIMES.items():
+        capacity = SERVICES[service][2]
+        teachers = [e for e, person in enumerate(staff) if service in person["services"]]
+        rows = []
+        for day in range(DAYS):
+            if (weekday0 + day) % 7 in weekdays:
+                for e in teachers:
+                    booked = int(rng.integers(0, capacity + 1))
+                    start = day * 1440 + hour * 60
+                    rows.append({"start": start, "employee": e, "booked": booked})
+                    _carve(*free[e], start, start + SERVICES[service][0])
+                    bookings += booked
+        rows.sort(key=lambda row: (row["start"], row["employee"]))
+        sessions[service] = ([row["start"] for row in rows], rows)
+
+    engine = AvailabilityEngine(staff, free, sessions)
+    engine.bookings = bookings
+    return engine
+
+
+@st.cache_resource(show_spinner="Generating a year of staff calendars…")
+def get_engine(staff_count=STAFF, seed=SEED):
+    """Builds the shared availability engine once per process."""
+    return generate(staff_count, seed)
+
+
+# --- Rendering ---
+def _service_label(name):
+    minutes, buffer, capacity = SERVICES[name]
+    extras = [f"{minutes} min"]
+    if buffer:
+        extras.append(f"+{buffer} min buffer")
+    if capacity > 1:
+        extras.append(f"up to {capacity} people")
+    return f"{name} ({', '.join(extras)})"
+
+
+def render():
+    """Renders the booking widget: service, location and time pickers, open slots and a Book button."""
+    engine = get_engine()
+    st.subheader("🧪 Live Demo: Find the Next Free Slot")
+    booked = st.session_state.pop("appointments_demo_booked", None)
+    if booked:
+        st.success(booked)
+    st.caption(
+        f"Synthetic calendars for {len(engine.staff)} staff at {len(LOCATIONS)} locations over {DAYS} days "
+        f"from {FIRST_DAY:%b %d, %Y}: {engine.bookings:,} bookings, "
+        f"{engine.free_intervals():,} free intervals indexed."
+    )
+    controls = st.columns([2, 1, 1, 1])
+    service = controls[0].selectbox("Service", list(SERVICES), format_func=_service_label,
+                                    key="appointments_demo_service")
+    location = controls[1].selectbox("Location", ("Any",) + LOCATIONS, key="appointments_demo_location")
+    day = controls[2].date_input("From", value=TODAY, min_value=FIRST_DAY,
+                                 max_value=FIRST_DAY + datetime.timedelta(days=DAYS - 1), key="appointments_demo_day")
+    at = controls[3].time_input("After", value=datetime.time(9, 0), step=900, key="appointments_demo_time")
+
+    started = time.perf_counter()
+    slots = engine.next_slots(
+        service, to_minute(datetime.datetime.combine(day, at)), limit=60,
+        location=None if location == "Any" else location,
+    )
+    elapsed = time.perf_counter() - started
+    if not slots:
+        st.info("No free slots left in the demo calendar for that choice.")
+        return
+
+    by_time = {}
+    for slot in slots:
+        by_time.setdefault(slot["start"], []).append(slot)
+    times = list(by_time)[:8]
+    rows = []
+    for start in times:
+        names = [engine.staff[s["employee"]]["name"] for s in by_time[start]]
+        seats = by_time[start][0]["seats_left"]
+        rows.append({
+            "When": f"{to_datetime(start):%a %b %d, %I:%M %p}",
+            "Available with": ", ".join(names[:3]) + (f" +{len(names) - 3}" if len(names) > 3 else ""),
+            "Seats left": seats if seats is not None else "",
+        })
+    st.dataframe(rows, hide_index=True)
+    st.caption(f"Found in {elapsed * 1000:.2f} ms across {len(engine.by_service[service])} qualified staff.")
+
+    choice = st.selectbox(
+        "Slot to book", [(start, s["employee"]) for start in times for s in by_time[start]][:20],
+        format_func=lambda c: f"{to_datetime(c[0]):%a %b %d, %I:%M %p} with {engine.staff[c[1]]['name']}",
+        key="appointments_demo_choice",
+    )
+    if st.button("Book this slot", key="appointments_demo_book"):
+        try:
+            engine.book(service, *choice)
+        except ValueError as e:
+            st.error(str(e))
+        else:
+            st.session_state["appointments_demo_booked"] = (
+                f"Booked {service} on {to_datetime(choice[0]):%a %b %d at %I:%M %p} with "
+                f"{engine.staff[choice[1]]['name']}; the index was updated in place."
+            )
+            st.rerun()
@@ -0,0 +1,303 @@
+"""E-commerce demo: faceted search over a synthetic catalog of 600k SKUs.
+
+SKUs are rows of NumPy columns (product, category, colour, size, material, price,
+popularity, tag bits), numbered in depth-first order of the category tree, so every
+category node covers one contiguous range of SKU numbers. Tags, which a SKU can have
+several of, get an inverted index: a sorted array of SKU numbers per tag.
+
+A query turns each active filter into a boolean mask (a range for the category, the
+union of posting lists for tags, a lookup table indexed by the column for colour, size
+and material, a comparison for price). Facet counts are disjunctive: each facet is
+counted under every filter but its own, so picking a colour still shows how many SKUs
+the other colours have. Counts for every category node come from one cumulative sum.
+
+Results are memoised per query as a packed mask. Each sort order is computed once at
+build time, and a page is cut lazily by scanning that order only until it is full.
+"""
+import functools
+import os
+import time
+
+import numpy as np
+import streamlit as st
+
+from demos import SEED
+
+# --- Configuration ---
+SKUS = int(os.environ.get("METSYS_DEMO_SKUS", 600_000))
+PAGE_SIZE = 24
+# SKUs of a precomputed ordering checked per step when filling a page.
+SCAN_BLOCK = 1 << 15
+CATEGORY_TREE = {
+    "Apparel": {
+        "Men": ("T-Shirts", "Shirts", "Jackets", "Jeans"),
+        "Women": ("Dresses", "Tops", "Jackets", "Skirts"),
+        "Kids": ("T-Shirts", "Pyjamas", "Outerwear"),
+    },
+    "Footwear": {"Men": ("Sneakers", "Boots", "Sandals"), "Women": ("Sneakers", "Heels", "Boots", "Flats")},
+    "Home": {"Kitchen": ("Cookware", "Knives", "Tableware"), "Bedroom": ("Bedding", "Pillows"),
+             "Decor": ("Candles", "Frames", "Rugs")},
+    "Electronics": {"Audio": ("Headphones", "Speakers"), "Accessories": ("Cases", "Chargers", "Cables")},
+    "Sports": {"Fitness": ("Yoga Mats", "Weights", "Bands"), "Outdoor": ("Tents", "Backpacks", "Bottles")},
+    "Beauty": {"Skincare": ("Cleansers", "Serums", "Moisturisers"), "Fragrance": ("Perfume", "Candles")},
+}
+# Typical price (dollars) per top-level category.
+BASE_PRICE = {"Apparel": 35, "Footwear": 80, "Home": 40, "Electronics": 60, "Sports": 45, "Beauty": 30}
+COLORS = ("Black", "White", "Grey", "Navy", "Blue", "Red", "Green", "Olive", "Beige", "Pink", "Yellow", "Brown")
+SIZES = ("XS", "S", "M", "L", "XL", "XXL", "One size")
+MATERIALS = ("Cotton", "Linen", "Wool", "Polyester", "Leather", "Steel", "Ceramic", "Bamboo", "Recycled")
+TAGS = ("new-arrival", "bestseller", "sale", "eco-friendly", "limited-edition", "gift-idea", "vegan",
+        "handmade", "free-shipping", "bundle", "clearance", "staff-pick", "back-in-stock", "exclusive",
+        "fair-trade", "organic", "waterproof", "travel", "premium", "online-only")
+TAG_SHARE = (0.08, 0.05, 0.15, 0.12, 0.02, 0.1, 0.06, 0.03, 0.3, 0.04, 0.05, 0.01, 0.03, 0.02, 0.04,
+             0.05, 0.06, 0.07, 0.08, 0.1)
+ADJECTIVES = ("Classic", "Essential", "Everyday", "Urban", "Heritage", "Studio", "Coastal", "Alpine", "Nordic",
+              "Signature", "Vintage", "Modern", "Weekend", "Lightweight", "Premium")
+SORTS = ("Relevance", "Price: low to high", "Price: high to low")
+
+
+class CategoryTree:
+    """Category nodes in depth-first order; each node's leaves are one contiguous range."""
+
+    def __init__(self, tree):
+        self.paths, self.parents = [], []
+        self.leaf_lo, self.leaf_hi = [], []
+        self.leaves = []
+        self._visit((), tree, -1)
+        self.leaf_lo, self.leaf_hi = np.array(self.leaf_lo), np.array(self.leaf_hi)
+
+    def _visit(self, path, children, parent):
+        node = len(self.paths)
+        self.paths.append(path)
+        self.parents.append(parent)
+        self.leaf_lo.append(len(self.leaves))
+        self.leaf_hi.append(None)
+        if children is None:
+            self.leaves.append(node)
+        else:
+            items = children.items() if isinstance(children, dict) else ((leaf, None) for leaf in children)
+            for name, grandchildren in items:
+                self._visit(path + (name,), grandchildren, node)
+        self.leaf_hi[node] = len(self.leaves)
+
+    def __len__(self):
+        return len(self.paths)
+
+    def label(self, node):
+        return " › ".join(self.paths[node]) if node else "All categories"
+
+
+class Catalog:
+    """SKU columns with inverted tag indexes, answering faceted queries with counts."""
+
+    def __init__(self, columns, tree):
+        self.columns = columns
+        self.tree = tree
+        self.size = len(columns["price"])
+        leaf_of = columns["leaf"]
+        # First SKU of each leaf (SKUs are sorted by leaf), and so of each node's range.
+        self.leaf_start = np.searchsorted(leaf_of, np.arange(len(tree.leaves) + 1))
+        self.node_lo = self.leaf_start[tree.leaf_lo]
+        self.node_hi = self.leaf_start[tree.leaf_hi]
+        bits = columns["tags"]
+        self.postings = [np.flatnonzero(bits & np.uint32(1 << t)).astype(np.int32) for t in range(len(TAGS))]
+        price, ids = columns["price"], np.arange(self.size)
+        self.orders = {
+            "Relevance": np.lexsort((ids, -columns["popularity"])).astype(np.int32),
+            "Price: low to high": np.lexsort((ids, price)).astype(np.int32),
+            "Price: high to low": np.lexsort((ids, -price)).astype(np.int32),
+        }
+        self.query = functools.lru_cache(maxsize=256)(self._query)
+
+    def _masks(self, node, tags, colors, sizes, materials, price):
+        """One mask per active filter, keyed by facet (inactive filters are left out)."""
+        masks = {}
+        if node:
+            mask = np.zeros(self.size, dtype=bool)
+            mask[self.node_lo[node]:self.node_hi[node]] = True
+            masks["category"] = mask
+        if tags:
+            mask = np.zeros(self.size, dtype=bool)
+            for tag in tags:
+                mask[self.postings[tag]] = True
+            masks["tags"] = mask
+        for facet, chosen, values in (("color", colors, COLORS), ("size", sizes, SIZES),
+                                      ("material", materials, MATERIALS)):
+            if chosen:
+                allowed = np.zeros(len(values), dtype=bool)
+                allowed[list(chosen)] = True
+                masks[facet] = allowed[self.columns[facet]]
+        if price is not None:
+            cents = self.columns["price"]
+            masks["price"] = (cents >= price[0] * 100) & (cents <= price[1] * 100)
+        return masks
+
+    def _all_but(self, masks, facet):
+        others = [mask for name, mask in masks.items() if name != facet]
+        if not others:
+            return None
+        result = others[0].copy()
+        for mask in others[1:]:
+            result &= mask
+        return result
+
+    def _query(self, node=0, tags=(), colors=(), sizes=(), materials=(), price=None):
+        """Returns (packed result mask, result count, facet counts) for a query; memoised.
+
+        Filters are tuples of indexes into TAGS, COLORS, SIZES and MATERIALS (any of them
+        matches), a category node (0 is the root) and an inclusive (low, high) dollar range.
+        """
+        masks = self._masks(node, tags, colors, sizes, materials, price)
+        everything = self._all_but(masks, None)
+        facets = {}
+        base = self._all_but(masks, "category")
+        running = np.cumsum(base, dtype=np.int64) if base is not None else np.arange(1, self.size + 1)
+        running = np.concatenate([[0], running])
+        facets["category"] = running[self.node_hi] - running[self.node_lo]
+        base = self._all_but(masks, "tags")
+        facets["tags"] = np.array([len(p) if base is None else np.count_nonzero(base[p]) for p in self.postings])
+        for facet, values in (("color", COLORS), ("size", SIZES), ("material", MATERIALS)):
+            base = self._all_but(masks, facet)
+            column = self.columns[facet] if base is None else self.columns[facet][base]
+            facets[facet] = np.bincount(column, minlength=len(values))
+        count = self.size if everything is None else int(np.count_nonzero(everything))
+        packed = None if everything is None else np.packbits(everything)
+        return packed, count, facets
+
+    def page(self, query, sort, number, page_size=PAGE_SIZE):
+        """SKU numbers on page `number` (from 0) of a query's results in `sort` order.
+
+        Walks the precomputed ordering for `sort` a block at a time and stops as soon as
+        the page is full, so early pages never touch most of the catalog.
+        """
+        packed, count, _ = self.query(**query)
+        order = self.orders[sort]
+        start, end = number * page_size, min((number + 1) * page_size, count)
+        if packed is None:
+            return order[start:end]
+        mask = np.unpackbits(packed, count=self.size).view(bool)
+        found = []
+        seen = 0
+        for block in range(0, self.size, SCAN_BLOCK):
+            hits = order[block:block + SCAN_BLOCK]
+            hits = hits[mask[hits]]
+            found.append(hits)
+            seen += len(hits)
+            if seen >= end:
+                break
+        return np.concatenate(found)[start:end]
+
+
+def generate(skus=SKUS, seed=SEED):
+    """Builds a seeded catalog: products with size/colour variants spread over CATEGORY_TREE."""
+    rng = np.random.default_rng(seed)
+    tree = CategoryTree(CATEGORY_TREE)
+    leaves = len(tree.leaves)
+    variants = rng.choice([1, 2, 3, 4, 6, 8, 12, 18], size=skus)
+    variants = variants[:np.searchsorted(np.cumsum(variants), skus) + 1]
+    variants[-1] -= variants.sum() - skus
+    products = len(variants)
+    weight = rng.pareto(1.5, leaves) + 0.2
+    product_leaf = np.sort(rng.choice(leaves, size=products, p=weight / weight.sum()))
+    top = np.array([tree.paths[leaf][0] for leaf in tree.leaves])
+    base_price = np.array([BASE_PRICE[name] for name in top])[product_leaf] * rng.lognormal(0, 0.5, products)
+    product_tags = np.zeros(products, dtype=np.uint32)
+    for t, share in enumerate(TAG_SHARE):
+        product_tags |= (rng.random(products) < share).astype(np.uint32) << np.uint32(t)
+
+    product = np.repeat(np.arange(products, dtype=np.int32), variants)
+    variant = np.arange(skus) - np.repeat(np.cumsum(variants) - variants, variants)
+    leaf = product_leaf[product].astype(np.int16)
+    color_count = np.minimum(variants, rng.integers(1, 5, products))[product]
+    sized = np.isin(top[leaf], ("Apparel", "Footwear"))
+    columns = {
+        "product": product,
+        "leaf": leaf,
+        "color": ((rng.integers(len(COLORS), size=products)[product] + variant % color_count) % len(COLORS))
+        .astype(np.int8),
+        "size": np.where(sized, np.minimum(variant // color_count, len(SIZES) - 2), len(SIZES) - 1).astype(np.int8),
+        "material": rng.integers(len(MATERIALS), size=products)[product].astype(np.int8),
+        "price": np.round(base_price[product] * (1 + 0.05 * (variant // color_count)) * 100).astype(np.int32),
+        "popularity": (rng.lognormal(0, 1.2, products)[product] * rng.uniform(0.8, 1.2, skus)).astype(np.float32),
+        "tags": product_tags[product],
+    }
+    return Catalog(columns, tree)
+
+
+@st.cache_resource(show_spinner="Indexing the sample catalog…")
+def get_catalog(skus=SKUS, seed=SEED):
+    """Builds the shared catalog and its indexes once per process."""
+    return generate(skus, seed)
+
+
+def product_name(catalog, sku):
+    product = int(catalog.columns["product"][sku])
+    leaf_name = catalog.tree.paths[catalog.tree.leaves[catalog.columns["leaf"][sku]]][-1]
+    return f"{ADJECTIVES[product % len(ADJECTIVES)]} {leaf_name.rstrip('s')} {product:06d}"
+
+
+# --- Rendering ---
+def _choices(label, values, counts, key, column):
+    return column.multiselect(label, range(len(values)), format_func=lambda i: f"{values[i]} ({counts[i]:,})",
+                              key=key)
+
+
+def render():
+    """Renders the catalog browser: facet filters with live counts, sorting and paged results."""
+    catalog = get_catalog()
+    tree = catalog.tree
+    st.subheader("🧪 Live Demo: Browse the Catalog")
+    st.caption(
+        f"{catalog.size:,} synthetic SKUs of {int(catalog.columns['product'][-1]) + 1:,} products in "
+        f"{len(tree.leaves)} categories, with {len(TAGS)} tags. Counts update with every filter."
+    )
+    state = st.session_state
+    top = int(catalog.columns["price"].max() // 100 + 1)
+    price = state.get("catalog_demo_price", (0, top))
+    query = {
+        "node": state.get("catalog_demo_category", 0),
+        "tags": tuple(sorted(state.get("catalog_demo_tags", ()))),
+        "colors": tuple(sorted(state.get("catalog_demo_colors", ()))),
+        "sizes": tuple(sorted(state.get("catalog_demo_sizes", ()))),
+        "materials": tuple(sorted(state.get("catalog_demo_materials", ()))),
+        "price": None if tuple(price) == (0, top) else tuple(price),
+    }
+    started = time.perf_counter()
+    _, count, facets = catalog.query(**query)
+    elapsed = time.perf_counter() - started
+
+    filters, results = st.columns([1, 2])
+    with filters:
+        st.selectbox("Category", range(len(tree)), key="catalog_demo_category",
+                     format_func=lambda n: f"{tree.label(n)} ({facets['category'][n]:,})")
+        _choices("Tags", TAGS, facets["tags"], "catalog_demo_tags", st)
+        _choices("Colour", COLORS, facets["color"], "catalog_demo_colors", st)
+        _choices("Size", SIZES, facets["size"], "catalog_demo_sizes", st)
+        _choices("Material", MATERIALS, facets["material"], "catalog_demo_materials", st)
+        st.slider("Price ($)", 0, top, (0, top), key="catalog_demo_price")
+
+    with results:
+        head = st.columns([2, 1, 1])
+        head[0].metric("Matching SKUs", f"{count:,}")
+        sort = head[1].selectbox("Sort by", SORTS, key="catalog_demo_sort")
+        pages = max(-(-count // PAGE_SIZE), 1)
+        number = head[2].number_input("Page", 1, pages, 1, key="catalog_demo_page") - 1
+        started = time.perf_counter()
+        skus = catalog.page(query, sort, min(number, pages - 1))
+        page_elapsed = time.perf_counter() - started
+        columns = catalog.columns
+        st.dataframe(
+            {
+                "SKU": [f"SKU-{sku:07d}" for sku in skus.tolist()],
+                "Product": [product_name(catalog, sku) for sku in skus.tolist()],
+                "Category": [tree.label(tree.leaves[leaf]) for leaf in columns["leaf"][skus].tolist()],
+                "Colour": [COLORS[c] for c in columns["color"][skus].tolist()],
+                "Size": [SIZES[s] for s in columns["size"][skus].tolist()],
+                "Price": [f"${p / 100:,.2f}" for p in columns["price"][skus].tolist()],
+                "Tags": [", ".join(tag for t, tag in enumerate(TAGS) if bits >> t & 1)
+                         for bits in columns["tags"][skus].tolist()],
+            },
+            hide_index=True,
+        )
+        st.caption(f"Facet counts in {elapsed * 1000:.1f} ms (memoised per filter combination); "
+                   f"page {number + 1:,} of {pages:,} cut in {page_elapsed * 1000:.1f} ms.")
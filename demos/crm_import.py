@@ -0,0 +1,466 @@
+"""CRM demo: streaming bulk CSV import with duplicate detection, and streaming export.
+
+An import reads the CSV through csv.reader over a buffered text stream, so the parser
+holds only one read buffer and one row at a time. The bundled sample streams from
+disk, so its size is not limited by memory. An upload does not: st.file_uploader
+keeps the whole file in memory, so uploads are capped by server.maxUploadSize
+(200 MB by default). Each row's email and phone are normalized (case, whitespace,
++tags and Gmail dots; digits with a country code) and checked against the contacts
+already imported:
+
+  email / phone  exact match in a hash index of normalized values
+  fuzzy          no exact match, but a contact in the same block (company, surname
+                 prefix, first initial) has a name at least FUZZY_THRESHOLD similar
+
+New contacts are appended to a spool file on disk; memory grows only by the index
+entries. The spool is closed when the session's ContactBook is cleared or garbage
+collected. Export reads the spool in chunks into an st.download_button whose data is
+only produced when it is clicked, and is then served to that session alone.
+"""
+import csv
+import difflib
+import io
+import os
+import re
+import tempfile
+import threading
+import time
+import weakref
+from array import array
+
+import numpy as np
+import streamlit as st
+
+from demos import SEED
+
+# --- Configuration ---
+CHUNK_BYTES = int(os.environ.get("METSYS_IMPORT_CHUNK_BYTES", 1 << 20))
+PROGRESS_ROWS = 10_000
+COUNTRY_CODE = os.environ.get("METSYS_IMPORT_COUNTRY_CODE", "1")
+FUZZY_THRESHOLD = 0.9
+# Newest contacts compared per block, so a crowded block cannot stall the import.
+BLOCK_COMPARISONS = 32
+SAMPLE_ROWS = int(os.environ.get("METSYS_DEMO_IMPORT_ROWS", 100_000))
+
+FIELDS = ("first_name", "last_name", "email", "phone", "company")
+HEADER = ("First Name", "Last Name", "Email", "Phone", "Company")
+# Header spellings recognised for each field (lowercased, "_" and "-" read as spaces).
+ALIASES = {
+    "first_name": ("first name", "firstname", "given name"),
+    "last_name": ("last name", "lastname", "surname", "family name"),
+    "name": ("name", "full name", "contact name"),
+    "email": ("email", "e mail", "email address", "mail"),
+    "phone": ("phone", "phone number", "mobile", "telephone", "tel"),
+    "company": ("company", "organization", "organisation", "account", "company name"),
+}
+COMPANY_SUFFIXES = {"inc", "llc", "ltd", "co", "corp", "corporation", "gmbh", "plc", "company"}
+
+_NON_DIGITS = re.compile(r"\D+")
+_NON_WORD = re.compile(r"[^a-z0-9 ]+")
+
+
+# --- Normalization ---
+def normalize_email(value):
+    """Lowercases and trims an email, drops a +tag and Gmail's ignored dots; "" if invalid."""
+    local, at, domain = value.strip().lower().rpartition("@")
+    if not at or not local or "." not in domain or " " in local:
+        return ""
+    local = local.split("+", 1)[0]
+    if domain in ("gmail.com", "googlemail.com"):
+        local, domain = local.replace(".", ""), "gmail.com"
+    return f"{local}@{domain}"
+
+
+def normalize_phone(value, country_code=COUNTRY_CODE):
+    """Returns a phone number as +<digits> (E.164 style), adding `country_code` to national numbers."""
+    value = value.strip().lower().split("x", 1)[0]
+    digits = _NON_DIGITS.sub("", value)
+    if value.startswith("+"):
+        pass
+    elif digits.startswith("00"):
+        digits = digits[2:]
+    elif len(digits) == 10:
+        digits = country_code + digits
+    elif len(digits) == 11 and digits.startswith(country_code) and country_code == "1":
+        pass
+    else:
+        digits = ""
+    return "+" + digits if 8 <= len(digits) <= 15 else ""
+
+
+def normalize_company(value):
+    """Lowercase company name without punctuation or legal suffixes ("Acme, Inc." -> "acme")."""
+    words = _NON_WORD.sub(" ", value.lower()).split()
+    while words and words[-1] in COMPANY_SUFFIXES:
+        words.pop()
+    return " ".join(words)
+
+
+def map_columns(header):
+    """Maps each field to its column index in `header`; raises ValueError without email or phone."""
+    names = [" ".join(name.strip().lower().replace("_", " ").replace("-", " ").split()) for name in header]
+    columns = {}
+    for field, aliases in ALIASES.items():
+        for i, name in enumerate(names):
+            if name in aliases:
+                columns[field] = i
+                break
+    if "email" not in columns and "phone" not in columns:
+        raise ValueError(f"No email or phone column in the header: {', '.join(header)}")
+    return columns
+
+
+# --- Deduplication ---
+class HashIndex:
+    """Open-addressing hash table from 64-bit key hashes to contact ids, in two flat arrays.
+
+    Costs 12 bytes a slot (at most half full) where a dict of email strings costs well
+    over 100 bytes an entry, so the index for millions of contacts stays small.
+    """
+
+    def __init__(self, capacity=1 << 16):
+        self.size = 0
+        self._allocate(capacity)
+
+    def _allocate(self, capacity):
+        self.mask = capacity - 1
+        self.keys = array("Q", bytes(8 * capacity))
+        self.values = array("i", bytes(4 * capacity))
+
+    @staticmethod
+    def key(value):
+        return (hash(value) & 0xFFFFFFFFFFFFFFFF) or 1
+
+    def _slot(self, key):
+        keys, mask = self.keys, self.mask
+        i = key & mask
+        while keys[i] and keys[i] != key:
+            i = (i + 1) & mask
+        return i
+
+    def get(self, value, default=-1):
+        key = self.key(value)
+        i = self._slot(key)
+        return self.values[i] if self.keys[i] == key else default
+
+    def put(self, value, contact):
+        if 2 * (self.size + 1) > len(self.keys):
+            old_keys, old_values = self.keys, self.values
+            self._allocate(2 * len(old_keys))
+            for key, old in zip(old_keys, old_values):
+                if key:
+                    i = self._slot(key)
+                    self.keys[i], self.values[i] = key, old
+        key = self.key(value)
+        i = self._slot(key)
+        if not self.keys[i]:
+            self.size += 1
+        self.keys[i], self.values[i] = key, contact
+
+    @property
+    def nbytes(self):
+        return len(self.keys) * (self.keys.itemsize + self.values.itemsize)
+
+
+class ContactBook:
+    """Imported contacts: hash indexes for exact matches, name blocks for fuzzy ones, rows spooled to disk."""
+
+    def __init__(self):
+        self.by_email = HashIndex()
+        self.by_phone = HashIndex()
+        # Block key -> newest contact in the block; earlier ones are chained through _previous.
+        self.blocks = HashIndex()
+        self._previous = array("q")
+        self._names = bytearray()
+        self._name_ends = array("Q")
+        self.size = 0
+        self.outcomes = {"new": 0, "email": 0, "phone": 0, "fuzzy": 0, "invalid": 0}
+        self.fuzzy_examples = []
+        self.spool = tempfile.TemporaryFile("w+", newline="", encoding="utf-8")
+        # Sessions end without telling the script, so the spool closes when the book is collected.
+        self._closer = weakref.finalize(self, self.spool.close)
+        self._writer = csv.writer(self.spool)
+        self._writer.writerow(HEADER)
+        self._lock = threading.Lock()
+
+    @property
+    def nbytes(self):
+        """Memory held by the dedupe indexes and the names kept for fuzzy matching."""
+        arrays = (self._previous, self._name_ends)
+        return (self.by_email.nbytes + self.by_phone.nbytes + self.blocks.nbytes + len(self._names)
+                + sum(len(a) * a.itemsize for a in arrays))
+
+    def name(self, contact):
+        start = self._name_ends[contact - 1] if contact else 0
+        return self._names[start:self._name_ends[contact]].decode()
+
+    def _fuzzy_match(self, key, name):
+        contact = self.blocks.get(key)
+        for _ in range(BLOCK_COMPARISONS):
+            if contact < 0:
+                break
+            other = self.name(contact)
+            matcher = difflib.SequenceMatcher(None, name, other)
+            if matcher.real_quick_ratio() >= FUZZY_THRESHOLD and matcher.ratio() >= FUZZY_THRESHOLD:
+                return contact, other
+            contact = self._previous[contact]
+        return None
+
+    def add(self, first, last, email, phone, company):
+        """Adds one raw contact unless it duplicates an earlier one; returns the outcome."""
+        email, phone = normalize_email(email), normalize_phone(phone)
+        if not email and not phone:
+            outcome = "invalid"
+        elif email and self.by_email.get(email) >= 0:
+            outcome = "email"
+        elif phone and self.by_phone.get(phone) >= 0:
+            outcome = "phone"
+        else:
+            first, last = first.strip(), last.strip()
+            name = f"{first} {last}".lower()
+            company_key = normalize_company(company)
+            key = f"{company_key}|{last[:4].lower()}|{first[:1].lower()}" if company_key and last else None
+            match = self._fuzzy_match(key, name) if key else None
+            if match:
+                outcome = "fuzzy"
+                if len(self.fuzzy_examples) < 10:
+                    self.fuzzy_examples.append((f"{first} {last} <{email or phone}>", match[1], match[0]))
+            else:
+                outcome = "new"
+                contact = self.size
+                self.size += 1
+                if email:
+                    self.by_email.put(email, contact)
+                if phone:
+                    self.by_phone.put(phone, contact)
+                self._names += name.encode() if key else b""
+                self._name_ends.append(len(self._names))
+                self._previous.append(self.blocks.get(key) if key else -1)
+                if key:
+                    self.blocks.put(key, contact)
+                self._writer.writerow((first, last, email, phone, company.strip()))
+        self.outcomes[outcome] += 1
+        return outcome
+
+    def import_csv(self, binary, total_bytes=None, progress=None):
+        """Imports a CSV from a buffered binary file, calling progress(bytes_read, rows) as it goes.
+
+        Open files from disk with buffering=CHUNK_BYTES. Returns the number of data rows read.
+        """
+        text = io.TextIOWrapper(binary, encoding="utf-8-sig", errors="replace", newline="")
+        rows = 0
+        try:
+            reader = csv.reader(text)
+            columns = map_columns(next(reader, []))
+            index = [columns.get(field) for field in (*FIELDS, "name")]
+            with self._lock:
+                for row in reader:
+                    first, last, email, phone, company, name = (
+                        row[i] if i is not None and i < len(row) else "" for i in index
+                    )
+                    if not first and not last:
+                        first, _, last = name.strip().rpartition(" ")
+                    self.add(first, last, email, phone, company)
+                    rows += 1
+                    if progress and rows % PROGRESS_ROWS == 0:
+                        progress(binary.tell(), rows)
+                self.spool.flush()
+        finally:
+            text.detach()
+        if progress:
+            progress(total_bytes or binary.tell(), rows)
+        return rows
+
+    def export_chunks(self, chunk_bytes=CHUNK_BYTES):
+        """Yields the deduplicated contacts as CSV bytes, chunk_bytes at a time, straight from the spool."""
+        with self._lock:
+            self.spool.flush()
+            end = os.fstat(self.spool.fileno()).st_size
+        offset = 0
+        while offset < end:
+            chunk = os.pread(self.spool.fileno(), min(chunk_bytes, end - offset), offset)
+            if not chunk:
+                break
+            offset += len(chunk)
+            yield chunk
+
+    def close(self):
+        self._closer()
+
+    def export(self):
+        """Returns the whole export as bytes, for a deferred st.download_button."""
+        return b"".join(self.export_chunks())
+
+
+# --- Sample data ---
+FIRST_NAMES = (
+    "James", "Mary", "John", "Patricia", "Robert", "Jennifer", "Michael", "Linda", "David", "Elizabeth",
+    "William", "Barbara", "Richard", "Susan", "Joseph", "Jessica", "Thomas", "Sarah", "Charles", "Karen",
+    "Daniel", "Nancy", "Matthew", "Lisa", "Anthony", "Betty", "Mark", "Sandra", "Steven", "Ashley",
+    "Andrew", "Emily", "Joshua", "Michelle", "Kevin", "Amanda", "Brian", "Melissa", "George", "Stephanie",
+    "Priya", "Wei", "Fatima", "Carlos", "Aisha", "Hiroshi", "Sofia", "Mateo", "Olga", "Kwame",
+)
+SURNAME_HEADS = ("Bar", "Cal", "Dun", "Ell", "Fair", "Gar", "Hal", "Kel", "Lang", "Mor", "Nor", "Pem",
+                 "Rad", "Sel", "Thorn", "Wal", "Ash", "Brook", "Craw", "Dal", "Ever", "Good", "Harr", "Whit")
+SURNAME_TAILS = ("ton", "ley", "wood", "son", "field", "more", "well", "ford", "by", "stone", "worth",
+                 "ridge", "mann", "ing", "ham", "er", "away", "croft", "dale", "shaw")
+COMPANY_WORDS = ("Blue", "North", "Bright", "Summit", "Apex", "Pine", "Silver", "Harbor", "Nova", "Cedar",
+                 "Quantum", "River", "Iron", "Golden", "Maple", "Vertex", "Orbit", "Coral", "Falcon", "Atlas")
+COMPANY_KINDS = ("Labs", "Media", "Studio", "Systems", "Partners", "Health", "Foods", "Logistics", "Academy",
+                 "Digital")
+FREE_DOMAINS = ("gmail.com", "yahoo.com", "outlook.com", "icloud.com")
+
+
+def _typo(word, rng):
+    """Swaps two neighbouring letters after the first, or doubles one: a plausible typing slip."""
+    if len(word) < 4:
+        return word + word[-1]
+    i = int(rng.integers(1, len(word) - 1))
+    return word[:i] + word[i + 1] + word[i] + word[i + 2:] if rng.random() < 0.5 else word[:i] + word[i] + word[i:]
+
+
+def write_sample(f, rows=SAMPLE_ROWS, seed=SEED, duplicate_share=0.15):
+    """Writes a messy synthetic contacts CSV to text file `f`; about duplicate_share of rows repeat someone.
+
+    Repeats come as the same email with different case and spacing, the same phone in
+    another format under a personal email, or a name typo at the same company without
+    a phone. Returns the number of repeated rows.
+    """
+    rng = np.random.default_rng(seed)
+    people = rows
+    first = rng.integers(len(FIRST_NAMES), size=people)
+    head = rng.integers(len(SURNAME_HEADS), size=people)
+    tail = rng.integers(len(SURNAME_TAILS), size=people)
+    company = rng.integers(max(rows // 150, 1000), size=people)
+    phone = rng.integers(2_000_000_000, 9_999_999_999, size=people)
+    has_phone = rng.random(people) < 0.8
+    work_email = rng.random(people) < 0.6
+    repeat = rng.random(rows) < duplicate_share
+    repeat[0] = False
+    writer = csv.writer(f)
+    writer.writerow(("first_name", "Last Name", "E-mail", "Phone Number", "Organization"))
+    formats = ("({0}) {1}-{2}", "{0}.{1}.{2}", "+1 {0} {1} {2}", "{0}{1}{2}", "1-{0}-{1}-{2}")
+    person = 0
+    for i in range(rows):
+        kind = 0
+        if repeat[i]:
+            p = int(rng.integers(person)) if person else 0
+            kind = int(rng.integers(1, 4))
+        else:
+            p = person
+            person += 1
+        first_name = FIRST_NAMES[first[p]]
+        last_name = SURNAME_HEADS[head[p]] + SURNAME_TAILS[tail[p]]
+        c = int(company[p])
+        org = f"{COMPANY_WORDS[c % 20]} {COMPANY_KINDS[c // 20 % 10]} {c // 200 + 1}"
+        domain = (_NON_WORD.sub("", org.lower().replace(" ", "")) + ".com") if work_email[p] \
+            else FREE_DOMAINS[p % len(FREE_DOMAINS)]
+        email = f"{first_name}.{last_name}{p}@{domain}".lower()
+        digits = f"{phone[p]:010d}"
+        number = formats[(p + kind) % len(formats)].format(digits[:3], digits[3:6], digits[6:]) if has_phone[p] else ""
+        if kind == 1:
+            email = f"  {email.upper() if rng.random() < 0.5 else email.capitalize()} "
+            org = org.upper()
+        elif kind == 2 and number:
+            email = f"{first_name[0]}{last_name}{p}@{FREE_DOMAINS[(p + 1) % len(FREE_DOMAINS)]}".lower()
+        elif kind in (2, 3):
+            first_name = _typo(first_name, rng)
+            email = f"{first_name[0]}.{last_name}.{p}@{FREE_DOMAINS[(p + 2) % len(FREE_DOMAINS)]}".lower()
+            number = ""
+            org = org + ", Inc."
+        writer.writerow((first_name, last_name, email, number, org))
+    return int(repeat.sum())
+
+
+@st.cache_resource(show_spinner="Generating a sample CSV…")
+def sample_file(rows=SAMPLE_ROWS, seed=SEED):
+    """Writes the sample CSV once per process and returns its path."""
+    path = os.path.join(tempfile.gettempdir(), f"metsys-contacts-{rows}-{seed}.csv")
+    if not os.path.exists(path):
+        with open(path + ".part", "w", newline="", encoding="utf-8") as f:
+            write_sample(f, rows, seed)
+        os.replace(path + ".part", path)
+    return path
+
+
+# --- Rendering ---
+def _import(book, binary, total_bytes, name):
+    bar = st.progress(0.0, text=f"Importing {name}…")
+    started = time.perf_counter()
+
+    def progress(done, rows):
+        rate = rows / max(time.perf_counter() - started, 1e-9)
+        bar.progress(min(done / total_bytes, 1.0) if total_bytes else 0.0,
+                     text=f"{name}: {rows:,} rows · {done / 1e6:,.1f} of {total_bytes / 1e6:,.1f} MB · "
+                          f"{rate:,.0f} rows/s")
+
+    rows = book.import_csv(binary, total_bytes, progress)
+    elapsed = time.perf_counter() - started
+    return f"Imported {rows:,} rows from {name} in {elapsed:.2f} s ({rows / max(elapsed, 1e-9):,.0f} rows/s)."
+
+
+def render():
+    """Renders the import pipeline: upload (or sample) CSV, live progress, dedupe report and export."""
+    st.subheader("🧪 Live Demo: Bulk Import & Export")
+    st.caption(
+        "Upload a contacts CSV (any column names like Email, Phone, First Name, Company). It is parsed in "
+        f"{CHUNK_BYTES >> 10:,} KB chunks; emails and phones are normalized and duplicates are caught by "
+        "exact email or phone, or by a fuzzy name match at the same company. Uploads are held in memory "
+        f"and limited to {st.get_option('server.maxUploadSize'):,} MB; the sample streams from disk."
+    )
+    book = st.session_state.get("crm_import_book")
+    if book is None:
+        book = st.session_state["crm_import_book"] = ContactBook()
+
+    upload = st.file_uploader("Contacts CSV", type="csv", key="crm_import_file")
+    cols = st.columns(3)
+    try:
+        if cols[0].button("Import file", key="crm_import_upload", disabled=upload is None):
+            upload.seek(0)
+            st.session_state["crm_import_done"] = _import(book, upload, upload.size, upload.name)
+            st.rerun()
+        if cols[1].button(f"Import a {SAMPLE_ROWS:,}-row sample", key="crm_import_sample"):
+            path = sample_file()
+            with open(path, "rb", buffering=CHUNK_BYTES) as f:
+                st.session_state["crm_import_done"] = _import(book, f, os.path.getsize(path), "sample.csv")
+            st.rerun()
+    except (ValueError, csv.Error, UnicodeError) as e:
+        st.error(f"Could not import the file: {e}")
+    if cols[2].button("Clear contacts", key="crm_import_clear", disabled=not book.size):
+        book.close()
+        del st.session_state["crm_import_book"]
+        st.rerun()
+
+    done = st.session_state.pop("crm_import_done", None)
+    if done:
+        st.success(done)
+    if not sum(book.outcomes.values()):
+        return
+
+    outcomes = book.outcomes
+    stats = st.columns(5)
+    stats[0].metric("New contacts", f"{outcomes['new']:,}")
+    stats[1].metric("Same email", f"{outcomes['email']:,}")
+    stats[2].metric("Same phone", f"{outcomes['phone']:,}")
+    stats[3].metric("Fuzzy name match", f"{outcomes['fuzzy']:,}")
+    stats[4].metric("No email or phone", f"{outcomes['invalid']:,}")
+    st.caption(f"Dedupe indexes for {book.size:,} contacts use {book.nbytes / 1e6:.1f} MB; "
+               "the contacts themselves are spooled to disk.")
+    if book.fuzzy_examples:
+        st.dataframe(
+            {
+                "Incoming row": [incoming for incoming, _, _ in book.fuzzy_examples],
+                "Matched contact": [matched.title() for _, matched, _ in book.fuzzy_examples],
+                "Contact #": [contact for _, _, contact in book.fuzzy_examples],
+            },
+            hide_index=True,
+        )
+
+    st.download_button(
+        f"⬇️ Download {book.size:,} contacts as CSV",
+        # Deferred: the spool is only read when the button is clicked.
+        book.export,
+        file_name="contacts.csv",
+        mime="text/csv",
+        key="crm_import_export",
+    )
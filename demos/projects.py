@@ -0,0 +1,315 @@
+"""Project management demo: a critical-path scheduling engine behind a Gantt chart.
+
+Tasks are numbered rows; dependencies are stored twice in CSR form (an offsets array and
+a flat array of task numbers), once as predecessors and once as successors. Tasks are
+grouped into topological levels (a task's level is one more than its deepest
+predecessor), and the critical-path method runs one level at a time with NumPy: every
+task in a level takes the latest finish of its predecessors in one reduceat.
+
+For each task the engine keeps its earliest start (the longest path into it) and its
+tail (its duration plus the longest path out of it). The program finishes at
+max(earliest start + tail), a task's latest start is finish - tail, and its slack is
+finish - earliest start - tail; tasks with no slack form the critical path.
+
+Changing a duration only moves earliest starts downstream of the task and tails
+upstream of it, so an edit walks just those two subgraphs level by level and stops
+wherever a value comes out unchanged.
+"""
+import datetime
+import heapq
+import os
+import threading
+import time
+
+import numpy as np
+import streamlit as st
+
+from demos import SEED
+
+# --- Configuration ---
+TASKS = int(os.environ.get("METSYS_DEMO_TASKS", 100_000))
+PROJECTS = ("Website Relaunch", "Mobile App", "Course Platform", "Data Warehouse", "CRM Migration",
+            "Brand Refresh", "Partner Portal", "Billing Overhaul", "Support Center", "Marketplace Launch")
+# Newest tasks of the same project a task may depend on.
+DEPENDENCY_WINDOW = 1000
+CROSS_PROJECT_SHARE = 0.005
+MILESTONE_EVERY = 50
+# Past this share of the tasks, an edit stops propagating and runs a full pass instead.
+FULL_PASS_SHARE = 0.3
+START = datetime.date(2026, 1, 5)
+GANTT_ROWS = 40
+VERBS = ("Design", "Build", "Review", "Test", "Document", "Deploy", "Plan", "Migrate", "Integrate", "Approve")
+NOUNS = ("API", "checkout", "dashboard", "onboarding", "reports", "search", "payments", "emails", "exports",
+         "permissions", "landing page", "mobile views")
+
+
+def _gather(ptr, idx, nodes):
+    """Neighbours of `nodes` in a CSR graph, as (flat neighbours, nodes with any, segment starts)."""
+    counts = ptr[nodes + 1] - ptr[nodes]
+    has = counts > 0
+    counts = counts[has]
+    starts = np.zeros(len(counts), dtype=np.int64)
+    np.cumsum(counts[:-1], out=starts[1:])
+    positions = np.repeat(ptr[nodes[has]] - starts, counts) + np.arange(starts[-1] + counts[-1] if len(counts) else 0)
+    return idx[positions], has, starts
+
+
+def _csr(sources, targets, n):
+    """Builds (offsets, targets) with each source's targets contiguous."""
+    order = np.argsort(sources, kind="stable")
+    ptr = np.zeros(n + 1, dtype=np.int64)
+    np.cumsum(np.bincount(sources, minlength=n), out=ptr[1:])
+    return ptr, targets[order].astype(np.int32)
+
+
+class Schedule:
+    """Critical-path schedule over a dependency DAG with level-by-level incremental updates."""
+
+    def __init__(self, durations, pred_sources, pred_targets):
+        """Builds the engine from durations (days) and edges pred_sources[i] -> pred_targets[i].
+
+        Raises ValueError if the dependencies contain a cycle.
+        """
+        n = len(durations)
+        self.size = n
+        self.pred_ptr, self.pred_idx = _csr(pred_targets, pred_sources, n)
+        self.succ_ptr, self.succ_idx = _csr(pred_sources, pred_targets, n)
+        self.level = self._levels()
+        order = np.argsort(self.level, kind="stable")
+        bounds = np.flatnonzero(np.diff(self.level[order])) + 1
+        self.by_level = np.split(order, bounds)
+        self.duration = np.asarray(durations, dtype=np.int32).copy()
+        self.start = np.zeros(n, dtype=np.int32)
+        self.tail = np.zeros(n, dtype=np.int32)
+        self._lock = threading.Lock()
+        self.recompute()
+
+    @property
+    def edges(self):
+        return len(self.pred_idx)
+
+    def _levels(self):
+        level = np.full(self.size, -1, dtype=np.int32)
+        waiting = np.diff(self.pred_ptr)
+        frontier = np.flatnonzero(waiting == 0)
+        depth = 0
+        while len(frontier):
+            level[frontier] = depth
+            successors, _, _ = _gather(self.succ_ptr, self.succ_idx, frontier)
+            np.subtract.at(waiting, successors, 1)
+            frontier = np.unique(successors[waiting[successors] == 0])
+            depth += 1
+        if (level < 0).any():
+            raise ValueError(f"Dependency cycle through {int((level < 0).sum())} tasks")
+        return level
+
+    def copy(self):
+        """A schedule sharing this one's graph, with its own durations and times (for what-ifs)."""
+        clone = object.__new__(Schedule)
+        clone.__dict__.update(self.__dict__)
+        clone.duration, clone.start, clone.tail = self.duration.copy(), self.start.copy(), self.tail.copy()
+        clone._lock = threading.Lock()
+        return clone
+
+    def _starts(self, nodes):
+        """Earliest starts of `nodes`: the latest finish among their predecessors."""
+        preds, has, starts = _gather(self.pred_ptr, self.pred_idx, nodes)
+        result = np.zeros(len(nodes), dtype=np.int32)
+        if len(preds):
+            result[has] = np.maximum.reduceat(self.start[preds] + self.duration[preds], starts)
+        return result
+
+    def _tails(self, nodes):
+        """Tails of `nodes`: their duration plus the longest tail among their successors."""
+        succs, has, starts = _gather(self.succ_ptr, self.succ_idx, nodes)
+        result = self.duration[nodes].copy()
+        if len(succs):
+            result[has] += np.maximum.reduceat(self.tail[succs], starts)
+        return result
+
+    def recompute(self):
+        """Full forward and backward pass over every level."""
+        for nodes in self.by_level:
+            self.start[nodes] = self._starts(nodes)
+        for nodes in reversed(self.by_level):
+            self.tail[nodes] = self._tails(nodes)
+
+    def _propagate(self, task, values, compute, neighbours, downstream):
+        """Recomputes `values` from `task` outward, a level at a time, until nothing changes.
+
+        Returns the number of tasks recomputed, or None once that passes FULL_PASS_SHARE
+        of the graph, where a full pass is quicker (the values are then left half updated).
+        """
+        ptr, idx = neighbours
+        sign = 1 if downstream else -1
+        pending = {int(self.level[task]): {task}}
+        heap = [int(self.level[task]) * sign]
+        visited = 0
+        while heap:
+            depth = abs(heapq.heappop(heap))
+            nodes = np.fromiter(pending.pop(depth), dtype=np.int64)
+            visited += len(nodes)
+            if visited > FULL_PASS_SHARE * self.size:
+                return None
+            fresh = compute(nodes)
+            changed = nodes[(fresh != values[nodes]) | (nodes == task)]
+            values[nodes] = fresh
+            following, _, _ = _gather(ptr, idx, changed)
+            if not len(following):
+                continue
+            levels = self.level[following]
+            order = np.argsort(levels, kind="stable")
+            bounds = np.flatnonzero(np.diff(levels[order])) + 1
+            for group in np.split(following[order], bounds):
+                depth = int(self.level[group[0]])
+                if depth not in pending:
+                    pending[depth] = set()
+                    heapq.heappush(heap, depth * sign)
+                pending[depth].update(group.tolist())
+        return visited
+
+    def set_duration(self, task, days):
+        """Changes one task's duration and updates the schedule incrementally.
+
+        Returns (tasks recomputed downstream, tasks recomputed upstream), or None when the
+        edit reached too much of the graph and a full pass ran instead.
+        """
+        with self._lock:
+            self.duration[task] = days
+            downstream = self._propagate(task, self.start, self._starts, (self.succ_ptr, self.succ_idx), True)
+            upstream = None
+            if downstream is not None:
+                upstream = self._propagate(task, self.tail, self._tails, (self.pred_ptr, self.pred_idx), False)
+            if upstream is None:
+                self.recompute()
+                return None
+        return downstream, upstream
+
+    def finish(self):
+        """Program length in days."""
+        return int((self.start + self.tail).max())
+
+    def slack(self, nodes=None):
+        """Total float in days of `nodes` (all tasks by default); 0 on the critical path."""
+        nodes = slice(None) if nodes is None else nodes
+        return self.finish() - self.start[nodes] - self.tail[nodes]
+
+
+def generate(tasks=TASKS, seed=SEED):
+    """Builds a seeded program of PROJECTS with layered dependencies and milestones.
+
+    Returns (schedule, project of each task).
+    """
+    rng = np.random.default_rng(seed)
+    project = (np.arange(tasks) * len(PROJECTS) // tasks).astype(np.int8)
+    first = np.searchsorted(project, project)
+    durations = rng.choice([1, 2, 3, 5, 5, 8, 10, 15], size=tasks).astype(np.int32)
+    milestone = (np.arange(tasks) - first) % MILESTONE_EVERY == MILESTONE_EVERY - 1
+    durations[milestone] = 0
+
+    counts = np.where(np.arange(tasks) == first, 0, rng.choice([0, 1, 1, 1, 2, 2, 3], size=tasks))
+    counts[milestone] = 4
+    targets = np.repeat(np.arange(tasks), counts)
+    window = np.minimum(targets - first[targets], DEPENDENCY_WINDOW)
+    sources = targets - 1 - (rng.random(len(targets)) * window).astype(np.int64)
+    cross = np.flatnonzero((rng.random(tasks) < CROSS_PROJECT_SHARE) & (first > 0))
+    sources = np.concatenate([sources, (rng.random(len(cross)) * first[cross]).astype(np.int64)])
+    targets = np.concatenate([targets, cross])
+    edges = np.unique(sources * tasks + targets)
+    return Schedule(durations, edges // tasks, edges % tasks), project
+
+
+@st.cache_resource(show_spinner="Scheduling the sample program…")
+def get_schedule(tasks=TASKS, seed=SEED):
+    """Builds the shared sample program once per process; sessions edit copies of it."""
+    return generate(tasks, seed)
+
+
+def task_name(task, milestone=False):
+    if milestone:
+        return f"◆ Milestone #{task}"
+    return f"{VERBS[task % len(VERBS)]} {NOUNS[task // len(VERBS) % len(NOUNS)]} #{task}"
+
+
+def gantt_rows(schedule, tasks, milestones):
+    """The Gantt bars for `tasks` as columns, computed with array operations."""
+    start = np.datetime64(START) + schedule.start[tasks].astype("timedelta64[D]")
+    slack = schedule.slack(tasks)
+    return {
+        "Task": [task_name(t, m) for t, m in zip(tasks.tolist(), milestones[tasks].tolist())],
+        "Start": start,
+        "Finish": start + np.maximum(schedule.duration[tasks], 1).astype("timedelta64[D]"),
+        "Days": schedule.duration[tasks],
+        "Slack": slack,
+        "Critical": np.where(slack == 0, "Critical path", "Has slack"),
+    }
+
+
+# --- Rendering ---
+def render():
+    """Renders the Gantt demo: pick a project window, edit a task's duration, see the schedule move."""
+    import altair as alt
+    import pandas as pd
+
+    base, project = get_schedule()
+    milestones = base.duration == 0
+    schedule = st.session_state.get("projects_demo_schedule")
+    if schedule is None:
+        schedule = st.session_state["projects_demo_schedule"] = base.copy()
+
+    st.subheader("🧪 Live Demo: Critical Path Scheduling")
+    summary = st.empty()
+    controls = st.columns([2, 3])
+    name = controls[0].selectbox("Project", PROJECTS, key="projects_demo_project")
+    tasks = np.flatnonzero(project == PROJECTS.index(name))
+    tasks = tasks[np.lexsort((tasks, schedule.start[tasks]))]
+    if not len(tasks):
+        st.info(f"{name} has no tasks at this sample size.")
+        return
+    scroll = max(len(tasks) - GANTT_ROWS, 0)
+    if scroll:
+        if st.session_state.get("projects_demo_offset", 0) > scroll:
+            st.session_state["projects_demo_offset"] = scroll
+        offset = controls[1].slider("Scroll the timeline (tasks)", 0, scroll, 0, step=GANTT_ROWS // 2,
+                                    key="projects_demo_offset")
+    else:
+        offset = 0
+    window = tasks[offset:offset + GANTT_ROWS]
+
+    edit = st.columns([3, 2, 1])
+    task = edit[0].selectbox("Task", window.tolist(), format_func=lambda t: task_name(t, milestones[t]),
+                             key="projects_demo_task")
+    days = edit[1].slider("Duration (days)", 0, 60, int(schedule.duration[task]), key=f"projects_demo_days_{task}")
+    if edit[2].button("Reset", key="projects_demo_reset"):
+        for key in [key for key in st.session_state if key.startswith("projects_demo_days_")]:
+            del st.session_state[key]
+        del st.session_state["projects_demo_schedule"]
+        st.rerun()
+    if days != schedule.duration[task]:
+        before = schedule.finish()
+        started = time.perf_counter()
+        touched = schedule.set_duration(task, days)
+        elapsed = (time.perf_counter() - started) * 1000
+        scope = (f"{touched[0]:,} tasks downstream and {touched[1]:,} upstream recomputed" if touched
+                 else "it reached most of the program, so a full pass ran")
+        st.caption(f"Rescheduled in {elapsed:.1f} ms: {scope}; the finish moved {schedule.finish() - before:+d} days.")
+
+    finish = START + datetime.timedelta(days=schedule.finish())
+    summary.caption(
+        f"A synthetic program of {schedule.size:,} tasks in {len(PROJECTS)} projects with {schedule.edges:,} "
+        f"dependencies ({len(schedule.by_level):,} levels deep). It finishes on {finish:%d %b %Y}; "
+        f"{int((schedule.slack() == 0).sum()):,} tasks are on the critical path."
+    )
+    started = time.perf_counter()
+    rows = gantt_rows(schedule, window, milestones)
+    elapsed = (time.perf_counter() - started) * 1000
+    chart = alt.Chart(pd.DataFrame(rows)).mark_bar(cornerRadius=3).encode(
+        x=alt.X("Start:T", title=None),
+        x2="Finish:T",
+        y=alt.Y("Task:N", sort=None, title=None),
+        color=alt.Color("Critical:N", scale=alt.Scale(domain=["Critical path", "Has slack"],
+                                                      range=["#e4572e", "#4c78a8"]), title=None),
+        tooltip=["Task", "Start:T", "Finish:T", "Days", "Slack"],
+    ).properties(height=GANTT_ROWS * 18)
+    st.altair_chart(chart)
+    st.caption(f"Timeline rows for {len(window)} tasks computed in {elapsed:.2f} ms.")
@@ -0,0 +1,386 @@
+"""Two-tier image cache: a shared in-memory LRU on top of a content-addressed disk store."""
+import hashlib
+import json
+import os
+import random
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from urllib.parse import urlsplit
+
+import metrics
+
+# --- Configuration ---
+CACHE_DIR = os.environ.get(
+    "METSYS_CACHE_DIR",
+    os.path.join(os.path.dirname(os.path.abspath(__file__)), ".cache", "images"),
+)
+MEMORY_BUDGET = int(os.environ.get("METSYS_IMAGE_MEMORY_BYTES", 64 * 1024 * 1024))
+TTL = float(os.environ.get("METSYS_IMAGE_TTL", 3600))
+FETCH_WORKERS = int(os.environ.get("METSYS_FETCH_WORKERS", 16))
+# "<prefix>=<replacement>": fetch URLs under prefix from a mirror or local stand-in
+# instead. Cache entries stay keyed by the original URL.
+URL_REWRITE = os.environ.get("METSYS_URL_REWRITE", "")
+# Fail-fast fetching: a stalled or failing blob host costs a rerun seconds, not forever.
+CONNECT_TIMEOUT = float(os.environ.get("METSYS_CONNECT_TIMEOUT", 3.05))
+READ_TIMEOUT = float(os.environ.get("METSYS_READ_TIMEOUT", 10))
+RETRIES = int(os.environ.get("METSYS_FETCH_RETRIES", 2))
+RETRY_BACKOFF = float(os.environ.get("METSYS_RETRY_BACKOFF", 0.25))
+RETRY_STATUSES = {429, 500, 502, 503, 504}
+NEGATIVE_TTL = float(os.environ.get("METSYS_NEGATIVE_TTL", 30))
+BREAKER_THRESHOLD = int(os.environ.get("METSYS_BREAKER_THRESHOLD", 5))
+BREAKER_COOLDOWN = float(os.environ.get("METSYS_BREAKER_COOLDOWN", 30))
+
+
+class FetchFailed(IOError):
+    """Raised when an image cannot be fetched right now; callers should degrade rather than wait."""
+
+
+class HostUnavailable(FetchFailed):
+    """Raised without any request while the host's circuit breaker is open."""
+
+
+def rewrite_url(url, rule=URL_REWRITE):
+    """Applies the METSYS_URL_REWRITE rule to `url`."""
+    prefix, _, replacement = rule.partition("=")
+    if prefix and url.startswith(prefix):
+        return replacement + url[len(prefix):]
+    return url
+
+
+class LRUCache:
+    """Thread-safe LRU mapping bounded by the total size in bytes of its values."""
+
+    def __init__(self, max_bytes):
+        self.max_bytes = max_bytes
+        self.size = 0
+        self._items = OrderedDict()
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        return len(self._items)
+
+    def get(self, key):
+        with self._lock:
+            value = self._items.get(key)
+            if value is not None:
+                self._items.move_to_end(key)
+            return value
+
+    def put(self, key, value):
+        if len(value) > self.max_bytes:
+            return
+        with self._lock:
+            old = self._items.pop(key, None)
+            if old is not None:
+                self.size -= len(old)
+            self._items[key] = value
+            self.size += len(value)
+            while self.size > self.max_bytes:
+                _, evicted = self._items.popitem(last=False)
+                self.size -= len(evicted)
+
+
+class DiskStore:
+    """Content-addressed blob store plus an index of URL -> digest and HTTP validators."""
+
+    def __init__(self, directory):
+        self.directory = directory
+        self.index_path = os.path.join(directory, "index.json")
+        os.makedirs(os.path.join(directory, "objects"), exist_ok=True)
+        try:
+            with open(self.index_path) as f:
+                self.index = json.load(f)
+        except (FileNotFoundError, ValueError):
+            self.index = {}
+
+    def _object_path(self, digest):
+        return os.path.join(self.directory, "objects", digest[:2], digest)
+
+    def read(self, digest):
+        try:
+            with open(self._object_path(digest), "rb") as f:
+                return f.read()
+        except FileNotFoundError:
+            return None
+
+    def write(self, data):
+        digest = hashlib.sha256(data).hexdigest()
+        path = self._object_path(digest)
+        if not os.path.exists(path):
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            tmp = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+            with open(tmp, "wb") as f:
+                f.write(data)
+            os.replace(tmp, path)
+        return digest
+
+    def save_index(self):
+        tmp = f"{self.index_path}.{os.getpid()}.tmp"
+        with open(tmp, "w") as f:
+            json.dump(self.index, f, indent=1, sort_keys=True)
+        os.replace(tmp, self.index_path)
+
+
+def make_session(pool_size):
+    """Return a requests session that keeps one pool of `pool_size` keep-alive connections per host."""
+    # Imported here: requests costs ~90 ms at startup and most runs never touch the network.
+    import requests
+    from requests.adapters import HTTPAdapter
+
+    session = requests.Session()
+    adapter = HTTPAdapter(pool_connections=8, pool_maxsize=pool_size)
+    session.mount("https://", adapter)
+    session.mount("http://", adapter)
+    return session
+
+
+class CircuitBreaker:
+    """Per-host circuit breaker for image fetches.
+
+    Opens after `threshold` consecutive failed fetches, then lets a single trial
+    request through every `cooldown` seconds until one succeeds.
+    """
+
+    def __init__(self, threshold=BREAKER_THRESHOLD, cooldown=BREAKER_COOLDOWN):
+        self.threshold = threshold
+        self.cooldown = cooldown
+        self._hosts = {}
+        self._lock = threading.Lock()
+
+    def allow(self, host):
+        with self._lock:
+            state = self._hosts.get(host)
+            if state is None or state["opened"] is None:
+                return True
+            if state["trial"] or time.monotonic() - state["opened"] < self.cooldown:
+                return False
+            state["trial"] = True
+            return True
+
+    def success(self, host):
+        with self._lock:
+            self._hosts.pop(host, None)
+
+    def failure(self, host):
+        with self._lock:
+            state = self._hosts.setdefault(host, {"failures": 0, "opened": None, "trial": False})
+            state["failures"] += 1
+            state["trial"] = False
+            if state["failures"] >= self.threshold:
+                state["opened"] = time.monotonic()
+
+    def open_hosts(self):
+        with self._lock:
+            return [host for host, state in self._hosts.items() if state["opened"] is not None]
+
+
+class ImageCache:
+    """Fetches image bytes by URL, revalidating with ETag/Last-Modified once the TTL expires."""
+
+    def __init__(self, directory=CACHE_DIR, memory_bytes=MEMORY_BUDGET, ttl=TTL, workers=FETCH_WORKERS,
+                 timeout=(CONNECT_TIMEOUT, READ_TIMEOUT), retries=RETRIES, backoff=RETRY_BACKOFF,
+                 negative_ttl=NEGATIVE_TTL, breaker=None, rewrite=URL_REWRITE):
+        self.ttl = ttl
+        self.rewrite = rewrite
+        self.timeout = timeout
+        self.retries = retries
+        self.backoff = backoff
+        self.negative_ttl = negative_ttl
+        self.breaker = breaker or CircuitBreaker()
+        self._failed = {}
+        self.memory = LRUCache(memory_bytes)
+        self.disk = DiskStore(directory)
+        self.workers = workers
+        self._session = None
+        self._executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="image-fetch")
+        self._inflight = {}
+        self._lock = threading.Lock()
+        self._counts = {
+            "memory_hits": 0,
+            "disk_hits": 0,
+            "revalidated": 0,
+            "misses": 0,
+            "network_requests": 0,
+            "bytes_downloaded": 0,
+            "retries": 0,
+            "failures": 0,
+            "short_circuits": 0,
+            "stale_served": 0,
+        }
+
+    @property
+    def session(self):
+        """The HTTP session, created (and requests imported) on the first network fetch."""
+        with self._lock:
+            if self._session is None:
+                self._session = make_session(self.workers)
+            return self._session
+
+    def _count(self, name, amount=1):
+        with self._lock:
+            self._counts[name] += amount
+
+    def _load(self, digest):
+        data = self.memory.get(digest)
+        if data is not None:
+            self._count("memory_hits")
+            return data
+        data = self.disk.read(digest)
+        if data is not None:
+            self._count("disk_hits")
+            self.memory.put(digest, data)
+        return data
+
+    def _request(self, url, headers):
+        """GETs `url` with timeouts, retrying connection errors and 5xx/429 with jittered backoff."""
+        import requests
+
+        target = rewrite_url(url, self.rewrite)
+        host = urlsplit(target).netloc
+        if not self.breaker.allow(host):
+            self._count("short_circuits")
+            raise HostUnavailable(f"{host} is failing; skipping fetches until it recovers")
+        error = None
+        for attempt in range(self.retries + 1):
+            if attempt:
+                self._count("retries")
+                time.sleep(random.uniform(0, self.backoff * 2 ** attempt))
+            self._count("network_requests")
+            start = time.perf_counter()
+            try:
+                response = self.session.get(target, headers=headers, timeout=self.timeout)
+            except requests.RequestException as e:
+                metrics.observe("metsys_fetch_seconds", time.perf_counter() - start, status="error")
+                error = e
+                continue
+            except Exception:
+                # Not retried, but still a failed fetch: otherwise a half-open trial would stay
+                # claimed and the host would never be tried again.
+                self._count("failures")
+                self.breaker.failure(host)
+                raise
+            metrics.observe("metsys_fetch_seconds", time.perf_counter() - start, status=str(response.status_code))
+            if response.status_code in RETRY_STATUSES:
+                error = f"HTTP {response.status_code}"
+                continue
+            self.breaker.success(host)
+            return response
+        self._count("failures")
+        self.breaker.failure(host)
+        raise FetchFailed(f"{url} failed after {self.retries + 1} attempts: {error}")
+
+    def _fetch(self, url, entry):
+        headers = {}
+        if entry:
+            if entry.get("etag"):
+                headers["If-None-Match"] = entry["etag"]
+            if entry.get("last_modified"):
+                headers["If-Modified-Since"] = entry["last_modified"]
+        response = self._request(url, headers)
+        if response.status_code == 304 and entry:
+            self._count("revalidated")
+            return None, response
+        if response.status_code >= 400:
+            self._count("failures")
+            raise FetchFailed(f"HTTP {response.status_code} for {url}")
+        self._count("misses")
+        self._count("bytes_downloaded", len(response.content))
+        return response.content, response
+
+    def get(self, url):
+        """Return the bytes behind `url`, touching the network only when the cache cannot answer.
+
+        If the fetch fails, an expired copy is served when there is one; otherwise
+        FetchFailed is raised, and raised again without a request for the next
+        `negative_ttl` seconds.
+        """
+        entry = self.disk.index.get(url)
+        if entry and time.time() - entry["checked"] < self.ttl:
+            data = self._load(entry["digest"])
+            if data is not None:
+                return data
+            entry = None
+
+        with self._lock:
+            failed = self._failed.get(url)
+        if failed and time.monotonic() < failed[0]:
+            self._count("short_circuits")
+            return self._stale(entry, FetchFailed(failed[1]))
+        try:
+            return self._refresh(url, entry)
+        except FetchFailed as e:
+            if not isinstance(e, HostUnavailable):
+                with self._lock:
+                    self._failed[url] = (time.monotonic() + self.negative_ttl, f"{e} (not retrying for a while)")
+            return self._stale(entry, e)
+
+    def _stale(self, entry, error):
+        """Returns the expired cached copy from `entry`, or raises `error` if there is none."""
+        data = self._load(entry["digest"]) if entry else None
+        if data is None:
+            raise error
+        self._count("stale_served")
+        return data
+
+    def _refresh(self, url, entry):
+        data, response = self._fetch(url, entry)
+        validators = {}
+        if data is None:
+            validators = {"etag": entry.get("etag"), "last_modified": entry.get("last_modified")}
+            data = self._load(entry["digest"])
+            if data is None:
+                # The validated object vanished from disk; fetch it unconditionally.
+                validators = {}
+                data, response = self._fetch(url, None)
+        digest = self.disk.write(data)
+        self.memory.put(digest, data)
+        with self._lock:
+            self.disk.index[url] = {
+                "digest": digest,
+                "etag": response.headers.get("ETag") or validators.get("etag"),
+                "last_modified": response.headers.get("Last-Modified")
+                or validators.get("last_modified"),
+                "checked": time.time(),
+            }
+            self.disk.save_index()
+            self._failed.pop(url, None)
+        return data
+
+    def prefetch(self, urls):
+        """Start fetching every URL concurrently and return a mapping of URL -> Future[bytes].
+
+        Requests for a URL that is already being fetched, by this or another session,
+        share the in-flight future rather than opening a second connection.
+        """
+        futures, started = {}, []
+        with self._lock:
+            for url in urls:
+                if url in futures:
+                    continue
+                future = self._inflight.get(url)
+                if future is None:
+                    future = self._executor.submit(self.get, url)
+                    self._inflight[url] = future
+                    started.append(url)
+                futures[url] = future
+        # Callbacks are attached outside the lock: a future that has already
+        # finished runs its callback immediately, and _finish takes the lock.
+        for url in started:
+            futures[url].add_done_callback(lambda f, url=url: self._finish(url, f))
+        return futures
+
+    def _finish(self, url, future):
+        with self._lock:
+            if self._inflight.get(url) is future:
+                del self._inflight[url]
+
+    def stats(self):
+        """Return hit/miss counters and the current size of the memory tier."""
+        with self._lock:
+            counts = dict(self._counts)
+        counts["open_circuits"] = len(self.breaker.open_hosts())
+        counts["memory_entries"] = len(self.memory)
+        counts["memory_bytes"] = self.memory.size
+        return counts
@@ -0,0 +1,238 @@
+"""Hands screenshots to st.image without decoding them unless a transform is actually needed.
+
+st.image forwards PNG/JPEG bytes untouched when it is told their format and they already
+fit its maximum width; a PIL image, by contrast, is always re-encoded. So the format and
+size are sniffed from the file header, and PIL is only loaded to downscale an image wider
+than Streamlit would display, with the result kept for later reruns.
+
+Such an image is decoded straight down to the width of the slot it fills (JPEG at a
+reduced DCT scale via draft, anything else reduced by an integer factor before the
+final resample). Decodes run on a small shared pool under one byte budget, and
+sessions asking for the same image at once wait for a single decode: with a decode
+per session thread, each thread's malloc arena kept its own full-size buffers.
+"""
+import base64
+import hashlib
+import io
+import mmap
+import os
+import struct
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+from image_cache import LRUCache
+
+# --- Configuration ---
+# streamlit.elements.lib.image_utils.MAXIMUM_CONTENT_WIDTH: wider images are resized by st.image.
+STREAMLIT_MAX_WIDTH = 1460
+# Formats st.image passes through as-is when given output_format.
+PASSTHROUGH_FORMATS = {"PNG", "JPEG"}
+# Formats st.image would re-encode, so they are sent as data: URIs instead.
+DATA_URI_FORMATS = {"GIF": "image/gif", "WEBP": "image/webp", "AVIF": "image/avif"}
+FORMATS_BY_MIME = {"image/png": "PNG", "image/jpeg": "JPEG", **{mime: fmt for fmt, mime in DATA_URI_FORMATS.items()}}
+RESIZED_BUDGET = int(os.environ.get("METSYS_RESIZED_MEMORY_BYTES", 32 * 1024 * 1024))
+# Upper bound on decoded pixel buffers held at once by concurrent downscales.
+DECODE_BUDGET = int(os.environ.get("METSYS_DECODE_MEMORY_BYTES", 64 * 1024 * 1024))
+DECODE_WORKERS = int(os.environ.get("METSYS_DECODE_WORKERS", 2))
+
+
+class ByteBudget:
+    """Blocks callers until their reservation fits under `max_bytes` of in-flight work.
+
+    A single reservation larger than the budget is still admitted once nothing else is
+    in flight, so an oversized image is slow rather than impossible.
+    """
+
+    def __init__(self, max_bytes):
+        self.max_bytes = max_bytes
+        self.in_use = 0
+        self.peak = 0
+        self._cond = threading.Condition()
+
+    def acquire(self, nbytes):
+        with self._cond:
+            while self.in_use and self.in_use + nbytes > self.max_bytes:
+                self._cond.wait()
+            self.in_use += nbytes
+            self.peak = max(self.peak, self.in_use)
+
+    def release(self, nbytes):
+        with self._cond:
+            self.in_use -= nbytes
+            self._cond.notify_all()
+
+
+_resized = LRUCache(RESIZED_BUDGET)
+_decoding = ByteBudget(DECODE_BUDGET)
+_decoder = ThreadPoolExecutor(max_workers=DECODE_WORKERS, thread_name_prefix="metsys-decode")
+_pending = {}
+_pending_lock = threading.Lock()
+
+
+def _jpeg_size(buf):
+    offset = 2
+    while offset + 9 < len(buf):
+        if buf[offset] != 0xFF:
+            return None
+        marker = buf[offset + 1]
+        if marker in (0xD8, 0x01) or 0xD0 <= marker <= 0xD7:
+            offset += 2
+            continue
+        (length,) = struct.unpack(">H", buf[offset + 2:offset + 4])
+        # SOF0..SOF15, excluding DHT (C4), JPG (C8) and DAC (CC).
+        if 0xC0 <= marker <= 0xCF and marker not in (0xC4, 0xC8, 0xCC):
+            height, width = struct.unpack(">HH", buf[offset + 5:offset + 9])
+            return width, height
+        offset += 2 + length
+    return None
+
+
+def _webp_size(buf):
+    chunk = bytes(buf[12:16])
+    if chunk == b"VP8 ":
+        width, height = struct.unpack("<HH", buf[26:30])
+        return width & 0x3FFF, height & 0x3FFF
+    if chunk == b"VP8L":
+        bits = int.from_bytes(buf[21:25], "little")
+        return (bits & 0x3FFF) + 1, ((bits >> 14) & 0x3FFF) + 1
+    if chunk == b"VP8X":
+        return int.from_bytes(buf[24:27], "little") + 1, int.from_bytes(buf[27:30], "little") + 1
+    return None
+
+
+def sniff(buf):
+    """Returns (format, width, height) read from an image's header, without decoding pixels.
+
+    `buf` may be bytes or an mmap. Unknown formats give (None, None, None), and formats
+    whose size is not recorded in a fixed header give None for the dimensions.
+    """
+    head = bytes(buf[:32])
+    size = None
+    if head.startswith(b"\x89PNG\r\n\x1a\n"):
+        fmt, size = "PNG", struct.unpack(">II", head[16:24])
+    elif head.startswith(b"\xff\xd8"):
+        fmt, size = "JPEG", _jpeg_size(buf)
+    elif head[:6] in (b"GIF87a", b"GIF89a"):
+        fmt, size = "GIF", struct.unpack("<HH", head[6:10])
+    elif head.startswith(b"RIFF") and head[8:12] == b"WEBP":
+        fmt, size = "WEBP", _webp_size(buf)
+    elif head[4:8] == b"ftyp" and head[8:12] in (b"avif", b"avis"):
+        fmt = "AVIF"
+    else:
+        fmt = None
+    width, height = size or (None, None)
+    return fmt, width, height
+
+
+def sniff_file(path):
+    """Sniffs a file through a memory map, so only the header pages are ever read."""
+    with open(path, "rb") as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+        return sniff(mapped)
+
+
+def _downscale(source, out_format, max_width):
+    from PIL import Image
+
+    with Image.open(source) as img:
+        width = min(img.width, max_width)
+        size = (width, max(1, round(img.height * width / img.width)))
+        # Lets a JPEG decoder skip straight to 1/2, 1/4 or 1/8 scale (the request thumbnail()
+        # itself makes for reducing_gap=2), so the budget sees the real decode size; a no-op for PNG.
+        img.draft(None, (size[0] * 2, size[1] * 2))
+        # Pillow pads 3-band pixels to 4 bytes, so 4 per pixel covers the 8-bit modes.
+        decoded = img.width * img.height * 4
+        _decoding.acquire(decoded)
+        try:
+            img.thumbnail(size, Image.BILINEAR, reducing_gap=2.0)
+            resized = img.copy()
+        finally:
+            _decoding.release(decoded)
+    if out_format == "JPEG" and resized.mode not in ("RGB", "L"):
+        resized = resized.convert("RGB")
+    buffer = io.BytesIO()
+    resized.save(buffer, format=out_format, quality=90)
+    return buffer.getvalue()
+
+
+def _downscaled(key, source, out_format, max_width):
+    """Returns the cached downscale for `key`, decoding it on the shared pool at most once at a time."""
+    resized = _resized.get(key)
+    if resized is not None:
+        return resized
+    with _pending_lock:
+        future = _pending.get(key)
+        started = future is None
+        if started:
+            future = _pending[key] = _decoder.submit(_downscale, source, out_format, max_width)
+    # Attached outside the lock: a decode that has already finished runs the callback
+    # immediately, and _finish takes the lock.
+    if started:
+        future.add_done_callback(lambda f: _finish(key, f))
+    return future.result()
+
+
+def _finish(key, future):
+    if future.exception() is None:
+        _resized.put(key, future.result())
+    with _pending_lock:
+        if _pending.get(key) is future:
+            del _pending[key]
+
+
+def prepare(data=None, path=None, max_width=STREAMLIT_MAX_WIDTH, info=None, columns=1):
+    """Returns (image, output_format) arguments for st.image from raw bytes or a file path.
+
+    Images st.image can pass through are returned as the original bytes or path; only an
+    image wider than `max_width` (or in an unrecognised format) is opened with PIL, and
+    then scaled to the width of one of `columns` slots sharing the row.
+    `info` is the file's manifest entry, if known: its format and width replace the
+    header sniff and its SHA-256 keys the downscale cache.
+    """
+    if info is not None:
+        fmt, width = FORMATS_BY_MIME.get(info["mime"]), info["width"]
+    else:
+        fmt, width, _ = sniff_file(path) if path is not None else sniff(data)
+    fits = width is not None and width <= max_width
+    if fits and fmt in PASSTHROUGH_FORMATS:
+        return (path if path is not None else data), fmt
+    if fmt in DATA_URI_FORMATS and (fits or width is None):
+        if data is None:
+            with open(path, "rb") as f:
+                data = f.read()
+        return f"data:{DATA_URI_FORMATS[fmt]};base64,{base64.b64encode(data).decode('ascii')}", "auto"
+
+    target = -(-max_width // columns)
+    if info is not None:
+        key = (info["sha256"], target)
+    elif path is not None:
+        stat = os.stat(path)
+        key = (path, stat.st_mtime_ns, stat.st_size, target)
+    else:
+        key = (hashlib.blake2b(data, digest_size=16).hexdigest(), target)
+    out_format = fmt if fmt in PASSTHROUGH_FORMATS else "PNG"
+    source = path if path is not None else io.BytesIO(data)
+    return _downscaled(key, source, out_format, target), out_format
+
+
+class RunAssets:
+    """Per-script-run registry that loads each distinct image once and reuses it for later references.
+
+    Handing st.image the identical prepared object again means Streamlit's media file
+    manager, which keys stored files by content, resolves it to the same media ID instead
+    of storing another copy, and the fetch, sniff and any downscale are not repeated.
+    """
+
+    def __init__(self):
+        self._prepared = {}
+        self.loads = 0
+        self.duplicates_avoided = 0
+
+    def get(self, key, load):
+        """Returns the st.image arguments for `key`, calling `load()` only the first time."""
+        prepared = self._prepared.get(key)
+        if prepared is not None:
+            self.duplicates_avoided += 1
+            return prepared
+        self.loads += 1
+        prepared = self._prepared[key] = load()
+        return prepared
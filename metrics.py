@@ -0,0 +1,227 @@
+"""Opt-in hot-path instrumentation: latency histograms, counters and a Prometheus text export.
+
+Set METSYS_METRICS=1 to collect. When it is unset, timed() hands back the undecorated
+function, timer() returns a shared no-op context manager and the observe/count helpers
+return after a single flag check, so the disabled cost is effectively nothing.
+
+Metrics are process-wide, shared by every session. With METSYS_METRICS_FILE set they are
+written in Prometheus text format (at most once per METSYS_METRICS_INTERVAL seconds) for a
+node_exporter textfile collector or any scraper to pick up; with ?debug=1 in the URL the
+sidebar shows them too.
+"""
+import bisect
+import contextlib
+import functools
+import os
+import threading
+import time
+
+# --- Configuration ---
+ENABLED = os.environ.get("METSYS_METRICS", "") == "1"
+METRICS_FILE = os.environ.get("METSYS_METRICS_FILE", "")
+EXPORT_INTERVAL = float(os.environ.get("METSYS_METRICS_INTERVAL", 1.0))
+# Seconds; spans a cached markdown call (~0.1 ms) to a stalled download.
+LATENCY_BUCKETS = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+
+class Histogram:
+    """Cumulative-bucket latency histogram in the Prometheus style."""
+
+    def __init__(self, buckets=LATENCY_BUCKETS):
+        self.buckets = buckets
+        self.counts = [0] * (len(buckets) + 1)
+        self.sum = 0.0
+        self.count = 0
+
+    def observe(self, value):
+        self.counts[bisect.bisect_left(self.buckets, value)] += 1
+        self.sum += value
+        self.count += 1
+
+    def quantile(self, q):
+        """Estimates quantile `q` by interpolating inside the bucket that contains it."""
+        if not self.count:
+            return None
+        rank = q * self.count
+        seen = 0
+        for i, n in enumerate(self.counts):
+            if seen + n >= rank and n:
+                lower = self.buckets[i - 1] if i else 0.0
+                upper = self.buckets[i] if i < len(self.buckets) else self.buckets[-1]
+                return lower + (upper - lower) * (rank - seen) / n
+            seen += n
+        return self.buckets[-1]
+
+
+class Registry:
+    """Thread-safe store of labelled histograms and counters."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.histograms = {}
+        self.counters = {}
+        self.gauge_sources = []
+        self._last_export = 0.0
+
+    def observe(self, name, labels, value):
+        key = (name, tuple(sorted(labels.items())))
+        with self._lock:
+            histogram = self.histograms.get(key)
+            if histogram is None:
+                histogram = self.histograms[key] = Histogram()
+            histogram.observe(value)
+
+    def inc(self, name, labels, amount=1):
+        key = (name, tuple(sorted(labels.items())))
+        with self._lock:
+            self.counters[key] = self.counters.get(key, 0) + amount
+
+    def gauges(self):
+        """Samples every registered gauge source."""
+        values = {}
+        for source in self.gauge_sources:
+            for (name, labels), value in source().items():
+                values[(name, tuple(sorted(labels)))] = value
+        return values
+
+    def render_prometheus(self):
+        """Returns every metric in the Prometheus text exposition format."""
+        lines = []
+        with self._lock:
+            histograms = sorted(self.histograms.items())
+            counters = sorted(self.counters.items())
+        typed = set()
+        for (name, labels), h in histograms:
+            if name not in typed:
+                lines.append(f"# TYPE {name} histogram")
+                typed.add(name)
+            cumulative = 0
+            for bound, n in zip(list(h.buckets) + ["+Inf"], h.counts):
+                cumulative += n
+                lines.append(f"{name}_bucket{_labels(labels + (('le', str(bound)),))} {cumulative}")
+            lines.append(f"{name}_sum{_labels(labels)} {h.sum:.6f}")
+            lines.append(f"{name}_count{_labels(labels)} {h.count}")
+        for kind, items in (("counter", counters), ("gauge", sorted(self.gauges().items()))):
+            for (name, labels), value in items:
+                if name not in typed:
+                    lines.append(f"# TYPE {name} {kind}")
+                    typed.add(name)
+                lines.append(f"{name}{_labels(labels)} {value}")
+        return "\n".join(lines) + "\n"
+
+    def maybe_export(self, path=METRICS_FILE, interval=EXPORT_INTERVAL):
+        """Writes the Prometheus file if one is configured and the last write is `interval` old."""
+        if not path:
+            return
+        now = time.monotonic()
+        with self._lock:
+            if now - self._last_export < interval:
+                return
+            self._last_export = now
+        # Sessions finish runs on their own threads; each writes its own temporary file.
+        tmp = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+        with open(tmp, "w") as f:
+            f.write(self.render_prometheus())
+        os.replace(tmp, path)
+
+
+def _labels(labels):
+    if not labels:
+        return ""
+    return "{" + ",".join(f'{k}="{v}"' for k, v in labels) + "}"
+
+
+REGISTRY = Registry()
+
+
+# --- Recording helpers ---
+def timed(section):
+    """Decorator recording each call's duration, and any exception, under `section`."""
+    def decorate(fn):
+        if not ENABLED:
+            return fn
+
+        @functools.wraps(fn)
+        def wrapper(*args, **kwargs):
+            start = time.perf_counter()
+            try:
+                return fn(*args, **kwargs)
+            except Exception:
+                REGISTRY.inc("metsys_errors_total", {"section": section})
+                raise
+            finally:
+                REGISTRY.observe("metsys_section_seconds", {"section": section}, time.perf_counter() - start)
+        return wrapper
+    return decorate
+
+
+@contextlib.contextmanager
+def _timer(name, labels):
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        REGISTRY.observe(name, labels, time.perf_counter() - start)
+
+
+_NULL_TIMER = contextlib.nullcontext()
+
+
+def timer(name, **labels):
+    """Context manager recording the duration of its body into histogram `name`."""
+    if not ENABLED:
+        return _NULL_TIMER
+    return _timer(name, labels)
+
+
+def observe(name, value, **labels):
+    if ENABLED:
+        REGISTRY.observe(name, labels, value)
+
+
+def count(name, amount=1, **labels):
+    if ENABLED:
+        REGISTRY.inc(name, labels, amount)
+
+
+def register_gauges(source):
+    """Registers a callable returning {(name, ((label, value), ...)): value} to sample at export time."""
+    if ENABLED:
+        REGISTRY.gauge_sources.append(source)
+
+
+def end_run():
+    """Called at the end of every script run to refresh the Prometheus file."""
+    if ENABLED:
+        REGISTRY.maybe_export()
+
+
+def debug_panel():
+    """Shows the collected metrics in the sidebar when the URL carries ?debug=1."""
+    if not ENABLED:
+        return
+    import streamlit as st
+
+    if st.query_params.get("debug") != "1":
+        return
+    with st.sidebar.expander("🔧 Performance metrics", expanded=True):
+        with REGISTRY._lock:
+            histograms = sorted(REGISTRY.histograms.items())
+            counters = sorted(REGISTRY.counters.items())
+        rows = []
+        for (name, labels), h in histograms:
+            p50, p95 = h.quantile(0.5), h.quantile(0.95)
+            rows.append({
+                "metric": name.removeprefix("metsys_"),
+                "labels": ",".join(f"{k}={v}" for k, v in labels),
+                "count": h.count,
+                "p50 ms": round(p50 * 1000, 2) if p50 is not None else None,
+                "p95 ms": round(p95 * 1000, 2) if p95 is not None else None,
+                "total s": round(h.sum, 3),
+            })
+        st.dataframe(rows, hide_index=True)
+        totals = [
+            {"metric": name.removeprefix("metsys_"), "labels": ",".join(f"{k}={v}" for k, v in labels), "value": v}
+            for (name, labels), v in counters + sorted(REGISTRY.gauges().items())
+        ]
+        st.dataframe(totals, hide_index=True)
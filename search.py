@@ -0,0 +1,236 @@
+"""Full-text search over every module's copy: an inverted index built once, queried on each keystroke.
+
+build_index(spec) splits an app's content.json modules into documents (a heading, bullet,
+paragraph or card) labelled with the module and the section heading they sit under, and
+indexes their words. Queries match whole words, prefixes (so results appear while
+typing) and, for words with no exact match, terms one edit away (a deletion-neighbourhood
+table, so a typo costs a few dict lookups rather than a scan of the vocabulary). Results
+link to ?module=<slug>#<anchor>, where the anchor is the id Streamlit's frontend gives
+the section heading and scrolls to on load.
+
+The index is built inside content.py's cached compile, so it is shared by every session
+and rebuilt only when content.json changes; recent queries are memoised on it too.
+"""
+import bisect
+import functools
+import html
+import math
+import re
+import time
+import unicodedata
+
+# --- Configuration ---
+MAX_RESULTS = 8
+# Shortest query word matched by prefix, and by edit distance.
+PREFIX_MIN = 2
+FUZZY_MIN = 4
+# Relative weight of each kind of match, of words only in the enclosing section or
+# module title (so "crm pipeline" finds pipeline bullets in the CRM module), and of headings.
+EXACT, PREFIX, FUZZY = 1.0, 0.7, 0.5
+CONTEXT = 0.4
+HEADING_BOOST = 1.5
+PREFIX_EXPANSIONS = 50
+
+_MARKUP = re.compile(r"\[([^\]]*)\]\([^)]*\)|<[^>]+>|[*_`~]+")
+_WORD = re.compile(r"[a-z0-9]+")
+
+
+def plain(text):
+    """Strips markdown emphasis, links and inline HTML, and any heading or bullet marker."""
+    text = re.sub(r"^\s*(#+|[-*+]|\d+\.)\s+", "", text)
+    return _MARKUP.sub(lambda m: m.group(1) or "", text).strip()
+
+
+def _fold(text):
+    return "".join(c for c in unicodedata.normalize("NFKD", text) if not unicodedata.combining(c)).lower()
+
+
+def tokenize(text):
+    """Returns the lowercase, accent-folded words of `text`."""
+    return _WORD.findall(_fold(text))
+
+
+def anchor(text):
+    """Returns the element id Streamlit's frontend derives from a heading's text.
+
+    A port of the slugify call in its heading component: custom replacements, diacritics
+    removed, camelCase split, lowercased, "'s"/"'t" joined, and runs of anything else
+    turned into single hyphens.
+    """
+    text = plain(text)
+    for char, words in (("&", " and "), ("🦄", " unicorn "), ("♥", " love ")):
+        text = text.replace(char, words)
+    text = "".join(c for c in unicodedata.normalize("NFD", text) if not unicodedata.combining(c))
+    text = re.sub(r"([A-Z]{2})(\d+)", r"\1 \2", text)
+    text = re.sub(r"([a-z\d])([A-Z])", r"\1 \2", text)
+    text = re.sub(r"([A-Z])([A-Z](?!s(?![a-z]))[a-z\d]+)", r"\1 \2", text)
+    text = re.sub(r"([a-z\d])['’]([ts])(?![a-z\d])", r"\1\2", text.lower())
+    return re.sub(r"[^a-z\d]+", "-", text).strip("-")
+
+
+def _within_one_edit(a, b):
+    """True if `a` and `b` differ by one insertion, deletion, substitution or adjacent swap."""
+    if abs(len(a) - len(b)) > 1 or a == b:
+        return a == b
+    i = 0
+    while i < min(len(a), len(b)) and a[i] == b[i]:
+        i += 1
+    if len(a) == len(b):
+        return a[i + 1:] == b[i + 1:] or (a[i + 2:] == b[i + 2:] and a[i:i + 2] == b[i:i + 2][::-1])
+    return a[i + 1:] == b[i:] if len(a) > len(b) else a[i:] == b[i + 1:]
+
+
+def _deletions(term):
+    return {term[:i] + term[i + 1:] for i in range(len(term))}
+
+
+def module_documents(module):
+    """Splits one content.json module into searchable documents, in page order."""
+    docs = []
+    section = {"section": module["title"], "anchor": ""}
+
+    def add(text, heading=False):
+        text = plain(text)
+        if text and tokenize(text):
+            docs.append(dict(section, module=module["slug"], module_title=module["title"], text=text, heading=heading))
+
+    def enter(title):
+        section.update(section=plain(title), anchor=anchor(title))
+        add(title, heading=True)
+
+    def walk(blocks):
+        for block in blocks:
+            kind = block["type"]
+            if kind in ("header", "subheader"):
+                enter(block["text"])
+            elif kind == "info":
+                add(block["text"])
+            elif kind == "markdown":
+                for line in block["text"]:
+                    if line.lstrip().startswith("#"):
+                        enter(line)
+                    elif line.strip() != "---":
+                        add(line)
+            elif kind == "card":
+                add(f"{block['icon']} {block['title']}: {block['description']}")
+            elif kind == "image" and block.get("caption"):
+                add(block["caption"])
+            elif kind == "columns":
+                for column in block["columns"]:
+                    walk(column)
+            elif kind == "feature_section":
+                enter(block["title"])
+                for line in block["text"]:
+                    add(line)
+
+    add(module["title"], heading=True)
+    walk(module["blocks"])
+    return docs
+
+
+class SearchIndex:
+    """Inverted index over documents, with prefix and one-edit fuzzy matching of query words."""
+
+    def __init__(self, docs):
+        self.docs = docs
+        postings = {}
+        for doc_id, doc in enumerate(docs):
+            words = set(tokenize(doc["text"]))
+            context = set(tokenize(f"{doc['module_title']} {doc['section']}")) - words
+            for term in words:
+                postings.setdefault(term, []).append((doc_id, 1.0))
+            for term in context:
+                postings.setdefault(term, []).append((doc_id, CONTEXT))
+        self.postings = {term: tuple(entries) for term, entries in postings.items()}
+        self.terms = sorted(self.postings)
+        self.idf = {term: math.log(1 + len(docs) / len(ids)) for term, ids in self.postings.items()}
+        self.neighbours = {}
+        for term in self.terms:
+            if len(term) >= FUZZY_MIN - 1:
+                for deleted in _deletions(term):
+                    self.neighbours.setdefault(deleted, []).append(term)
+        self.search = functools.lru_cache(maxsize=256)(self._search)
+
+    def expand(self, word):
+        """Returns {term: weight} for the indexed terms `word` matches."""
+        matches = {}
+        if word in self.postings:
+            matches[word] = EXACT
+        if len(word) >= PREFIX_MIN:
+            start = bisect.bisect_left(self.terms, word)
+            for term in self.terms[start:start + PREFIX_EXPANSIONS]:
+                if not term.startswith(word):
+                    break
+                matches.setdefault(term, PREFIX)
+        if not matches and len(word) >= FUZZY_MIN:
+            candidates = set(self.neighbours.get(word, ()))
+            for deleted in _deletions(word):
+                if deleted in self.postings:
+                    candidates.add(deleted)
+                candidates.update(self.neighbours.get(deleted, ()))
+            for term in candidates:
+                if _within_one_edit(word, term):
+                    matches[term] = FUZZY
+        return matches
+
+    def _search(self, query, limit=MAX_RESULTS):
+        """Returns the best `limit` documents containing every query word, as dicts with a score."""
+        scores = None
+        for word in dict.fromkeys(tokenize(query)):
+            word_scores = {}
+            for term, weight in self.expand(word).items():
+                for doc_id, field in self.postings[term]:
+                    score = weight * field * self.idf[term]
+                    if score > word_scores.get(doc_id, 0):
+                        word_scores[doc_id] = score
+            if scores is None:
+                scores = word_scores
+            else:
+                scores = {doc_id: s + word_scores[doc_id] for doc_id, s in scores.items() if doc_id in word_scores}
+            if not scores:
+                return ()
+        if not scores:
+            return ()
+        for doc_id in scores:
+            if self.docs[doc_id]["heading"]:
+                scores[doc_id] *= HEADING_BOOST
+        ranked = sorted(scores, key=lambda doc_id: (-scores[doc_id], doc_id))[:limit]
+        return tuple(dict(self.docs[doc_id], score=scores[doc_id]) for doc_id in ranked)
+
+
+def build_index(spec):
+    """Builds the search index for one app's content.json spec."""
+    return SearchIndex([doc for module in spec["modules"] for doc in module_documents(module)])
+
+
+def result_link(result):
+    """Returns the deep link to a result's module and section."""
+    return f"?module={result['module']}" + (f"#{result['anchor']}" if result["anchor"] else "")
+
+
+def sidebar_search(index):
+    """Shows a search box in the sidebar and links to the sections that match it."""
+    import streamlit as st
+
+    query = st.sidebar.text_input("🔍 Search features", placeholder="e.g. invoices, drip, zapier")
+    if not query.strip():
+        return
+    start = time.perf_counter()
+    results = index.search(query.strip())
+    elapsed = time.perf_counter() - start
+    if not results:
+        st.sidebar.caption(f"No features match “{query.strip()}”.")
+        return
+    items = []
+    for result in results:
+        label = result["module_title"]
+        if result["anchor"]:
+            label += f" › {result['section']}"
+        text = result["text"] if len(result["text"]) <= 140 else result["text"][:139] + "…"
+        # target="_self" keeps the deep link in this tab; Streamlit opens links in new tabs by default.
+        items.append(
+            f'<a href="{html.escape(result_link(result))}" target="_self">{html.escape(label)}</a>'
+            f'<br><small>{html.escape(text)}</small>'
+        )
+    st.sidebar.markdown("<br>".join(items), unsafe_allow_html=True)
+    st.sidebar.caption(f"{len(results)} matches in {elapsed * 1000:.2f} ms")
@@ -0,0 +1,85 @@
+"""Benchmark for the analytics demo: rollup reports versus rescanning the rows with pandas.
+
+    python tools/bench_analytics.py [--orders 2000000] [--queries 20] [--output bench_analytics.json]
+
+Generates the demo's sample data, times building demos.analytics.SalesCube, then runs
+--queries random (date range, period) reports three ways: a pandas group-by over the
+raw rows for each query (what a dashboard without rollups does), SalesCube.report on
+a cold memo, and the same report again (the memoised rerun). The pandas and cube
+revenue series are checked against each other.
+"""
+import argparse
+import datetime
+import json
+import os
+import random
+import statistics
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import numpy as np  # noqa: E402
+import pandas as pd  # noqa: E402
+
+from demos import SEED  # noqa: E402
+from demos.analytics import DAYS, FIRST_DAY, PERIODS, SalesCube, generate  # noqa: E402
+
+
+def rescan(frame, start, end, period):
+    """Revenue and orders by period for the range, computed from the order rows each time."""
+    rows = frame[(frame["date"] >= pd.Timestamp(start)) & (frame["date"] <= pd.Timestamp(end))]
+    key = rows["date"].dt.to_period(period).dt.start_time if period != "D" else rows["date"]
+    return rows.groupby(key).agg(revenue=("revenue", "sum"), orders=("revenue", "size"))
+
+
+def timed(fn, *args):
+    start = time.perf_counter()
+    result = fn(*args)
+    return result, (time.perf_counter() - start) * 1000
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--orders", type=int, default=2_000_000)
+    parser.add_argument("--queries", type=int, default=20)
+    parser.add_argument("--seed", type=int, default=SEED)
+    parser.add_argument("--output", default="bench_analytics.json")
+    args = parser.parse_args()
+
+    data, generate_ms = timed(generate, args.orders, args.seed)
+    cube, build_ms = timed(SalesCube, data)
+    items = data["line_items"]
+    frame = pd.DataFrame({
+        "date": pd.Timestamp(FIRST_DAY) + pd.to_timedelta(data["orders"]["day"].astype(np.int64), unit="D"),
+        "revenue": np.bincount(items["order"], weights=items["amount"], minlength=args.orders),
+    })
+
+    rng = random.Random(args.seed)
+    timings = {"rescan": [], "cold": [], "memoised": []}
+    for _ in range(args.queries):
+        a = rng.randrange(DAYS - 30)
+        start = FIRST_DAY + datetime.timedelta(days=a)
+        end = start + datetime.timedelta(days=rng.randrange(30, min(400, DAYS - a)))
+        period = PERIODS[rng.choice(list(PERIODS))]
+        expected, ms = timed(rescan, frame, start, end, period)
+        timings["rescan"].append(ms)
+        report, ms = timed(cube.report, start, end, period)
+        timings["cold"].append(ms)
+        timings["memoised"].append(timed(cube.report, start, end, period)[1])
+        np.testing.assert_allclose(report["series"]["revenue"].to_numpy(), expected["revenue"].to_numpy(), rtol=1e-6)
+
+    summary = {name: {"median_ms": statistics.median(v), "max_ms": max(v)} for name, v in timings.items()}
+    print(f"rows: {', '.join(f'{n:,} {name}' for name, n in cube.rows.items())}")
+    print(f"generate {generate_ms:.0f} ms, build rollups {build_ms:.0f} ms")
+    print(f"{'report':<10}{'median ms':>11}{'max ms':>9}")
+    for name, s in summary.items():
+        print(f"{name:<10}{s['median_ms']:>11.3f}{s['max_ms']:>9.3f}")
+    with open(args.output, "w") as f:
+        json.dump({"params": vars(args), "generate_ms": generate_ms, "build_ms": build_ms,
+                   "rows": cube.rows, "reports": summary}, f, indent=1)
+    print(f"wrote {args.output}")
+
+
+if __name__ == "__main__":
+    main()
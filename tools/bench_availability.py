@@ -0,0 +1,108 @@
+"""Throughput benchmark for the appointments demo's availability engine.
+
+    python tools/bench_availability.py [--staff 300] [--queries 2000] [--bookings 2000]
+                                       [--output bench_availability.json]
+
+Builds demos.appointments' engine over a year of calendars, then times random
+"next 10 free slots" queries (random service, start time and location) per service,
+and random bookings taken from those answers, each of which updates the index in
+place. After the bookings every employee's free intervals are checked to still be
+sorted and disjoint, and no booked slot may be offered again.
+"""
+import argparse
+import json
+import os
+import random
+import statistics
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from demos import SEED  # noqa: E402
+from demos.appointments import DAYS, LOCATIONS, SERVICES, generate  # noqa: E402
+
+
+def check_index(engine):
+    for employee, (starts, ends) in engine.free.items():
+        assert len(starts) == len(ends), employee
+        assert all(s < e for s, e in zip(starts, ends)), employee
+        assert all(e <= s for e, s in zip(ends, starts[1:])), employee
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--staff", type=int, default=300)
+    parser.add_argument("--queries", type=int, default=2000)
+    parser.add_argument("--bookings", type=int, default=2000)
+    parser.add_argument("--seed", type=int, default=SEED)
+    parser.add_argument("--output", default="bench_availability.json")
+    args = parser.parse_args()
+
+    start = time.perf_counter()
+    engine = generate(args.staff, args.seed)
+    build_seconds = time.perf_counter() - start
+    rng = random.Random(args.seed)
+
+    def random_query():
+        service = rng.choice(list(SERVICES))
+        after = rng.randrange(DAYS * 1440)
+        location = rng.choice((None,) + LOCATIONS)
+        return service, after, location
+
+    latencies = {name: [] for name in SERVICES}
+    started = time.perf_counter()
+    for _ in range(args.queries):
+        service, after, location = random_query()
+        t = time.perf_counter()
+        engine.next_slots(service, after, limit=10, location=location)
+        latencies[service].append(time.perf_counter() - t)
+    query_seconds = time.perf_counter() - started
+
+    booked, book_latencies = [], []
+    while len(booked) < args.bookings:
+        service, after, location = random_query()
+        slots = engine.next_slots(service, after, limit=1, location=location)
+        if not slots:
+            continue
+        t = time.perf_counter()
+        engine.book(service, slots[0]["start"], slots[0]["employee"])
+        book_latencies.append(time.perf_counter() - t)
+        booked.append((service, slots[0]["start"], slots[0]["employee"]))
+    check_index(engine)
+    for service, slot_start, employee in booked:
+        if SERVICES[service][2] == 1:
+            again = engine.next_slots(service, slot_start, limit=1, employee=employee)
+            assert not again or again[0]["start"] != slot_start, (service, slot_start, employee)
+
+    def ms(values, q):
+        values = sorted(values)
+        return values[min(int(q * len(values)), len(values) - 1)] * 1000
+
+    per_service = {
+        name: {"queries": len(v), "p50_ms": ms(v, 0.5), "p99_ms": ms(v, 0.99)} for name, v in latencies.items() if v
+    }
+    result = {
+        "build_seconds": build_seconds,
+        "staff": len(engine.staff),
+        "free_intervals": engine.free_intervals(),
+        "queries_per_second": args.queries / query_seconds,
+        "per_service": per_service,
+        "booking_p50_us": statistics.median(book_latencies) * 1e6,
+        "booking_max_us": max(book_latencies) * 1e6,
+    }
+    print(f"built {result['staff']} calendars ({result['free_intervals']:,} free intervals, "
+          f"{engine.bookings:,} bookings) in {build_seconds:.2f} s")
+    print(f"{args.queries} queries: {result['queries_per_second']:.0f}/s")
+    print(f"{'service':<24}{'queries':>8}{'p50 ms':>9}{'p99 ms':>9}")
+    for name, s in per_service.items():
+        print(f"{name:<24}{s['queries']:>8}{s['p50_ms']:>9.3f}{s['p99_ms']:>9.3f}")
+    print(f"{len(booked)} in-place bookings: median {result['booking_p50_us']:.1f} us, "
+          f"max {result['booking_max_us']:.1f} us (a rebuild takes {build_seconds:.2f} s); index consistent")
+    with open(args.output, "w") as f:
+        json.dump({"params": vars(args), **result}, f, indent=1)
+    print(f"wrote {args.output}")
+
+
+if __name__ == "__main__":
+    main()
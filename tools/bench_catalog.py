@@ -0,0 +1,124 @@
+"""Latency benchmark for the e-commerce demo's faceted catalog search.
+
+    python tools/bench_catalog.py [--skus 600000 2000000] [--queries 300] [--output bench_catalog.json]
+
+For each --skus, builds demos.catalog's sample catalog and runs --queries random filter
+combinations (category, tags, colours, sizes, materials, price range, one to four
+active at a time) through Catalog.query, timing the first call (facet counts computed)
+and a repeat (memoised). Pages are timed for each sort at the first page, a random page
+and the last page. For a sample of queries the counts and pages are checked against a
+plain boolean-mask evaluation.
+"""
+import argparse
+import json
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import numpy as np  # noqa: E402
+
+from demos import SEED  # noqa: E402
+from demos.catalog import COLORS, MATERIALS, PAGE_SIZE, SIZES, SORTS, TAGS, generate  # noqa: E402
+
+
+def random_query(rng, catalog):
+    query = {}
+    top = int(catalog.columns["price"].max() // 100 + 1)
+    for facet in rng.sample(("node", "tags", "colors", "sizes", "materials", "price"), rng.randint(1, 4)):
+        if facet == "node":
+            query["node"] = rng.randrange(1, len(catalog.tree))
+        elif facet == "price":
+            low = rng.randrange(top // 2)
+            query["price"] = (low, rng.randrange(low + 1, top + 1))
+        else:
+            values = {"tags": TAGS, "colors": COLORS, "sizes": SIZES, "materials": MATERIALS}[facet]
+            query[facet] = tuple(sorted(rng.sample(range(len(values)), rng.randint(1, 3))))
+    return query
+
+
+def reference(catalog, query):
+    """Result mask from one comparison per filter over the raw columns, without any index."""
+    columns, mask = catalog.columns, np.ones(catalog.size, dtype=bool)
+    if query.get("node"):
+        leaves = catalog.tree.leaf_lo[query["node"]], catalog.tree.leaf_hi[query["node"]]
+        mask &= (columns["leaf"] >= leaves[0]) & (columns["leaf"] < leaves[1])
+    if query.get("tags"):
+        mask &= (columns["tags"] & np.uint32(sum(1 << t for t in query["tags"]))) != 0
+    for facet, column in (("colors", "color"), ("sizes", "size"), ("materials", "material")):
+        if query.get(facet):
+            mask &= np.isin(columns[column], query[facet])
+    if query.get("price"):
+        mask &= (columns["price"] >= query["price"][0] * 100) & (columns["price"] <= query["price"][1] * 100)
+    return mask
+
+
+def timed(fn, *args, **kwargs):
+    start = time.perf_counter()
+    result = fn(*args, **kwargs)
+    return result, (time.perf_counter() - start) * 1000
+
+
+def percentiles(values):
+    values = sorted(values)
+    return {"p50": values[len(values) // 2], "p99": values[int(0.99 * (len(values) - 1))], "max": values[-1]}
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--skus", type=int, nargs="+", default=[600_000, 2_000_000])
+    parser.add_argument("--queries", type=int, default=300)
+    parser.add_argument("--checks", type=int, default=20)
+    parser.add_argument("--seed", type=int, default=SEED)
+    parser.add_argument("--output", default="bench_catalog.json")
+    args = parser.parse_args()
+
+    results = []
+    for skus in args.skus:
+        catalog, build_ms = timed(generate, skus, args.seed)
+        rng = random.Random(args.seed)
+        queries = [random_query(rng, catalog) for _ in range(args.queries)]
+        cold, warm, pages = [], [], {"first": [], "random": [], "last": []}
+        for query in queries:
+            (_, count, _), ms = timed(catalog.query, **query)
+            cold.append(ms)
+            warm.append(timed(catalog.query, **query)[1])
+            last = max(count - 1, 0) // PAGE_SIZE
+            for name, number in (("first", 0), ("random", rng.randint(0, last)), ("last", last)):
+                pages[name].append(timed(catalog.page, query, rng.choice(SORTS), number)[1])
+
+        for query in queries[:args.checks]:
+            mask = reference(catalog, query)
+            _, count, facets = catalog.query(**query)
+            assert count == np.count_nonzero(mask)
+            others = reference(catalog, {**query, "colors": ()})
+            assert (facets["color"] == np.bincount(catalog.columns["color"][others], minlength=len(COLORS))).all()
+            ids = np.flatnonzero(mask)
+            price = catalog.columns["price"][ids]
+            expected = {"Relevance": ids[np.lexsort((ids, -catalog.columns["popularity"][ids]))],
+                        "Price: low to high": ids[np.lexsort((ids, price))],
+                        "Price: high to low": ids[np.lexsort((ids, -price))]}
+            for sort in SORTS:
+                for number in (0, max(count - 1, 0) // PAGE_SIZE):
+                    page = catalog.page(query, sort, number)
+                    assert (page == expected[sort][number * PAGE_SIZE:(number + 1) * PAGE_SIZE]).all()
+
+        result = {"skus": skus, "build_ms": build_ms, "query_ms": percentiles(cold),
+                  "memoised_ms": percentiles(warm), "page_ms": {name: percentiles(v) for name, v in pages.items()}}
+        results.append(result)
+        print(f"{skus:,} SKUs: built in {build_ms:.0f} ms")
+        print(f"  {args.queries} queries with facet counts: p50 {result['query_ms']['p50']:.1f} ms, "
+              f"p99 {result['query_ms']['p99']:.1f} ms, max {result['query_ms']['max']:.1f} ms; "
+              f"memoised p50 {result['memoised_ms']['p50'] * 1000:.0f} µs")
+        print("  pages: " + ", ".join(f"{name} p50 {v['p50']:.2f} ms / p99 {v['p99']:.2f} ms"
+                                      for name, v in result["page_ms"].items()))
+        print(f"  {min(args.checks, len(queries))} queries match a boolean-mask evaluation")
+    with open(args.output, "w") as f:
+        json.dump({"params": vars(args), "results": results}, f, indent=1)
+    print(f"wrote {args.output}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,141 @@
+"""Peak-memory benchmark for decoding the oversized screenshots, per concurrent session.
+
+    python tools/bench_decode_memory.py [--sessions 1 4 8] [--compare REV] [--output bench_decode_memory.json]
+
+Each measurement runs in a fresh interpreter: N threads stand in for N sessions, and
+each hands every oversized image slot of content.json (a screenshot wider than
+st.image displays, at the column count it is shown in) to Streamlit's image_to_url, as
+st.image would. The peak RSS over the idle interpreter (VmHWM, reset after imports) is
+reported in total and per session. Loaders:
+
+  pil      Image.open on the file, the way display_image originally called st.image
+  prepare  imaging.prepare from the working tree (and from REV with --compare)
+
+Linux only, since it reads /proc/self/status.
+"""
+import argparse
+import json
+import os
+import shutil
+import subprocess
+import sys
+import tempfile
+import threading
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+
+def status_bytes(field):
+    with open("/proc/self/status") as f:
+        for line in f:
+            if line.startswith(field + ":"):
+                return int(line.split()[1]) * 1024
+    return 0
+
+
+def measure(loader, slots, sessions):
+    """Child-process side: loads every slot once per session, concurrently, and returns peak RSS growth."""
+    from PIL import Image
+    from streamlit.elements.lib.image_utils import image_to_url
+    from streamlit.elements.lib.layout_utils import LayoutConfig
+
+    import imaging
+
+    def to_url(image, output_format="auto"):
+        return image_to_url(image, LayoutConfig(width="stretch"), False, "RGB", output_format, "bench")
+
+    def load(path, columns):
+        if loader == "pil":
+            return to_url(Image.open(path))
+        try:
+            prepared = imaging.prepare(path=path, columns=columns)
+        except TypeError:  # revisions before column-aware downscaling
+            prepared = imaging.prepare(path=path)
+        return to_url(*prepared)
+
+    def session():
+        for name, columns in slots:
+            load(os.path.join(ROOT, "images", name), columns)
+
+    idle = status_bytes("VmRSS")
+    with open("/proc/self/clear_refs", "w") as f:
+        f.write("5")  # resets VmHWM to the current RSS
+    threads = [threading.Thread(target=session) for _ in range(sessions)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    growth = status_bytes("VmHWM") - idle
+    return {"idle_rss_bytes": idle, "peak_growth_bytes": growth, "per_session_bytes": growth / sessions}
+
+
+def oversized_slots():
+    """Returns the (file name, columns) slots in content.json whose image is wider than st.image shows."""
+    import imaging
+    from assets import AssetResolver, load_manifest
+    from content import CONTENT_PATH, compile_app
+
+    resolver = AssetResolver(load_manifest())
+    with open(CONTENT_PATH) as f:
+        apps = json.load(f)["apps"]
+    slots = {}
+    for spec in apps.values():
+        for ref, columns in compile_app(spec)["slots"]:
+            info = resolver.info(ref)
+            if info and info["width"] and info["width"] > imaging.STREAMLIT_MAX_WIDTH:
+                slots[(resolver.name(ref), columns)] = None
+    return list(slots)
+
+
+def run_child(tree, loader, slots, sessions):
+    env = dict(os.environ, PYTHONPATH=tree)
+    cmd = [sys.executable, os.path.abspath(__file__), "--child", loader, json.dumps(slots), str(sessions)]
+    out = subprocess.run(cmd, env=env, cwd=tree, capture_output=True, text=True, check=True).stdout
+    return json.loads(out.strip().splitlines()[-1])
+
+
+def main():
+    if len(sys.argv) > 1 and sys.argv[1] == "--child":
+        sys.path.insert(0, os.getcwd())  # the tree under test, ahead of this checkout
+        loader, slots, sessions = sys.argv[2], json.loads(sys.argv[3]), int(sys.argv[4])
+        print(json.dumps(measure(loader, [tuple(slot) for slot in slots], sessions)))
+        return
+
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--sessions", type=int, nargs="+", default=[1, 4, 8])
+    parser.add_argument("--compare", metavar="REV", help="also measure imaging.prepare at this git revision")
+    parser.add_argument("--output", default="bench_decode_memory.json")
+    args = parser.parse_args()
+
+    slots = oversized_slots()
+    loaders = {"pil": ROOT, "prepare": ROOT}
+    worktree = None
+    if args.compare:
+        worktree = tempfile.mkdtemp(prefix="decode-rev-")
+        subprocess.run(["git", "worktree", "add", "--detach", worktree, args.compare],
+                       cwd=ROOT, capture_output=True, check=True)
+        loaders = {"pil": ROOT, f"prepare@{args.compare}": worktree, "prepare": ROOT}
+    results = {}
+    try:
+        for label, tree in loaders.items():
+            loader = label.split("@")[0]
+            results[label] = {n: run_child(tree, loader, slots, n) for n in args.sessions}
+    finally:
+        if worktree:
+            subprocess.run(["git", "worktree", "remove", "--force", worktree], cwd=ROOT, capture_output=True)
+            shutil.rmtree(worktree, ignore_errors=True)
+
+    mb = 1024 * 1024
+    print(f"{len(slots)} oversized slots: {', '.join(f'{name}/{columns}' for name, columns in slots)}")
+    print(f"{'loader':<20}{'N':>4}{'peak MB':>9}{'MB/session':>12}")
+    for label, by_sessions in results.items():
+        for n, r in by_sessions.items():
+            print(f"{label:<20}{n:>4}{r['peak_growth_bytes'] / mb:>9.0f}{r['per_session_bytes'] / mb:>12.1f}")
+    with open(args.output, "w") as f:
+        json.dump({"params": vars(args), "slots": slots, "results": results}, f, indent=1)
+    print(f"wrote {args.output}")
+
+
+if __name__ == "__main__":
+    main()
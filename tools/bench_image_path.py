@@ -0,0 +1,71 @@
+"""Micro-benchmark: CPU time per image for PIL-in-st.image versus the imaging.prepare fast path.
+
+    python tools/bench_image_path.py [--repeat N] [IMAGE ...]
+
+Both paths run through Streamlit's own image_to_url (in bare mode, so nothing is
+registered with a media manager), which is where st.image spends its time. Each
+image is also measured at 1460px wide, the largest size st.image passes through.
+"""
+import argparse
+import io
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import imaging  # noqa: E402
+from assets import IMAGES_DIR  # noqa: E402
+
+DEFAULT_IMAGES = ["IMG_0396.png", "IMG_0390.png", "IMG_0376.png"]
+
+
+def to_url(image, output_format="auto"):
+    from streamlit.elements.lib.image_utils import image_to_url
+    from streamlit.elements.lib.layout_utils import LayoutConfig
+
+    return image_to_url(image, LayoutConfig(width="stretch"), False, "RGB", output_format, "bench")
+
+
+def pil_path(data):
+    from PIL import Image
+
+    to_url(Image.open(io.BytesIO(data)))
+
+
+def fast_path(data):
+    to_url(*imaging.prepare(data=data))
+
+
+def cpu_ms(fn, data, repeat):
+    start = time.process_time()
+    for _ in range(repeat):
+        fn(data)
+    return (time.process_time() - start) * 1000 / repeat
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("images", nargs="*", default=DEFAULT_IMAGES)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    from PIL import Image
+
+    print(f"{'image':<28}{'bytes':>10}{'PIL ms':>10}{'fast ms':>10}{'saved':>8}")
+    for name in args.images:
+        with open(os.path.join(IMAGES_DIR, name), "rb") as f:
+            original = f.read()
+        with Image.open(io.BytesIO(original)) as img:
+            width = imaging.STREAMLIT_MAX_WIDTH
+            buffer = io.BytesIO()
+            img.resize((width, round(img.height * width / img.width))).save(buffer, format="PNG")
+        for label, data in ((name, original), (f"{name} @{width}px", buffer.getvalue())):
+            fast_path(data)  # first call fills the downscale cache; reruns are what we measure
+            before = cpu_ms(pil_path, data, args.repeat)
+            after = cpu_ms(fast_path, data, args.repeat)
+            print(f"{label:<28}{len(data):>10}{before:>10.1f}{after:>10.1f}{1 - after / before:>8.0%}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,130 @@
+"""Throughput and memory benchmark for the CRM demo's streaming CSV import and export.
+
+    python tools/bench_import.py [--rows 1000000 4000000] [--baseline] [--output bench_import.json]
+
+For each --rows, writes demos.crm_import's messy sample CSV (about 15% repeated
+contacts) to a temporary file, then in a fresh interpreter imports it with
+ContactBook.import_csv and exports it with export_chunks into a temporary file. Rows
+per second, RSS at every progress report and the peak RSS over the idle interpreter
+(VmHWM) are reported; duplicates found are compared with the number generated.
+With --baseline the same file is also loaded with pandas.read_csv and deduplicated
+on lowercased email, the way a script without streaming would.
+
+Linux only, since it reads /proc/self/status.
+"""
+import argparse
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+
+def status_bytes(field):
+    with open("/proc/self/status") as f:
+        for line in f:
+            if line.startswith(field + ":"):
+                return int(line.split()[1]) * 1024
+    return 0
+
+
+def reset_peak():
+    """Resets VmHWM to the current RSS and returns that RSS."""
+    with open("/proc/self/clear_refs", "w") as f:
+        f.write("5")
+    return status_bytes("VmRSS")
+
+
+def measure(mode, path):
+    """Child-process side: runs one import (and export) and returns timings and memory."""
+    if mode == "pandas":
+        import pandas as pd
+    from demos.crm_import import CHUNK_BYTES, ContactBook
+
+    base = reset_peak()
+    size = os.path.getsize(path)
+    started = time.perf_counter()
+    if mode == "pandas":
+        frame = pd.read_csv(path, dtype=str, keep_default_na=False)
+        frame = frame[~frame["E-mail"].str.strip().str.lower().duplicated()]
+        return {"rows": len(frame), "seconds": time.perf_counter() - started,
+                "peak_bytes": status_bytes("VmHWM") - base}
+
+    samples = []
+    book = ContactBook()
+    with open(path, "rb", buffering=CHUNK_BYTES) as f:
+        rows = book.import_csv(f, size, lambda done, _: samples.append((done / size, status_bytes("VmRSS") - base)))
+    import_seconds = time.perf_counter() - started
+    import_peak = status_bytes("VmHWM") - base
+    export_base = reset_peak()
+    started = time.perf_counter()
+    exported = 0
+    with tempfile.TemporaryFile() as out:
+        for chunk in book.export_chunks():
+            out.write(chunk)
+            exported += len(chunk)
+    return {
+        "rows": rows, "seconds": import_seconds, "peak_bytes": import_peak, "outcomes": book.outcomes,
+        "index_bytes": book.nbytes,
+        "rss_samples": samples[:: max(len(samples) // 8, 1)] + samples[-1:],
+        "export_bytes": exported, "export_seconds": time.perf_counter() - started,
+        "export_peak_bytes": status_bytes("VmHWM") - export_base,
+    }
+
+
+def run_child(mode, path):
+    out = subprocess.run([sys.executable, os.path.abspath(__file__), "--child", mode, path],
+                         cwd=ROOT, check=True, capture_output=True, text=True).stdout
+    return json.loads(out)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rows", type=int, nargs="+", default=[1_000_000, 4_000_000])
+    parser.add_argument("--baseline", action="store_true")
+    parser.add_argument("--output", default="bench_import.json")
+    parser.add_argument("--child", nargs=2, help=argparse.SUPPRESS)
+    args = parser.parse_args()
+    if args.child:
+        print(json.dumps(measure(*args.child)))
+        return
+
+    from demos.crm_import import write_sample
+
+    results = []
+    for rows in args.rows:
+        with tempfile.NamedTemporaryFile("w", suffix=".csv", newline="", encoding="utf-8", delete=False) as f:
+            repeated = write_sample(f, rows)
+        try:
+            size = os.path.getsize(f.name)
+            result = {"rows": rows, "file_bytes": size, "repeated": repeated, "stream": run_child("stream", f.name)}
+            if args.baseline:
+                result["pandas"] = run_child("pandas", f.name)
+        finally:
+            os.remove(f.name)
+        stream = result["stream"]
+        found = sum(n for outcome, n in stream["outcomes"].items() if outcome not in ("new", "invalid"))
+        print(f"{rows:,} rows ({size / 1e6:.0f} MB, {repeated:,} repeated): "
+              f"import {rows / stream['seconds']:,.0f} rows/s, peak +{stream['peak_bytes'] / 1e6:.0f} MB; "
+              f"duplicates found {found:,} ({', '.join(f'{k} {v:,}' for k, v in stream['outcomes'].items())})")
+        print(f"  dedupe index {stream['index_bytes'] / 1e6:.0f} MB "
+              f"({stream['index_bytes'] / stream['outcomes']['new']:.0f} bytes per contact)")
+        print("  RSS during import: " + ", ".join(f"{done:.0%} +{rss / 1e6:.0f} MB" for done, rss in stream["rss_samples"]))
+        print(f"  export {stream['export_bytes'] / 1e6:.0f} MB in {stream['export_seconds']:.2f} s, "
+              f"peak +{stream['export_peak_bytes'] / 1e6:.0f} MB")
+        if args.baseline:
+            base = result["pandas"]
+            print(f"  pandas read_csv + drop_duplicates: {rows / base['seconds']:,.0f} rows/s, "
+                  f"peak +{base['peak_bytes'] / 1e6:.0f} MB")
+        results.append(result)
+    with open(args.output, "w") as f:
+        json.dump({"params": vars(args), "results": results}, f, indent=1)
+    print(f"wrote {args.output}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,183 @@
+"""Headless render benchmark for app.py and 1app.py, driven by streamlit.testing AppTest.
+
+    python tools/bench_render.py [--source local|remote] [--latency-ms 80] [--bandwidth-kbps 20000]
+                                 [--warm-runs 3] [--output bench_render.json]
+
+Every module of each script is rendered in a fresh interpreter: once cold (empty
+process caches and a fresh disk cache directory) and then --warm-runs more times.
+The page as a whole is measured the same way with METSYS_NAV_MODE=tabs. With
+--source remote the bundled images/ directory is hidden, so screenshots come from a
+local StubBlobHost standing in for the blob store. Nothing touches the real network.
+1app.py only reads bundled files, so it is skipped with --source remote.
+Background image warm-up is off (METSYS_WARMUP=0), so every fetch counted belongs to
+the run it is reported under.
+
+Results are written as JSON so runs can be diffed over time.
+"""
+import argparse
+import json
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+SCRIPTS = {"app.py": "showcase", "1app.py": "overview"}
+# 1app.py's feature sections name bundled files by relative path (images/IMG_….png), which
+# resolve from the repo root whatever METSYS_IMAGES_DIR says, and have no blob URLs.
+LOCAL_ONLY = {"1app.py"}
+
+
+def module_slugs(app_name):
+    with open(os.path.join(ROOT, "content.json")) as f:
+        return [module["slug"] for module in json.load(f)["apps"][app_name]["modules"]]
+
+
+def measure(script, module, warm_runs):
+    """Child-process side: renders one module cold and then warm, returning the measurements."""
+    from streamlit.runtime.memory_media_file_storage import MemoryMediaFileStorage
+    from streamlit.testing.v1 import AppTest
+
+    media = {}
+    load_and_get_id = MemoryMediaFileStorage.load_and_get_id
+
+    def counting_load(self, path_or_data, mimetype, kind, filename=None):
+        file_id = load_and_get_id(self, path_or_data, mimetype, kind, filename)
+        if isinstance(path_or_data, bytes):
+            media[file_id] = len(path_or_data)
+        else:
+            media[file_id] = os.path.getsize(path_or_data)
+        return file_id
+
+    MemoryMediaFileStorage.load_and_get_id = counting_load
+
+    def element_bytes(node):
+        size = len(node.proto.SerializeToString()) if getattr(node, "proto", None) is not None else 0
+        return size + sum(element_bytes(child) for child in getattr(node, "children", {}).values())
+
+    host = None
+    if os.environ.get("BENCH_SOURCE") == "remote":
+        from stub_blob_host import StubBlobHost
+
+        host = StubBlobHost(
+            latency=float(os.environ["BENCH_LATENCY"]),
+            bandwidth=int(os.environ["BENCH_BANDWIDTH"]),
+            images_dir=os.path.join(ROOT, "images"),
+        ).start()
+        os.environ["METSYS_URL_REWRITE"] = host.rewrite_rule()
+
+    runs = []
+    for _ in range(1 + warm_runs):
+        media.clear()
+        if host:
+            host.reset_counts()
+        at = AppTest.from_file(os.path.join(ROOT, script), default_timeout=300)
+        if module:
+            at.query_params["module"] = module
+        start = time.perf_counter()
+        at.run()
+        elapsed = time.perf_counter() - start
+        runs.append({
+            "seconds": elapsed,
+            "exceptions": [e.value for e in at.exception],
+            "errors": len(at.error),
+            "image_fetches": host.counts["ok"] if host else 0,
+            "revalidations": host.counts["not_modified"] if host else 0,
+            "bytes_fetched": host.counts["bytes_sent"] if host else 0,
+            "element_bytes": element_bytes(at._tree),
+            "media_bytes": sum(media.values()),
+        })
+    if host:
+        host.stop()
+    return {"cold": runs[0], "warm": runs[1:]}
+
+
+def run_child(args, script, module):
+    env = dict(os.environ)
+    env.update({
+        "BENCH_SOURCE": args.source,
+        "BENCH_LATENCY": str(args.latency_ms / 1000),
+        "BENCH_BANDWIDTH": str(int(args.bandwidth_kbps * 125)),
+        "METSYS_CACHE_DIR": tempfile.mkdtemp(prefix="bench-cache-"),
+        # The background warm-up would still be fetching during the warm runs and be counted there.
+        "METSYS_WARMUP": "0",
+        "PYTHONPATH": os.pathsep.join([ROOT, os.path.join(ROOT, "tools")]),
+    })
+    if module is None:
+        env["METSYS_NAV_MODE"] = "tabs"
+    if args.source == "remote":
+        env["METSYS_IMAGES_DIR"] = tempfile.mkdtemp(prefix="bench-images-")
+        env["METSYS_MANIFEST"] = os.path.join(ROOT, "images", "manifest.json")
+    cmd = [sys.executable, os.path.abspath(__file__), "--child", script, module or "", str(args.warm_runs)]
+    out = subprocess.run(cmd, env=env, cwd=ROOT, capture_output=True, text=True, check=True).stdout
+    return json.loads(out.strip().splitlines()[-1])
+
+
+def summarize(name, result):
+    warm = statistics.median(r["seconds"] for r in result["warm"]) if result["warm"] else float("nan")
+    cold = result["cold"]
+    print(
+        f"{name:<28}{cold['seconds'] * 1000:>9.0f}{warm * 1000:>9.0f}{cold['image_fetches']:>8}"
+        f"{sum(r['image_fetches'] for r in result['warm']):>8}"
+        f"{(cold['element_bytes'] + cold['media_bytes']) / 1024:>11.0f}"
+    )
+
+
+def streamlit_version():
+    import streamlit
+
+    return streamlit.__version__
+
+
+def main():
+    if len(sys.argv) > 1 and sys.argv[1] == "--child":
+        script, module, warm_runs = sys.argv[2], sys.argv[3] or None, int(sys.argv[4])
+        print(json.dumps(measure(script, module, warm_runs)))
+        return
+
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--scripts", nargs="+", default=list(SCRIPTS), choices=list(SCRIPTS))
+    parser.add_argument("--source", choices=["local", "remote"], default="local")
+    parser.add_argument("--latency-ms", type=float, default=80)
+    parser.add_argument("--bandwidth-kbps", type=float, default=20000, help="0 for unlimited")
+    parser.add_argument("--warm-runs", type=int, default=3)
+    parser.add_argument("--output", default="bench_render.json")
+    args = parser.parse_args()
+
+    results = {}
+    print(f"{'script / module':<28}{'cold ms':>9}{'warm ms':>9}{'fetch':>8}{'w.fetch':>8}{'cold KiB':>11}")
+    for script in args.scripts:
+        if args.source == "remote" and script in LOCAL_ONLY:
+            print(f"{script}: skipped, its images are bundled files with no remote copies")
+            continue
+        for module in [None] + module_slugs(SCRIPTS[script]):
+            name = f"{script}:{module or '*all*'}"
+            results[name] = run_child(args, script, module)
+            summarize(name, results[name])
+
+    try:
+        commit = subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], cwd=ROOT, capture_output=True, text=True
+        ).stdout.strip()
+    except OSError:
+        commit = None
+    report = {
+        "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S%z"),
+        "commit": commit,
+        "python": platform.python_version(),
+        "streamlit": streamlit_version(),
+        "params": vars(args),
+        "results": results,
+    }
+    with open(args.output, "w") as f:
+        json.dump(report, f, indent=1)
+    print(f"wrote {args.output}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,101 @@
+"""Latency benchmark for the project demo's critical-path engine.
+
+    python tools/bench_schedule.py [--tasks 100000 1000000] [--edits 500] [--output bench_schedule.json]
+
+For each --tasks, builds demos.projects' sample program and times the full
+level-by-level pass, a plain-Python critical-path pass over the same CSR graph (the
+per-task loop a scheduler without vectorization runs), and --edits random duration
+changes applied with Schedule.set_duration (incrementally, or as a full pass when an
+edit reaches too much of the graph). After the edits the times are checked against a
+full recompute, and the Gantt rows for one window are timed.
+"""
+import argparse
+import json
+import os
+import random
+import statistics
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import numpy as np  # noqa: E402
+
+from demos import SEED  # noqa: E402
+from demos.projects import GANTT_ROWS, gantt_rows, generate  # noqa: E402
+
+
+def python_pass(schedule):
+    """Earliest starts and tails with one Python loop per task, in topological order."""
+    pred_ptr, pred_idx = schedule.pred_ptr.tolist(), schedule.pred_idx.tolist()
+    succ_ptr, succ_idx = schedule.succ_ptr.tolist(), schedule.succ_idx.tolist()
+    duration = schedule.duration.tolist()
+    order = np.concatenate(schedule.by_level).tolist()
+    start, tail = [0] * schedule.size, [0] * schedule.size
+    for task in order:
+        start[task] = max((start[p] + duration[p] for p in pred_idx[pred_ptr[task]:pred_ptr[task + 1]]), default=0)
+    for task in reversed(order):
+        tail[task] = duration[task] + max((tail[s] for s in succ_idx[succ_ptr[task]:succ_ptr[task + 1]]), default=0)
+    return start, tail
+
+
+def timed(fn, *args):
+    start = time.perf_counter()
+    result = fn(*args)
+    return result, (time.perf_counter() - start) * 1000
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--tasks", type=int, nargs="+", default=[100_000, 1_000_000])
+    parser.add_argument("--edits", type=int, default=500)
+    parser.add_argument("--seed", type=int, default=SEED)
+    parser.add_argument("--output", default="bench_schedule.json")
+    args = parser.parse_args()
+
+    results = []
+    for tasks in args.tasks:
+        (schedule, project), build_ms = timed(generate, tasks, args.seed)
+        full_ms = statistics.median(timed(schedule.recompute)[1] for _ in range(3))
+        (start, tail), python_ms = timed(python_pass, schedule)
+        assert start == schedule.start.tolist() and tail == schedule.tail.tolist()
+
+        rng = random.Random(args.seed)
+        edit_ms, touched, full_passes = [], [], 0
+        for _ in range(args.edits):
+            result, ms = timed(schedule.set_duration, rng.randrange(tasks), rng.randrange(0, 40))
+            edit_ms.append(ms)
+            if result:
+                touched.append(sum(result))
+            else:
+                full_passes += 1
+        check = schedule.copy()
+        check.recompute()
+        assert (check.start == schedule.start).all() and (check.tail == schedule.tail).all()
+        window = np.flatnonzero(project == 0)[:GANTT_ROWS]
+        gantt_ms = statistics.median(timed(gantt_rows, schedule, window, schedule.duration == 0)[1] for _ in range(20))
+
+        edit_ms.sort()
+        result = {
+            "tasks": tasks, "edges": schedule.edges, "levels": len(schedule.by_level), "build_ms": build_ms,
+            "full_pass_ms": full_ms, "python_pass_ms": python_ms,
+            "edit_p50_ms": edit_ms[len(edit_ms) // 2], "edit_p99_ms": edit_ms[int(0.99 * (len(edit_ms) - 1))],
+            "edit_max_ms": edit_ms[-1], "touched_median": statistics.median(touched),
+            "full_passes": full_passes,
+            "gantt_rows_ms": gantt_ms,
+        }
+        results.append(result)
+        print(f"{tasks:,} tasks, {result['edges']:,} dependencies, {result['levels']} levels: "
+              f"built in {build_ms:.0f} ms")
+        print(f"  full pass {full_ms:.1f} ms vectorized, {python_ms:.0f} ms as a Python loop")
+        print(f"  {args.edits} edits: p50 {result['edit_p50_ms']:.2f} ms, p99 {result['edit_p99_ms']:.2f} ms, "
+              f"max {result['edit_max_ms']:.2f} ms; tasks recomputed median {result['touched_median']:.0f}, "
+              f"{result['full_passes']} fell back to a full pass; matches a full pass")
+        print(f"  Gantt rows for {GANTT_ROWS} tasks: {gantt_ms:.3f} ms")
+    with open(args.output, "w") as f:
+        json.dump({"params": vars(args), "results": results}, f, indent=1)
+    print(f"wrote {args.output}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,127 @@
+"""Latency benchmark for the CRM demo's segment engine.
+
+    python tools/bench_segments.py [--contacts 2000000] [--queries 50] [--updates 20]
+                                   [--output bench_segments.json]
+
+Generates demos.crm's contacts and times --queries random segments (AND of tags,
+OR of lists, NOT of tags, a custom-field range), plus one bare ("tag", key) segment
+per tag, three ways: a NumPy boolean-mask
+evaluation over the columns (the baseline without bitmaps), the bitmap engine on a
+cold cache, and the cached rerun. Then it tags --updates random batches of contacts
+and times the incremental patch of every cached segment against re-evaluating them
+from scratch. Every count is checked against the boolean baseline.
+"""
+import argparse
+import json
+import os
+import random
+import statistics
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import numpy as np  # noqa: E402
+
+from demos import SEED  # noqa: E402
+from demos.crm import FIELDS, build_expression, generate, leaves  # noqa: E402
+
+
+def masks(store):
+    """One bool array per tag and list, as a bitmap-less store would keep them."""
+    result = {}
+    for key, bitmap in store.bitmaps.items():
+        flags = np.zeros(store.size, dtype=bool)
+        flags[store.rows(bitmap.to_words())] = True
+        result[key] = flags
+    return result
+
+
+def boolean_count(store, flags, expr):
+    """Counts a segment with bool-array operations over every row."""
+    def mask(e):
+        kind = e[0]
+        if kind == "all":
+            return np.ones(store.size, dtype=bool)
+        if kind == "tag":
+            return flags[e[1]]
+        if kind == "range":
+            values = store.columns[e[1]]
+            return (values >= e[2]) & (values <= e[3])
+        if kind == "not":
+            return ~mask(e[1])
+        parts = [mask(sub) for sub in e[1:]]
+        return np.logical_and.reduce(parts) if kind == "and" else np.logical_or.reduce(parts)
+    return int(mask(expr).sum())
+
+
+def timed(fn, *args):
+    start = time.perf_counter()
+    result = fn(*args)
+    return result, (time.perf_counter() - start) * 1000
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--contacts", type=int, default=2_000_000)
+    parser.add_argument("--queries", type=int, default=50)
+    parser.add_argument("--updates", type=int, default=20)
+    parser.add_argument("--batch", type=int, default=1000)
+    parser.add_argument("--seed", type=int, default=SEED)
+    parser.add_argument("--output", default="bench_segments.json")
+    args = parser.parse_args()
+
+    store, generate_ms = timed(generate, args.contacts, args.seed)
+    flags = masks(store)
+    keys = sorted(store.bitmaps)
+    tags = [key for key in keys if key.startswith("tag:")]
+    lists = [key for key in keys if key.startswith("list:")]
+    rng = random.Random(args.seed)
+
+    def random_segment():
+        column = rng.choice([column for column, _ in FIELDS.values()])
+        top = int(store.columns[column].max())
+        lo = rng.randrange(top // 2)
+        return build_expression(rng.sample(tags, rng.randint(0, 2)), rng.sample(lists, rng.randint(1, 3)),
+                                rng.sample(tags, rng.randint(0, 2)), [(column, lo, rng.randint(lo, top))])
+
+    # Bare tags too: a cached dense tag must not share words with the bitmap tag() edits.
+    segments = [random_segment() for _ in range(args.queries)] + [("tag", key) for key in tags]
+    timings = {"boolean": [], "cold": [], "cached": []}
+    for expr in segments:
+        expected, ms = timed(boolean_count, store, flags, expr)
+        timings["boolean"].append(ms)
+        (_, count), ms = timed(store.segment, expr)
+        timings["cold"].append(ms)
+        timings["cached"].append(timed(store.segment, expr)[1])
+        assert count == expected, (expr, count, expected)
+
+    patch, rebuild = [], []
+    for _ in range(args.updates):
+        key = rng.choice(tags)
+        rows = np.array(rng.sample(range(store.size), args.batch))
+        add = rng.random() < 0.5
+        patch.append(timed(store.tag, key, rows, add)[1])
+        flags[key][rows] = add
+        rebuild.append(timed(lambda: [store.evaluate(expr) for expr in segments if key in leaves(expr)])[1])
+    for expr in segments:
+        assert store.segment(expr)[1] == boolean_count(store, flags, expr), expr
+
+    summary = {name: {"median_ms": statistics.median(v), "max_ms": max(v)} for name, v in timings.items()}
+    updates = {"patch_median_ms": statistics.median(patch), "reevaluate_median_ms": statistics.median(rebuild)}
+    index_bytes = sum(bitmap.nbytes for bitmap in store.bitmaps.values())
+    print(f"generated {store.size:,} contacts in {generate_ms:.0f} ms; {len(store.bitmaps)} bitmaps, "
+          f"{index_bytes / 1e6:.1f} MB (bool masks: {sum(f.nbytes for f in flags.values()) / 1e6:.0f} MB)")
+    print(f"{'segment':<10}{'median ms':>11}{'max ms':>9}")
+    for name, s in summary.items():
+        print(f"{name:<10}{s['median_ms']:>11.3f}{s['max_ms']:>9.3f}")
+    print(f"tagging {args.batch} contacts: patch cached segments {updates['patch_median_ms']:.2f} ms, "
+          f"re-evaluate them {updates['reevaluate_median_ms']:.2f} ms (median); counts match")
+    with open(args.output, "w") as f:
+        json.dump({"params": vars(args), "generate_ms": generate_ms, "index_bytes": index_bytes,
+                   "segments": summary, "updates": updates}, f, indent=1)
+    print(f"wrote {args.output}")
+
+
+if __name__ == "__main__":
+    main()
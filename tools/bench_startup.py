@@ -0,0 +1,211 @@
+"""Cold-start report: import time of the app modules and time to first byte of a fresh server.
+
+    python tools/bench_startup.py [--script app.py] [--source local|remote] [--latency-ms 80]
+                                  [--compare REV] [--output bench_startup.json]
+
+For the working tree (and, with --compare, a git revision checked out into a temporary
+worktree) it reports:
+
+  * import: `python -X importtime -c "import content"` (or the script's own imports for
+    revisions that predate content.py), plus whether PIL and requests were loaded;
+  * ready: seconds from spawning `streamlit run` until /_stcore/health answers;
+  * first view: the first visitor's page view of the default module (first element
+    and full run with media);
+  * second view: a different module's page view a moment later, which the background
+    warm-up should already have served from cache.
+
+Every server starts with an empty image cache. With --source remote the bundled images
+are hidden and screenshots come from a local StubBlobHost, as in tools/bench_render.py.
+Nothing touches the real network: a revision that cannot be pointed at the stub (it
+predates METSYS_URL_REWRITE and fetches some screenshots from the blob store directly)
+gets only the import and ready measurements, and its page views are reported as n/a.
+"""
+import argparse
+import ast
+import json
+import os
+import re
+import shutil
+import socket
+import subprocess
+import sys
+import tempfile
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from stub_blob_host import StubBlobHost  # noqa: E402
+from streamlit_client import page_view, wait_until_healthy  # noqa: E402
+
+PROBE = (
+    "import sys, time; start = time.perf_counter(); import {module}; "
+    "print(time.perf_counter() - start, 'PIL' in sys.modules, 'requests' in sys.modules)"
+)
+
+
+def free_port():
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+def script_imports(path):
+    """The modules a script imports at top level, comma-separated."""
+    with open(path, encoding="utf-8") as f:
+        tree = ast.parse(f.read())
+    names = []
+    for node in tree.body:
+        if isinstance(node, ast.Import):
+            names.extend(alias.name for alias in node.names)
+        elif isinstance(node, ast.ImportFrom) and node.module and not node.level:
+            names.append(node.module)
+    return ", ".join(dict.fromkeys(names))
+
+
+def import_report(tree, env, script):
+    """Imports the app's modules in a fresh interpreter and summarizes where the time went."""
+    if os.path.exists(os.path.join(tree, "content.py")):
+        module = "content"
+    elif os.path.exists(os.path.join(tree, "components.py")):
+        module = "components"
+    else:
+        module = script_imports(os.path.join(tree, script))
+    proc = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", PROBE.format(module=module)],
+        cwd=tree, env=env, capture_output=True, text=True, check=True,
+    )
+    seconds, pil, requests_loaded = proc.stdout.split()
+    cumulative = {}
+    for line in proc.stderr.splitlines():
+        match = re.match(r"import time:\s+\d+ \|\s+(\d+) \|\s+(\S+)", line)
+        if match:
+            cumulative[match.group(2)] = int(match.group(1)) / 1e6
+    heavy = {name: cumulative.get(name) for name in ("streamlit", "requests", "PIL", "PIL.Image")}
+    return {
+        "module": module,
+        "seconds": float(seconds),
+        "PIL_loaded": pil == "True",
+        "requests_loaded": requests_loaded == "True",
+        "cumulative_seconds": {name: s for name, s in heavy.items() if s is not None},
+    }
+
+
+def supports_rewrite(tree):
+    """Whether the app in `tree` honours METSYS_URL_REWRITE, so its image fetches can go to the stub."""
+    for name in os.listdir(tree):
+        if name.endswith(".py"):
+            with open(os.path.join(tree, name), encoding="utf-8") as f:
+                if "METSYS_URL_REWRITE" in f.read():
+                    return True
+    return False
+
+
+def server_report(tree, script, env, modules, settle, views=True):
+    """Starts a fresh server from `tree` and times readiness and (with `views`) the first two page views."""
+    port = free_port()
+    base_url = f"http://127.0.0.1:{port}"
+    started = time.perf_counter()
+    server = subprocess.Popen(
+        [sys.executable, "-m", "streamlit", "run", script, "--server.headless", "true",
+         "--server.port", str(port), "--browser.gatherUsageStats", "false"],
+        cwd=tree, env=env, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL,
+    )
+    try:
+        wait_until_healthy(base_url)
+        ready = time.perf_counter() - started
+        if not views:
+            return {"ready_seconds": ready, "first_view": None, "second_view": None}
+        first = page_view(base_url, f"module={modules[0]}")
+        time.sleep(settle)
+        second = page_view(base_url, f"module={modules[1]}")
+    finally:
+        server.terminate()
+        server.wait()
+    return {
+        "ready_seconds": ready,
+        "first_view": {k: first[k] for k in ("first_delta_seconds", "script_seconds", "seconds")},
+        "second_view": {k: second[k] for k in ("first_delta_seconds", "script_seconds", "seconds")},
+    }
+
+
+def report(tree, args, modules, host):
+    env = dict(os.environ, METSYS_CACHE_DIR=tempfile.mkdtemp(prefix="startup-cache-"))
+    if host:
+        env["METSYS_URL_REWRITE"] = host.rewrite_rule()
+        env["METSYS_IMAGES_DIR"] = tempfile.mkdtemp(prefix="startup-images-")
+        env["METSYS_MANIFEST"] = os.path.join(ROOT, "images", "manifest.json")
+    return {
+        "import": import_report(tree, env, args.script),
+        "server": server_report(tree, args.script, env, modules, args.settle, views=supports_rewrite(tree)),
+    }
+
+
+def checkout(rev):
+    """Checks `rev` out into a temporary worktree, sharing the untracked derivatives."""
+    tree = tempfile.mkdtemp(prefix="startup-rev-")
+    subprocess.run(["git", "worktree", "add", "--detach", tree, rev], cwd=ROOT, capture_output=True, check=True)
+    derived = os.path.join(ROOT, "images", "derived")
+    if os.path.isdir(derived) and not os.path.exists(os.path.join(tree, "images", "derived")):
+        os.symlink(derived, os.path.join(tree, "images", "derived"))
+    return tree
+
+
+def print_row(label, r):
+    imp, srv = r["import"], r["server"]
+    if srv["first_view"]:
+        views = (f"{srv['first_view']['first_delta_seconds'] * 1000:>9.0f}"
+                 f"{srv['first_view']['seconds'] * 1000:>9.0f}{srv['second_view']['seconds'] * 1000:>9.0f}")
+    else:
+        views = f"{'n/a':>9}{'n/a':>9}{'n/a':>9}"
+    print(
+        f"{label:<14}{imp['seconds'] * 1000:>9.0f}{'yes' if imp['PIL_loaded'] else 'no':>6}"
+        f"{'yes' if imp['requests_loaded'] else 'no':>6}{srv['ready_seconds']:>8.2f}{views}"
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--script", choices=["app.py", "1app.py"], default="app.py")
+    parser.add_argument("--source", choices=["local", "remote"], default="local")
+    parser.add_argument("--latency-ms", type=float, default=80)
+    parser.add_argument("--bandwidth-kbps", type=float, default=20000, help="0 for unlimited")
+    parser.add_argument("--settle", type=float, default=2, help="seconds between the two page views")
+    parser.add_argument("--compare", metavar="REV", help="also measure this git revision")
+    parser.add_argument("--output", default="bench_startup.json")
+    args = parser.parse_args()
+
+    with open(os.path.join(ROOT, "content.json")) as f:
+        app = {"app.py": "showcase", "1app.py": "overview"}[args.script]
+        modules = [module["slug"] for module in json.load(f)["apps"][app]["modules"]]
+    host = None
+    if args.source == "remote":
+        host = StubBlobHost(
+            latency=args.latency_ms / 1000, bandwidth=int(args.bandwidth_kbps * 125),
+            images_dir=os.path.join(ROOT, "images"),
+        ).start()
+
+    results = {}
+    trees = {"working tree": ROOT}
+    if args.compare:
+        trees = {args.compare: checkout(args.compare), **trees}
+    try:
+        for label, tree in trees.items():
+            results[label] = report(tree, args, modules, host)
+    finally:
+        if host:
+            host.stop()
+        if args.compare:
+            subprocess.run(["git", "worktree", "remove", "--force", trees[args.compare]], cwd=ROOT, capture_output=True)
+            shutil.rmtree(trees[args.compare], ignore_errors=True)
+
+    print(f"{'':<14}{'import ms':>9}{'PIL':>6}{'req':>6}{'ready s':>8}{'1st el':>9}{'1st ms':>9}{'2nd ms':>9}")
+    for label, r in results.items():
+        print_row(label, r)
+    with open(args.output, "w") as f:
+        json.dump({"params": vars(args), "modules": modules[:2], "results": results}, f, indent=1)
+    print(f"wrote {args.output}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,165 @@
+"""Page-view throughput of the static export against the live Streamlit app.
+
+    python tools/bench_throughput.py [--app showcase] [--module analytics] [--concurrency 16]
+                                     [--duration 10] [--output bench_throughput.json]
+
+Exports the app with tools/export_static.py and serves it with `python -m http.server`,
+then starts `streamlit run` on the matching script. Each is loaded for --duration seconds
+by --concurrency client threads.
+
+A static page view is index.html plus the fallback image of every screenshot in the
+module's panel. A Streamlit page view is the HTML shell, a websocket session running
+the script for ?module=<slug>, and the /media/ files it produced. http.server is
+a deliberately modest stand-in for a CDN, so the static numbers are a floor.
+"""
+import argparse
+import json
+import os
+import re
+import socket
+import statistics
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+
+import requests
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from assets import AssetResolver, load_manifest, load_variants  # noqa: E402
+from export_static import export_app  # noqa: E402
+from streamlit_client import page_view, wait_until_healthy  # noqa: E402
+
+SCRIPTS = {"showcase": "app.py", "overview": "1app.py"}
+
+
+def free_port():
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+def load(view, concurrency, duration):
+    """Calls view(http) from `concurrency` threads for `duration` seconds and summarizes the results."""
+    results, errors = [], []
+    deadline = time.monotonic() + duration
+
+    def worker():
+        http = requests.Session()
+        while time.monotonic() < deadline:
+            start = time.perf_counter()
+            try:
+                nbytes = view(http)
+            except Exception as e:
+                errors.append(repr(e))
+                continue
+            results.append((time.perf_counter() - start, nbytes))
+
+    started = time.monotonic()
+    threads = [threading.Thread(target=worker) for _ in range(concurrency)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    elapsed = time.monotonic() - started
+    latencies = sorted(seconds for seconds, _ in results)
+
+    def pct(q):
+        return latencies[min(int(q * len(latencies)), len(latencies) - 1)] * 1000 if latencies else None
+
+    return {
+        "page_views": len(results),
+        "page_views_per_second": len(results) / elapsed,
+        "p50_ms": pct(0.50),
+        "p95_ms": pct(0.95),
+        "p99_ms": pct(0.99),
+        "mean_bytes": statistics.mean(nbytes for _, nbytes in results) if results else 0,
+        "errors": len(errors),
+        "first_error": errors[0] if errors else None,
+    }
+
+
+def static_view(base_url, module):
+    """Returns a page-view callable for the exported site."""
+    page = requests.get(base_url + "/index.html", timeout=10).text
+    panel = re.search(rf'<section id="{re.escape(module)}">(.*?)</section>', page, re.S).group(1)
+    images = re.findall(r'<img src="([^"]+)"', panel)
+
+    def view(http):
+        nbytes = len(http.get(base_url + "/index.html").content)
+        for src in images:
+            response = http.get(f"{base_url}/{src}")
+            response.raise_for_status()
+            nbytes += len(response.content)
+        return nbytes
+
+    return view
+
+
+def streamlit_view(base_url, module):
+    """Returns a page-view callable for the live Streamlit server."""
+    def view(http):
+        nbytes = len(http.get(base_url + "/").content)
+        result = page_view(base_url, f"module={module}", http=http)
+        return nbytes + result["ws_bytes"] + result["media_bytes"]
+
+    return view
+
+
+def start(cmd, env=None):
+    return subprocess.Popen(cmd, cwd=ROOT, env=env, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--app", choices=list(SCRIPTS), default="showcase")
+    parser.add_argument("--module", help="module slug to load (default: the first)")
+    parser.add_argument("--concurrency", type=int, default=16)
+    parser.add_argument("--duration", type=float, default=10)
+    parser.add_argument("--output", default="bench_throughput.json")
+    args = parser.parse_args()
+
+    with open(os.path.join(ROOT, "content.json")) as f:
+        spec = json.load(f)["apps"][args.app]
+    module = args.module or spec["modules"][0]["slug"]
+    variants = load_variants()
+    out_dir = os.path.join(tempfile.mkdtemp(prefix="metsys-export-"), args.app)
+    export_app(args.app, spec, out_dir, AssetResolver(load_manifest(), variants=variants), variants)
+
+    results = {}
+    static_port, streamlit_port = free_port(), free_port()
+    servers = [
+        start([sys.executable, "-m", "http.server", str(static_port), "--bind", "127.0.0.1", "--directory", out_dir]),
+        start([
+            sys.executable, "-m", "streamlit", "run", SCRIPTS[args.app], "--server.headless", "true",
+            "--server.port", str(streamlit_port), "--browser.gatherUsageStats", "false",
+        ]),
+    ]
+    try:
+        static_url, streamlit_url = f"http://127.0.0.1:{static_port}", f"http://127.0.0.1:{streamlit_port}"
+        wait_until_healthy(streamlit_url)
+        views = {"static": static_view(static_url, module), "streamlit": streamlit_view(streamlit_url, module)}
+        for name, view in views.items():
+            view(requests.Session())  # warm caches before measuring
+            results[name] = load(view, args.concurrency, args.duration)
+    finally:
+        for server in servers:
+            server.terminate()
+            server.wait()
+
+    print(f"{'server':<12}{'views/s':>10}{'p50 ms':>9}{'p95 ms':>9}{'p99 ms':>9}{'KiB/view':>10}{'errors':>8}")
+    for name, r in results.items():
+        print(
+            f"{name:<12}{r['page_views_per_second']:>10.1f}{r['p50_ms'] or 0:>9.1f}{r['p95_ms'] or 0:>9.1f}"
+            f"{r['p99_ms'] or 0:>9.1f}{r['mean_bytes'] / 1024:>10.0f}{r['errors']:>8}"
+        )
+    with open(args.output, "w") as f:
+        json.dump({"params": vars(args), "module": module, "results": results}, f, indent=1)
+    print(f"wrote {args.output}")
+
+
+if __name__ == "__main__":
+    main()
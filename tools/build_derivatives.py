@@ -0,0 +1,132 @@
+"""Pre-generates width-bucketed AVIF/WebP variants and a tiny placeholder for every screenshot.
+
+    python tools/build_derivatives.py [--workers N] [--force]
+
+Variants land in images/derived/ alongside index.json, which the display helpers read
+through assets.AssetResolver.variant(). Sources whose SHA-256 matches the index are skipped,
+so re-running after adding or editing one screenshot only rebuilds that screenshot.
+"""
+import argparse
+import base64
+import hashlib
+import io
+import json
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from assets import DERIVED_DIR, DERIVED_INDEX, IMAGES_DIR, VARIANT_WIDTHS, load_variants  # noqa: E402
+
+SOURCE_EXTENSIONS = (".png", ".jpg", ".jpeg")
+PLACEHOLDER_WIDTH = 24
+# Encoder settings per output format, passed straight to PIL's Image.save.
+ENCODERS = {
+    "avif": {"format": "AVIF", "quality": 55, "speed": 6},
+    "webp": {"format": "WEBP", "quality": 80, "method": 4},
+}
+
+
+def file_digest(path):
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(1 << 20), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def available_formats():
+    from PIL import features
+
+    return [fmt for fmt in ENCODERS if features.check(fmt)]
+
+
+def build_one(name, digest, formats):
+    """Writes every variant of images/<name> and returns its index entry."""
+    from PIL import Image, ImageFilter
+
+    stem = os.path.splitext(name)[0]
+    with Image.open(os.path.join(IMAGES_DIR, name)) as source:
+        img = source.convert("RGBA" if "A" in source.getbands() else "RGB")
+    widths = [w for w in VARIANT_WIDTHS if w < img.width] or [img.width]
+    variants = []
+    for width in widths:
+        height = round(img.height * width / img.width)
+        resized = img.resize((width, height), Image.LANCZOS)
+        for fmt in formats:
+            file_name = f"{stem}-{width}.{fmt}"
+            path = os.path.join(DERIVED_DIR, file_name)
+            resized.save(path, **ENCODERS[fmt])
+            variants.append({
+                "file": file_name,
+                "format": fmt,
+                "width": width,
+                "height": height,
+                "bytes": os.path.getsize(path),
+            })
+
+    tiny = img.resize((PLACEHOLDER_WIDTH, max(1, round(img.height * PLACEHOLDER_WIDTH / img.width))))
+    buffer = io.BytesIO()
+    tiny.filter(ImageFilter.GaussianBlur(1)).save(buffer, format="WEBP", quality=40)
+    return name, {
+        "sha256": digest,
+        "width": img.width,
+        "height": img.height,
+        "bytes": os.path.getsize(os.path.join(IMAGES_DIR, name)),
+        "variants": variants,
+        "placeholder": "data:image/webp;base64," + base64.b64encode(buffer.getvalue()).decode("ascii"),
+    }
+
+
+def is_current(entry, digest, formats):
+    if not entry or entry["sha256"] != digest:
+        return False
+    built = {v["format"] for v in entry["variants"]}
+    if built != set(formats):
+        return False
+    return all(os.path.isfile(os.path.join(DERIVED_DIR, v["file"])) for v in entry["variants"])
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--workers", type=int, default=os.cpu_count())
+    parser.add_argument("--force", action="store_true", help="rebuild every source, ignoring hashes")
+    args = parser.parse_args()
+
+    os.makedirs(DERIVED_DIR, exist_ok=True)
+    formats = available_formats()
+    index = load_variants()
+    sources = sorted(n for n in os.listdir(IMAGES_DIR) if n.lower().endswith(SOURCE_EXTENSIONS))
+    digests = {name: file_digest(os.path.join(IMAGES_DIR, name)) for name in sources}
+    stale = [n for n in sources if args.force or not is_current(index["sources"].get(n), digests[n], formats)]
+
+    start = time.perf_counter()
+    entries = {n: index["sources"][n] for n in sources if n not in stale}
+    with ProcessPoolExecutor(max_workers=args.workers) as pool:
+        for name, entry in pool.map(build_one, stale, [digests[n] for n in stale], [formats] * len(stale)):
+            entries[name] = entry
+            print(f"built {name}: {len(entry['variants'])} variants")
+
+    # Drop variants left behind by deleted sources or retired widths.
+    referenced = {v["file"] for entry in entries.values() for v in entry["variants"]}
+    for file_name in os.listdir(DERIVED_DIR):
+        if file_name != os.path.basename(DERIVED_INDEX) and file_name not in referenced:
+            os.remove(os.path.join(DERIVED_DIR, file_name))
+
+    tmp = DERIVED_INDEX + ".tmp"
+    with open(tmp, "w") as f:
+        json.dump({"formats": formats, "widths": list(VARIANT_WIDTHS), "sources": entries}, f, indent=1, sort_keys=True)
+    os.replace(tmp, DERIVED_INDEX)
+
+    original = sum(e["bytes"] for e in entries.values())
+    smallest = sum(min(v["bytes"] for v in e["variants"]) for e in entries.values())
+    print(
+        f"{len(stale)} rebuilt, {len(sources) - len(stale)} up to date in {time.perf_counter() - start:.1f}s; "
+        f"originals {original / 1e6:.1f} MB, smallest variants {smallest / 1e6:.1f} MB"
+    )
+
+
+if __name__ == "__main__":
+    main()
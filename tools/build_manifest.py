@@ -0,0 +1,109 @@
+"""Regenerates images/manifest.json and reports unused, oversized and unrecognised assets.
+
+    python tools/build_manifest.py [--max-bytes 1000000] [--check]
+
+Every file in images/ gets an entry with its SHA-256, byte size, MIME type and pixel
+dimensions (read from the header with imaging.sniff_file, never decoded); blob-store
+URLs already in the manifest are kept. The display helpers read these through
+assets.AssetResolver to size placeholders and key caches without opening the file.
+
+The report lists assets no content.json block references, assets over --max-bytes,
+files that are not recognisable images, and references to files that do not exist.
+With --check the exit status is 1 if any of those is found, so it can gate CI.
+"""
+import argparse
+import hashlib
+import json
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import imaging  # noqa: E402
+from assets import IMAGES_DIR, MANIFEST_PATH, MIME_TYPES, AssetResolver, load_manifest  # noqa: E402
+from content import CONTENT_PATH, compile_app, plan_slots  # noqa: E402
+
+
+def describe(path):
+    """Returns the manifest fields for one file."""
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(1 << 20), b""):
+            digest.update(chunk)
+    size = os.path.getsize(path)
+    fmt, width, height = imaging.sniff_file(path) if size else (None, None, None)
+    return {
+        "sha256": digest.hexdigest(),
+        "bytes": size,
+        "mime": MIME_TYPES.get(fmt.lower()) if fmt else None,
+        "width": width,
+        "height": height,
+    }
+
+
+def referenced_names(content_path, resolver):
+    """Returns {asset name: [app/module, ...]} for every image content.json displays."""
+    with open(content_path) as f:
+        apps = json.load(f)["apps"]
+    used = {}
+    for app_name, spec in apps.items():
+        app = compile_app(spec)
+        sections = {"intro": app["intro"], "footer": app["footer"], "sidebar": app["sidebar"]}
+        sections.update((slug, module["plan"]) for slug, module in app["modules"].items())
+        for section, plan in sections.items():
+            for ref, _ in plan_slots(plan):
+                name = resolver.name(ref) or ref
+                used.setdefault(name, []).append(f"{app_name}/{section}")
+    return used
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--images", default=IMAGES_DIR)
+    parser.add_argument("--manifest", default=MANIFEST_PATH)
+    parser.add_argument("--content", default=CONTENT_PATH)
+    parser.add_argument("--max-bytes", type=int, default=1_000_000, help="size budget per asset")
+    parser.add_argument("--check", action="store_true", help="exit 1 if the report finds problems")
+    args = parser.parse_args()
+
+    old = load_manifest(args.manifest)["assets"]
+    skip = {os.path.basename(args.manifest)}
+    assets = {}
+    for name in sorted(os.listdir(args.images)):
+        path = os.path.join(args.images, name)
+        if name in skip or not os.path.isfile(path):
+            continue
+        url = old.get(name, {}).get("url")
+        assets[name] = dict({"url": url} if url else {}, **describe(path))
+    # Remote-only assets keep their entries so their URLs still resolve.
+    for name, entry in old.items():
+        if name not in assets and entry.get("url"):
+            assets[name] = {"url": entry["url"]}
+
+    manifest = {"assets": assets}
+    with open(args.manifest, "w") as f:
+        json.dump(manifest, f, indent=2)
+        f.write("\n")
+
+    used = referenced_names(args.content, AssetResolver(manifest, images_dir=args.images))
+    local = {name: entry for name, entry in assets.items() if "bytes" in entry}
+    problems = {
+        "unused": sorted(name for name in local if name not in used),
+        "oversized": sorted(name for name, entry in local.items() if entry["bytes"] > args.max_bytes),
+        "unrecognised": sorted(name for name, entry in local.items() if entry["mime"] is None),
+        "missing": sorted(name for name in used if name not in assets),
+    }
+    total = sum(entry["bytes"] for entry in local.values())
+    print(f"{len(local)} files, {total / 1e6:.1f} MB; {len(used)} referenced by {args.content}")
+    for kind, names in problems.items():
+        for name in names:
+            entry = local.get(name, {})
+            size = f"{entry['bytes'] / 1e6:.2f} MB" if "bytes" in entry else ""
+            where = ", ".join(list(dict.fromkeys(used.get(name, [])))[:3])
+            print(f"  {kind:<13}{name:<20}{size:>10}  {where}")
+    if args.check and any(problems.values()):
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
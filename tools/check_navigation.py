@@ -0,0 +1,69 @@
+"""Checks that the sidebar module picker follows every click, with and without a ?module= deep link.
+
+    python tools/check_navigation.py [--scripts app.py 1app.py]
+
+For each script, opens the app headlessly with streamlit.testing AppTest, then picks
+every module in the sidebar radio in order (and back to the first), the way a visitor
+clicks through them. After each click the page must show that module's header and
+?module= must name it. A second pass starts from a ?module= deep link to the last
+module and clicks through again. tools/load_test.py switches modules through the query
+string only, so it cannot catch a radio that drops clicks.
+
+Exits non-zero if any click lands on the wrong module.
+"""
+import argparse
+import os
+import sys
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from streamlit.testing.v1 import AppTest  # noqa: E402
+
+import content  # noqa: E402
+
+# The app each script renders from content.json.
+SCRIPT_APPS = {"app.py": "showcase", "1app.py": "overview"}
+
+
+def click_through(script, modules, deep_link=None):
+    """Clicks each module in turn and returns the clicks that showed something else."""
+    at = AppTest.from_file(os.path.join(ROOT, script), default_timeout=300)
+    if deep_link:
+        at.query_params["module"] = deep_link
+    at.run()
+    slugs = list(modules)
+    first = deep_link or slugs[0]
+    failures = []
+    for slug in [first] + [s for s in slugs if s != first] + [slugs[0]]:
+        if at.sidebar.radio[0].value != slug:
+            at.sidebar.radio[0].set_value(slug).run()
+        header = modules[slug]["plan"][0][1]
+        shown = [h.value for h in at.main.header]
+        if at.exception or header not in shown or at.query_params.get("module") != slug:
+            failures.append((slug, at.sidebar.radio[0].value, shown[:1], [e.value for e in at.exception]))
+    return failures
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--scripts", nargs="+", choices=list(SCRIPT_APPS), default=list(SCRIPT_APPS))
+    args = parser.parse_args()
+
+    plans = content.load_plans(content.CONTENT_PATH)
+    ok = True
+    for script in args.scripts:
+        modules = plans["apps"][SCRIPT_APPS[script]]["modules"]
+        for start in (None, list(modules)[-1]):
+            failures = click_through(script, modules, start)
+            ok &= not failures
+            label = f"?module={start}" if start else "no deep link"
+            print(f"{script} ({label}): {len(modules) + 1} clicks, "
+                  f"{'ok' if not failures else f'{len(failures)} FAILED'}")
+            for slug, value, shown, errors in failures:
+                print(f"  clicked {slug}: radio {value}, header {shown}, exceptions {errors}")
+    sys.exit(0 if ok else 1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,120 @@
+"""Checks that image fetching fails fast against a blob host that stalls, errors or is down.
+
+    python tools/check_resilience.py [--read-timeout 1] [--retries 2] [--seed 7]
+
+Runs ImageCache against a local StubBlobHost in a series of scenarios. Each fetches
+every manifest URL twice (two "reruns") and must finish each pass within the time
+the timeouts and retry budget allow:
+
+  healthy   no faults; everything is fetched once
+  flaky     30% of responses are 503s; retries recover every URL except those whose
+            seeded fault schedule fails all attempts, which also fail (cached) in pass 2
+  stalling  30% of requests hang for 30 s; read timeouts cut them short
+  outage    every request fails; the circuit opens and the second pass sends nothing
+  stale     the host goes down after a first fetch; expired copies are served instead
+
+Exits non-zero if a pass overruns its bound or a scenario's expectation fails.
+"""
+import argparse
+import os
+import random
+import sys
+import tempfile
+import time
+from concurrent.futures import wait
+from urllib.parse import urlsplit
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from assets import IMAGES_DIR, load_manifest  # noqa: E402
+from image_cache import CircuitBreaker, ImageCache  # noqa: E402
+from stub_blob_host import StubBlobHost  # noqa: E402
+
+SCENARIOS = {
+    "healthy": {},
+    "flaky": {"error_rate": 0.3},
+    "stalling": {"stall_rate": 0.3},
+    "outage": {"error_rate": 1.0},
+    "stale": {},
+}
+
+
+def run_pass(cache, urls):
+    """Fetches every URL concurrently, like one rerun's prefetch, and counts the outcomes."""
+    start = time.perf_counter()
+    futures = cache.prefetch(urls)
+    wait(futures.values())
+    failed = sum(1 for f in futures.values() if f.exception() is not None)
+    return {"seconds": time.perf_counter() - start, "ok": len(urls) - failed, "failed": failed}
+
+
+def run_scenario(name, faults, args, urls):
+    host = StubBlobHost(stall=30, images_dir=IMAGES_DIR, seed=args.seed, **faults).start()
+    # The stub's faults are a fixed schedule per URL, so the URLs that run out of retries are known.
+    exhausted = sum(
+        all(host.fault(urlsplit(url).path, n)[1] for n in range(args.retries + 1)) for url in urls
+    )
+    cache = ImageCache(
+        directory=tempfile.mkdtemp(prefix="resilience-"),
+        timeout=(args.connect_timeout, args.read_timeout),
+        retries=args.retries,
+        backoff=args.backoff,
+        breaker=CircuitBreaker(threshold=3, cooldown=60),
+        rewrite=host.rewrite_rule(),
+        ttl=0 if name == "stale" else 3600,
+    )
+    passes = [run_pass(cache, urls)]
+    if name == "stale":
+        host.error_rate = 1.0
+    requests_before = host.counts["requests"]
+    passes.append(run_pass(cache, urls))
+    second_pass_requests = host.counts["requests"] - requests_before
+    host.stop()
+    stats = cache.stats()
+
+    expectations = {
+        "healthy": passes[0]["failed"] == 0 and passes[1]["failed"] == 0,
+        "flaky": passes[0]["failed"] == exhausted and passes[1]["failed"] == exhausted,
+        "stalling": True,
+        "outage": passes[0]["failed"] == len(urls) and second_pass_requests == 0,
+        "stale": passes[1]["failed"] == 0 and stats["stale_served"] == len(urls),
+    }
+    return passes, stats, expectations[name]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--connect-timeout", type=float, default=1)
+    parser.add_argument("--read-timeout", type=float, default=1)
+    parser.add_argument("--retries", type=int, default=2)
+    parser.add_argument("--backoff", type=float, default=0.05)
+    parser.add_argument("--seed", type=int, default=7)
+    parser.add_argument("--scenarios", nargs="+", choices=list(SCENARIOS), default=list(SCENARIOS))
+    args = parser.parse_args()
+    random.seed(args.seed)
+
+    urls = [entry["url"] for entry in load_manifest()["assets"].values() if entry.get("url")]
+    # Worst case for one URL: every attempt times out, plus the longest jittered sleeps.
+    attempts = args.retries + 1
+    bound = attempts * (args.connect_timeout + args.read_timeout) + sum(
+        args.backoff * 2 ** attempt for attempt in range(1, attempts)
+    ) + 1.0
+
+    ok = True
+    print(f"{'scenario':<10}{'pass 1 s':>9}{'ok':>4}{'pass 2 s':>9}{'ok':>4}"
+          f"{'retries':>8}{'short':>7}{'stale':>7}{'open':>6}  result")
+    for name in args.scenarios:
+        passes, stats, expected = run_scenario(name, SCENARIOS[name], args, urls)
+        within = all(p["seconds"] <= bound for p in passes)
+        ok &= within and expected
+        print(
+            f"{name:<10}{passes[0]['seconds']:>9.2f}{passes[0]['ok']:>4}{passes[1]['seconds']:>9.2f}"
+            f"{passes[1]['ok']:>4}{stats['retries']:>8}{stats['short_circuits']:>7}{stats['stale_served']:>7}"
+            f"{stats['open_circuits']:>6}  {'ok' if within and expected else 'FAILED'}"
+            f"{'' if within else f' (over the {bound:.1f} s bound)'}"
+        )
+    sys.exit(0 if ok else 1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,325 @@
+"""Exports each app in content.json as a static HTML page with fingerprinted, optimized assets.
+
+    python tools/export_static.py [--apps showcase overview] [--output dist]
+
+Every module is rendered into one <app>/index.html: modules become CSS-only tabs
+(the METSYS_NAV_MODE=tabs layout, with #<slug> deep links), cards keep the
+feature_card markup, and columns and feature sections keep their image grid.
+Screenshots are written to <app>/assets/ under content-hashed names, so they can
+be served with a year-long immutable Cache-Control. When tools/build_derivatives.py
+has been run, each image becomes a <picture> with AVIF and WebP srcsets and a
+blurred placeholder; otherwise the image is downscaled to the display width.
+
+The result needs no Python per request: any file server or CDN can serve it.
+tools/bench_throughput.py compares it with the live Streamlit app.
+"""
+import argparse
+import hashlib
+import html
+import json
+import math
+import os
+import re
+import shutil
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import imaging  # noqa: E402
+from assets import (  # noqa: E402
+    DERIVED_DIR,
+    DISPLAY_WIDTH,
+    MIME_TYPES,
+    AssetResolver,
+    load_manifest,
+    load_variants,
+)
+from content import CONTENT_PATH, compile_app  # noqa: E402
+from image_cache import ImageCache  # noqa: E402
+
+# Roughly Streamlit's default theme, so the export looks like the live app.
+STYLE = """
+* { box-sizing: border-box; }
+body { margin: 0; font-family: "Source Sans Pro", system-ui, sans-serif; color: #31333f; line-height: 1.6; }
+.layout { display: flex; min-height: 100vh; }
+aside { width: 300px; flex-shrink: 0; padding: 2rem 1.5rem; background: #f0f2f6; }
+main { flex: 1; max-width: 780px; margin: 0 auto; padding: 3rem 1.5rem; }
+@media (max-width: 900px) { .layout { flex-direction: column-reverse; } aside { width: auto; } }
+img { max-width: 100%; height: auto; display: block; border-radius: 4px; background-size: cover; }
+figure { margin: 0 0 1rem; }
+figcaption { font-size: 0.875rem; color: rgba(49, 51, 63, 0.6); text-align: center; }
+.columns { display: grid; gap: 1rem; }
+.info { padding: 1rem; border-radius: 0.5rem; background: rgba(28, 131, 225, 0.1); color: #004280; }
+.tabs > input { position: absolute; opacity: 0; pointer-events: none; }
+.tabs > label { display: inline-block; padding: 0.5rem 0.75rem; cursor: pointer; border-bottom: 2px solid transparent; }
+.tabs > input:checked + label { color: #ff4b4b; border-bottom-color: #ff4b4b; }
+.tabs > section { display: none; padding-top: 1rem; border-top: 1px solid #e6eaf1; }
+"""
+
+
+# --- Markdown ---
+def _inline(text):
+    text = html.escape(text, quote=False)
+    text = re.sub(r"\*\*(.+?)\*\*", r"<strong>\1</strong>", text)
+    return re.sub(r"(?<!\*)\*(?!\s)(.+?)(?<!\s)\*", r"<em>\1</em>", text)
+
+
+def markdown_html(text, allow_html=False):
+    """Converts the Markdown subset content.json uses: headings, lists, rules, emphasis, paragraphs."""
+    if allow_html and text.lstrip().startswith("<"):
+        return text
+    out, paragraph, lists = [], [], []
+
+    def close_paragraph():
+        if paragraph:
+            out.append(f"<p>{_inline(' '.join(paragraph))}</p>")
+            paragraph.clear()
+
+    def close_lists(depth=0):
+        while len(lists) > depth:
+            out.append(f"</{lists.pop()[0]}>")
+
+    for line in text.splitlines():
+        stripped = line.strip()
+        item = re.match(r"(\s*)([-*]|\d+\.)\s+(.*)", line)
+        if not stripped:
+            close_paragraph()
+        elif re.fullmatch(r"-{3,}", stripped):
+            close_paragraph()
+            close_lists()
+            out.append("<hr>")
+        elif stripped.startswith("#"):
+            close_paragraph()
+            close_lists()
+            level = min(len(stripped) - len(stripped.lstrip("#")), 6)
+            out.append(f"<h{level}>{_inline(stripped[level:].strip())}</h{level}>")
+        elif item:
+            close_paragraph()
+            indent, tag = len(item.group(1)), "ul" if item.group(2) in "-*" else "ol"
+            while lists and lists[-1][1] > indent:
+                close_lists(len(lists) - 1)
+            if not lists or lists[-1][1] < indent:
+                out.append(f"<{tag}>")
+                lists.append((tag, indent))
+            out.append(f"<li>{_inline(item.group(3))}</li>")
+        else:
+            close_lists()
+            paragraph.append(stripped)
+    close_paragraph()
+    close_lists()
+    return "\n".join(out)
+
+
+# --- Assets ---
+class AssetWriter:
+    """Writes each image once under a content-hashed name and returns the markup that shows it."""
+
+    def __init__(self, out_dir, resolver, variants):
+        self.out_dir = out_dir
+        self.resolver = resolver
+        self.variants = variants["sources"]
+        self.cache = None
+        self.written = {}
+        self.bytes_written = 0
+
+    def _write(self, data, stem, ext):
+        name = f"{stem}.{hashlib.sha256(data).hexdigest()[:12]}.{ext}"
+        path = os.path.join(self.out_dir, "assets", name)
+        if not os.path.exists(path):
+            with open(path, "wb") as f:
+                f.write(data)
+            self.bytes_written += len(data)
+        return f"assets/{name}"
+
+    def _copy(self, path):
+        with open(path, "rb") as f:
+            data = f.read()
+        stem, ext = os.path.splitext(os.path.basename(path))
+        return self._write(data, stem, ext.lstrip("."))
+
+    def _source(self, ref):
+        """Returns the original bytes behind `ref`, from images/ or else from the image cache."""
+        local_path = self.resolver.local_path(ref)
+        if local_path:
+            with open(local_path, "rb") as f:
+                return f.read()
+        if self.cache is None:
+            self.cache = ImageCache()
+        return self.cache.get(self.resolver.remote_url(ref))
+
+    def _assets(self, ref):
+        if ref in self.written:
+            return self.written[ref]
+        name = self.resolver.name(ref) or os.path.basename(ref)
+        entry = self.variants.get(name)
+        if entry:
+            srcsets = {}
+            for v in sorted(entry["variants"], key=lambda v: v["width"]):
+                url = self._copy(os.path.join(DERIVED_DIR, v["file"]))
+                srcsets.setdefault(v["format"], []).append((url, v["width"]))
+            # WebP decodes in every current browser, so its widest variant is the fallback.
+            fallback = (srcsets.get("webp") or next(iter(srcsets.values())))[-1][0]
+            assets = {
+                "srcsets": srcsets,
+                "src": fallback,
+                "width": max(v["width"] for v in entry["variants"]),
+                "height": max(v["height"] for v in entry["variants"]),
+                "placeholder": entry.get("placeholder"),
+            }
+        else:
+            data = self._source(ref)
+            image, output_format = imaging.prepare(data=data, max_width=DISPLAY_WIDTH)
+            fmt, width, height = imaging.sniff(data)
+            if isinstance(image, bytes):
+                data, fmt = image, output_format
+                _, width, height = imaging.sniff(data)
+            stem = os.path.splitext(name)[0]
+            assets = {
+                "srcsets": {},
+                "src": self._write(data, stem, (fmt or "png").lower()),
+                "width": width,
+                "height": height,
+                "placeholder": None,
+            }
+        self.written[ref] = assets
+        return assets
+
+    def image(self, ref, caption, columns):
+        """Returns a <figure> for `ref` sized for a slot 1/`columns` of the content width."""
+        assets = self._assets(ref)
+        sizes = f"(max-width: 780px) {math.floor(100 / columns)}vw, {math.ceil(DISPLAY_WIDTH / 2 / columns)}px"
+        sources = "".join(
+            f'<source type="{MIME_TYPES[fmt]}" sizes="{sizes}" '
+            f'srcset="{", ".join(f"{url} {width}w" for url, width in candidates)}">'
+            for fmt, candidates in sorted(assets["srcsets"].items())
+        )
+        size = f' width="{assets["width"]}" height="{assets["height"]}"' if assets["width"] else ""
+        style = f' style="background-image: url({assets["placeholder"]})"' if assets["placeholder"] else ""
+        img = (
+            f'<img src="{assets["src"]}" alt="{html.escape(caption)}"{size}{style} '
+            f'loading="lazy" decoding="async">'
+        )
+        caption_html = f"<figcaption>{html.escape(caption)}</figcaption>" if caption else ""
+        return f"<figure><picture>{sources}{img}</picture>{caption_html}</figure>"
+
+
+# --- Plans ---
+def render_plan(plan, writer):
+    """Renders a compiled content plan (see content.compile_blocks) as HTML."""
+    out = []
+    for op in plan:
+        kind = op[0]
+        if kind == "markdown":
+            out.append(markdown_html(op[1], op[2]))
+        elif kind == "card":
+            out.append(op[1])
+        elif kind == "header":
+            out.append(f"<h2>{_inline(op[1])}</h2>")
+        elif kind == "subheader":
+            out.append(f"<h3>{_inline(op[1])}</h3>")
+        elif kind == "info":
+            out.append(f'<div class="info">{_inline(op[1])}</div>')
+        elif kind == "image":
+            out.append(writer.image(op[1], op[2], op[3]))
+        elif kind == "columns":
+            cells = "".join(f"<div>{render_plan(sub, writer)}</div>" for sub in op[1])
+            out.append(f'<div class="columns" style="grid-template-columns: repeat({len(op[1])}, 1fr)">{cells}</div>')
+        elif kind == "feature_section":
+            _, title, features, image_files = op
+            out.append(f"<h2>{_inline(title)}</h2>")
+            out.append(markdown_html(features))
+            # Same cyclic 3-column assignment as components.feature_section.
+            num_cols = min(len(image_files), 3)
+            if num_cols:
+                cells = [[] for _ in range(num_cols)]
+                for i, file in enumerate(image_files):
+                    cells[i % num_cols].append(writer.image(os.path.join("images", file), "", num_cols))
+                cols = "".join(f"<div>{''.join(cell)}</div>" for cell in cells)
+                out.append(f'<div class="columns" style="grid-template-columns: repeat({num_cols}, 1fr)">{cols}</div>')
+        elif kind == "demo":
+            # Live demos need the Streamlit server; the static page points there instead.
+            out.append('<div class="info">A live, interactive demo of this module runs in the app.</div>')
+        else:
+            raise ValueError(f"Cannot export plan op {kind!r}")
+    return "\n".join(out)
+
+
+def render_page(app, writer):
+    """Renders a compiled app as a complete HTML document with every module in CSS tabs."""
+    slugs = list(app["modules"])
+    tab_css = "\n".join(
+        f"#tab-{slug}:checked ~ #{slug} {{ display: block; }}" for slug in slugs
+    )
+    tabs = []
+    for i, slug in enumerate(slugs):
+        checked = " checked" if i == 0 else ""
+        tabs.append(f'<input type="radio" name="module" id="tab-{slug}"{checked}>')
+        tabs.append(f'<label for="tab-{slug}">{html.escape(app["modules"][slug]["title"])}</label>')
+    panels = [
+        f'<section id="{slug}">{render_plan(app["modules"][slug]["plan"], writer)}</section>' for slug in slugs
+    ]
+    # Deep links (#crm) select their tab; everything else works without script.
+    deep_link = (
+        "<script>var t=document.getElementById('tab-'+location.hash.slice(1));if(t)t.checked=true;"
+        "document.querySelectorAll('.tabs>input').forEach(function(i){i.addEventListener('change',"
+        "function(){history.replaceState(null,'','#'+i.id.slice(4))})})</script>"
+    )
+    return f"""<!DOCTYPE html>
+<html lang="en">
+<head>
+<meta charset="utf-8">
+<meta name="viewport" content="width=device-width, initial-scale=1">
+<title>{html.escape(app["title"])}</title>
+<style>{STYLE}{tab_css}</style>
+</head>
+<body>
+<div class="layout">
+<aside>{render_plan(app["sidebar"], writer)}</aside>
+<main>
+<h1>{_inline(app["title"])}</h1>
+{render_plan(app["intro"], writer)}
+<div class="tabs">
+{"".join(tabs)}
+{"".join(panels)}
+</div>
+{render_plan(app["footer"], writer)}
+</main>
+</div>
+{deep_link}
+</body>
+</html>
+"""
+
+
+def export_app(name, spec, out_dir, resolver, variants):
+    """Writes one app's index.html and assets into `out_dir`, returning (html bytes, asset bytes)."""
+    shutil.rmtree(out_dir, ignore_errors=True)
+    os.makedirs(os.path.join(out_dir, "assets"))
+    writer = AssetWriter(out_dir, resolver, variants)
+    page = render_page(compile_app(spec), writer).encode("utf-8")
+    with open(os.path.join(out_dir, "index.html"), "wb") as f:
+        f.write(page)
+    return len(page), writer.bytes_written
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--content", default=CONTENT_PATH)
+    parser.add_argument("--apps", nargs="+", help="apps to export (default: all)")
+    parser.add_argument("--output", default="dist")
+    args = parser.parse_args()
+
+    with open(args.content) as f:
+        doc = json.load(f)
+    variants = load_variants()
+    if not variants["sources"]:
+        print("no derivatives found; run tools/build_derivatives.py for AVIF/WebP srcsets")
+    resolver = AssetResolver(load_manifest(), variants=variants)
+    for name in args.apps or list(doc["apps"]):
+        out_dir = os.path.join(args.output, name)
+        page_bytes, asset_bytes = export_app(name, doc["apps"][name], out_dir, resolver, variants)
+        print(f"{out_dir}/index.html: {page_bytes / 1024:.0f} KiB page, {asset_bytes / 1024:.0f} KiB assets")
+
+
+if __name__ == "__main__":
+    main()
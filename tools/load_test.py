@@ -0,0 +1,243 @@
+"""Load test: many concurrent browser sessions against a live server, with latency and server memory.
+
+    python tools/load_test.py [--script app.py] [--sessions 1 5 10 25] [--actions 6]
+                              [--latency-ms 40] [--bandwidth-kbps 20000] [--output load_test.json]
+
+Starts a StubBlobHost in place of the blob store and, for each cache configuration,
+a fresh `streamlit run` server that has only the blob host to load screenshots from
+(the bundled images/ directory is hidden). For every N in --sessions, N simulated tabs
+(tools/streamlit_client.Session) each open the app and then perform --actions
+alternating tab switches (a click on the next module in the sidebar radio) and plain
+reruns of the current module, all at once. A run that does not render the expected
+module's header counts as an error. Reported per step:
+
+  * p50/p95/p99 latency of a rerun, from the request until its last media file arrived;
+  * server RSS after the step (and its peak during it) and growth over the idle server;
+  * bytes held by Streamlit's media file manager while the N sessions are still open,
+    and by st.cache_resource/st.cache_data, from the server's /_stcore/metrics;
+  * requests that reached the blob host.
+
+Configurations:
+
+  cached    the defaults: image bytes shared through the process-wide ImageCache
+            (memory + disk), downscaled copies memoised, background warm-up on
+  uncached  METSYS_IMAGE_TTL=0 and zero memory budgets: every rerun revalidates every
+            image with the blob host and reads it back from disk, and no warm-up runs
+
+The compiled content and the ImageCache object itself stay in st.cache_resource in
+both, since the scripts cannot run without them.
+"""
+import argparse
+import json
+import os
+import re
+import socket
+import statistics
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+import requests  # noqa: E402
+
+from stub_blob_host import StubBlobHost  # noqa: E402
+from streamlit_client import Session, wait_until_healthy  # noqa: E402
+
+SCRIPTS = {"app.py": "showcase", "1app.py": "overview"}
+CONFIGS = {
+    "uncached": {
+        "METSYS_IMAGE_TTL": "0",
+        "METSYS_IMAGE_MEMORY_BYTES": "0",
+        "METSYS_RESIZED_MEMORY_BYTES": "0",
+        "METSYS_WARMUP": "0",
+    },
+    "cached": {},
+}
+CACHE_BYTES = re.compile(r'^cache_memory_bytes\{cache_type="([^"]*)",cache="[^"]*"\} (\S+)$', re.M)
+
+
+def free_port():
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+def rss_bytes(pid):
+    """Resident set size of `pid` from /proc (Linux only)."""
+    with open(f"/proc/{pid}/status") as f:
+        for line in f:
+            if line.startswith("VmRSS:"):
+                return int(line.split()[1]) * 1024
+    return 0
+
+
+def cache_bytes(base_url):
+    """Returns {cache type: bytes} from the server's /_stcore/metrics."""
+    text = requests.get(base_url + "/_stcore/metrics", timeout=10).text
+    totals = {}
+    for cache_type, value in CACHE_BYTES.findall(text):
+        totals[cache_type] = totals.get(cache_type, 0) + float(value)
+    return totals
+
+
+def module_headers(app_name):
+    """(slug, sidebar title, first header on the page) per module of `app_name` in content.json."""
+    with open(os.path.join(ROOT, "content.json")) as f:
+        modules = json.load(f)["apps"][app_name]["modules"]
+    return [
+        (module["slug"], module["title"], module["blocks"][0].get("text") or module["blocks"][0]["title"])
+        for module in modules
+    ]
+
+
+def checked(result, module):
+    """Returns the run's latency, raising if the page is not `module`'s."""
+    if module[2] not in result["headings"]:
+        raise AssertionError(f"expected {module[0]}, page showed {result['headings'][:2]}")
+    return result["seconds"]
+
+
+def visitor(base_url, modules, offset, actions, latencies, errors, sessions):
+    """One tab: opens the app on a module, then alternates tab switches and reruns.
+
+    A tab switch picks the next module in the sidebar radio, as a click does; every run
+    is checked to have rendered the expected module's header.
+    """
+    try:
+        session = Session(base_url)
+        sessions.append(session)
+        current = offset % len(modules)
+        checked(session.run(f"module={modules[current][0]}"), modules[current])
+        for action in range(actions):
+            if action % 2 == 0:
+                current = (current + 1) % len(modules)
+            result = session.run(f"module={modules[current][0]}", pick={"Modules": modules[current][1]})
+            latencies.append(checked(result, modules[current]))
+    except Exception as e:  # noqa: BLE001 - recorded and reported, not fatal to the run
+        errors.append(repr(e))
+
+
+def run_step(base_url, pid, modules, n, actions, host):
+    latencies, errors, sessions = [], [], []
+    peak = [0]
+    done = threading.Event()
+
+    def sample():
+        while not done.wait(0.1):
+            peak[0] = max(peak[0], rss_bytes(pid))
+
+    sampler = threading.Thread(target=sample, daemon=True)
+    sampler.start()
+    host.reset_counts()
+    threads = [
+        threading.Thread(target=visitor, args=(base_url, modules, i, actions, latencies, errors, sessions))
+        for i in range(n)
+    ]
+    started = time.perf_counter()
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    elapsed = time.perf_counter() - started
+    done.set()
+    sampler.join()
+    # Measured while every session is still connected, since Streamlit frees a session's media on close.
+    rss = rss_bytes(pid)
+    caches = cache_bytes(base_url)
+    for session in sessions:
+        session.close()
+
+    latencies.sort()
+
+    def pct(q):
+        return latencies[min(int(q * len(latencies)), len(latencies) - 1)] * 1000 if latencies else None
+
+    return {
+        "sessions": n,
+        "reruns": len(latencies),
+        "seconds": elapsed,
+        "mean_ms": statistics.mean(latencies) * 1000 if latencies else None,
+        "p50_ms": pct(0.50),
+        "p95_ms": pct(0.95),
+        "p99_ms": pct(0.99),
+        "rss_bytes": rss,
+        "peak_rss_bytes": max(peak[0], rss),
+        "media_bytes": caches.get("st_memory_media_file_storage", 0),
+        "cache_bytes": {name: b for name, b in caches.items() if name != "st_memory_media_file_storage"},
+        "blob_requests": host.counts["requests"],
+        "errors": len(errors),
+        "first_error": errors[0] if errors else None,
+    }
+
+
+def run_config(name, args, modules, host):
+    env = dict(
+        os.environ,
+        METSYS_URL_REWRITE=host.rewrite_rule(),
+        METSYS_IMAGES_DIR=tempfile.mkdtemp(prefix="load-images-"),
+        METSYS_MANIFEST=os.path.join(ROOT, "images", "manifest.json"),
+        METSYS_CACHE_DIR=tempfile.mkdtemp(prefix="load-cache-"),
+        **CONFIGS[name],
+    )
+    port = free_port()
+    base_url = f"http://127.0.0.1:{port}"
+    server = subprocess.Popen(
+        [sys.executable, "-m", "streamlit", "run", args.script, "--server.headless", "true",
+         "--server.port", str(port), "--browser.gatherUsageStats", "false"],
+        cwd=ROOT, env=env, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL,
+    )
+    try:
+        wait_until_healthy(base_url)
+        idle = rss_bytes(server.pid)
+        steps = [run_step(base_url, server.pid, modules, n, args.actions, host) for n in args.sessions]
+    finally:
+        server.terminate()
+        server.wait()
+    for step in steps:
+        step["rss_growth_bytes"] = step["rss_bytes"] - idle
+    return {"idle_rss_bytes": idle, "steps": steps}
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--script", choices=list(SCRIPTS), default="app.py")
+    parser.add_argument("--sessions", type=int, nargs="+", default=[1, 5, 10, 25])
+    parser.add_argument("--actions", type=int, default=6, help="tab switches and reruns per session")
+    parser.add_argument("--latency-ms", type=float, default=40)
+    parser.add_argument("--bandwidth-kbps", type=float, default=20000, help="0 for unlimited")
+    parser.add_argument("--configs", nargs="+", choices=list(CONFIGS), default=list(CONFIGS))
+    parser.add_argument("--output", default="load_test.json")
+    args = parser.parse_args()
+
+    modules = module_headers(SCRIPTS[args.script])
+    host = StubBlobHost(
+        latency=args.latency_ms / 1000, bandwidth=int(args.bandwidth_kbps * 125),
+        images_dir=os.path.join(ROOT, "images"),
+    ).start()
+    try:
+        results = {name: run_config(name, args, modules, host) for name in args.configs}
+    finally:
+        host.stop()
+
+    mb = 1024 * 1024
+    print(f"{'config':<10}{'N':>4}{'reruns':>7}{'p50 ms':>8}{'p95 ms':>8}{'p99 ms':>8}"
+          f"{'RSS MB':>8}{'peak':>7}{'growth':>8}{'media MB':>9}{'blob req':>9}{'errors':>7}")
+    for name, r in results.items():
+        for s in r["steps"]:
+            print(
+                f"{name:<10}{s['sessions']:>4}{s['reruns']:>7}{s['p50_ms'] or 0:>8.0f}{s['p95_ms'] or 0:>8.0f}"
+                f"{s['p99_ms'] or 0:>8.0f}{s['rss_bytes'] / mb:>8.0f}{s['peak_rss_bytes'] / mb:>7.0f}"
+                f"{s['rss_growth_bytes'] / mb:>8.0f}{s['media_bytes'] / mb:>9.1f}{s['blob_requests']:>9}"
+                f"{s['errors']:>7}"
+            )
+    with open(args.output, "w") as f:
+        json.dump({"params": vars(args), "modules": [slug for slug, _, _ in modules], "results": results}, f, indent=1)
+    print(f"wrote {args.output}")
+
+
+if __name__ == "__main__":
+    main()
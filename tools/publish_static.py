@@ -0,0 +1,92 @@
+"""Publishes the screenshots and their derivatives to static/img/ for Streamlit's static file serving.
+
+    python tools/publish_static.py
+
+Every image in images/ and every variant in images/derived/index.json is copied to
+static/img/ under a content-hashed name, and static/img/index.json maps each
+screenshot name to its copies. With server.enableStaticServing (see
+.streamlit/config.toml) they are served at /app/static/img/, and with
+METSYS_STATIC_IMAGES=1 the display helpers pass those URLs to st.image instead
+of pushing the bytes through the websocket media manager.
+
+Streamlit sends Last-Modified but no Cache-Control for static files (and cannot be
+configured to), so browsers only cache them heuristically. Because a file's name
+changes whenever its content does, a proxy in front of the app can cache
+/app/static/img/ as immutable, or static/img/ can be synced to a CDN and
+METSYS_STATIC_URL pointed at it. Files no longer referenced are removed.
+"""
+import argparse
+import hashlib
+import json
+import os
+import shutil
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import imaging  # noqa: E402
+from assets import DERIVED_DIR, IMAGES_DIR, STATIC_DIR, STATIC_INDEX, load_variants  # noqa: E402
+
+SOURCE_EXTENSIONS = (".png", ".jpg", ".jpeg", ".gif", ".webp", ".avif")
+
+
+def publish(path, out_dir):
+    """Copies `path` into `out_dir` as <stem>.<hash>.<ext> and returns the new file name."""
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(1 << 20), b""):
+            digest.update(chunk)
+    stem, ext = os.path.splitext(os.path.basename(path))
+    name = f"{stem}.{digest.hexdigest()[:12]}{ext.lower()}"
+    target = os.path.join(out_dir, name)
+    if not os.path.exists(target):
+        shutil.copyfile(path, target)
+    return name
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--images", default=IMAGES_DIR)
+    parser.add_argument("--output", default=STATIC_DIR)
+    args = parser.parse_args()
+
+    os.makedirs(args.output, exist_ok=True)
+    derived = load_variants()["sources"]
+    sources = {}
+    for name in sorted(os.listdir(args.images)):
+        path = os.path.join(args.images, name)
+        if not name.lower().endswith(SOURCE_EXTENSIONS) or not os.path.isfile(path):
+            continue
+        _, width, height = imaging.sniff_file(path)
+        variants = []
+        for v in derived.get(name, {}).get("variants", []):
+            variant_path = os.path.join(DERIVED_DIR, v["file"])
+            if os.path.isfile(variant_path):
+                variants.append(dict(v, file=publish(variant_path, args.output)))
+        sources[name] = {
+            "file": publish(path, args.output),
+            "width": width,
+            "height": height,
+            "bytes": os.path.getsize(path),
+            "variants": variants,
+        }
+
+    index_path = os.path.join(args.output, os.path.basename(STATIC_INDEX))
+    with open(index_path, "w") as f:
+        json.dump({"sources": sources}, f, indent=1, sort_keys=True)
+
+    keep = {entry["file"] for entry in sources.values()}
+    keep.update(v["file"] for entry in sources.values() for v in entry["variants"])
+    keep.add(os.path.basename(index_path))
+    removed = 0
+    for name in os.listdir(args.output):
+        if name not in keep:
+            os.remove(os.path.join(args.output, name))
+            removed += 1
+    total = sum(os.path.getsize(os.path.join(args.output, name)) for name in keep)
+    print(f"published {len(sources)} images, {len(keep) - 1} files ({total / 1e6:.1f} MB) to {args.output}; "
+          f"removed {removed} stale files")
+
+
+if __name__ == "__main__":
+    main()
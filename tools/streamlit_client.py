@@ -0,0 +1,152 @@
+"""Headless Streamlit client: opens a session over the app's websocket and runs the script like a browser tab.
+
+Used by the benchmark and load-test tools to drive a live `streamlit run` server
+without a browser. A Session is one websocket session; each run asks for a script
+rerun with the given query string and widget values and reads ForwardMsgs until the
+run finishes, then (like a browser) downloads every /media/ URL the run produced.
+page_view is a single run in a fresh session.
+
+Like a browser, a session sends back every widget value it has set on each rerun, so
+picking a module in the sidebar radio (pick={"Modules": title}) sticks. The query
+string only seeds a new session's module, as in the app.
+"""
+import time
+from urllib.parse import urljoin
+
+import requests
+from streamlit.proto.BackMsg_pb2 import BackMsg
+from streamlit.proto.ForwardMsg_pb2 import ForwardMsg
+from streamlit.proto.WidgetStates_pb2 import WidgetState
+from websockets.sync.client import connect
+
+
+def _media_urls(msg):
+    delta = msg.delta
+    if delta.WhichOneof("type") != "new_element" or delta.new_element.WhichOneof("type") != "imgs":
+        return []
+    return [img.url for img in delta.new_element.imgs.imgs if not img.url.startswith("data:")]
+
+
+def _element(msg):
+    delta = msg.delta
+    if delta.WhichOneof("type") != "new_element":
+        return None, None
+    kind = delta.new_element.WhichOneof("type")
+    return kind, getattr(delta.new_element, kind) if kind else None
+
+
+class Session:
+    """One browser tab: a websocket session that can be asked to rerun the script many times.
+
+    Like a browser's cache, media URLs already downloaded in this session are not
+    fetched again.
+    """
+
+    def __init__(self, base_url, http=None, timeout=60):
+        self.base_url = base_url.rstrip("/")
+        self.http = http or requests.Session()
+        self.timeout = timeout
+        self.fetched = set()
+        # Radio label -> (widget id, options) from the last run, and the values set since.
+        self.radios = {}
+        self.widget_states = {}
+        ws_url = "ws" + self.base_url[len("http"):] + "/_stcore/stream"
+        start = time.perf_counter()
+        self.ws = connect(ws_url, subprotocols=["streamlit"], max_size=None, open_timeout=timeout)
+        self.connect_seconds = time.perf_counter() - start
+
+    def run(self, query_string="", pick=None, fetch_media=True):
+        """Reruns the script for `query_string` and returns timings and byte counts.
+
+        `pick` maps radio labels seen in an earlier run to the option to pick, like a
+        click. The result has `seconds` (until the last media file arrived),
+        `first_delta_seconds` (until the first element arrived), `script_seconds` (until
+        script_finished), `messages`, `ws_bytes`, `media_files`, `media_bytes` and
+        `headings` (the text of every heading rendered, in order).
+        """
+        for label, option in (pick or {}).items():
+            widget_id, options = self.radios[label]
+            if option not in options:
+                raise ValueError(f"{option!r} is not an option of the {label!r} radio")
+            self.widget_states[widget_id] = WidgetState(id=widget_id, string_value=option)
+        start = time.perf_counter()
+        messages = ws_bytes = 0
+        first_delta_seconds = None
+        media, headings = [], []
+        back = BackMsg()
+        back.rerun_script.query_string = query_string
+        back.rerun_script.widget_states.widgets.extend(self.widget_states.values())
+        self.ws.send(back.SerializeToString())
+        while True:
+            data = self.ws.recv(timeout=self.timeout)
+            messages += 1
+            ws_bytes += len(data)
+            msg = ForwardMsg()
+            msg.ParseFromString(data)
+            kind = msg.WhichOneof("type")
+            if kind == "delta":
+                if first_delta_seconds is None:
+                    first_delta_seconds = time.perf_counter() - start
+                media.extend(_media_urls(msg))
+                kind, element = _element(msg)
+                if kind == "heading":
+                    headings.append(element.body)
+                elif kind == "radio":
+                    self.radios[element.label] = (element.id, list(element.options))
+            elif kind == "script_finished":
+                break
+        script_seconds = time.perf_counter() - start
+        media_bytes = 0
+        if fetch_media:
+            for url in dict.fromkeys(media):
+                if url in self.fetched:
+                    continue
+                response = self.http.get(urljoin(self.base_url + "/", url.lstrip("/")), timeout=self.timeout)
+                response.raise_for_status()
+                media_bytes += len(response.content)
+                self.fetched.add(url)
+        return {
+            "seconds": time.perf_counter() - start,
+            "first_delta_seconds": first_delta_seconds,
+            "script_seconds": script_seconds,
+            "messages": messages,
+            "ws_bytes": ws_bytes,
+            "media_files": len(set(media)),
+            "media_bytes": media_bytes,
+            "headings": headings,
+        }
+
+    def close(self):
+        self.ws.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+def page_view(base_url, query_string="", http=None, fetch_media=True, timeout=60):
+    """Runs the app once for `query_string` in a fresh session; see Session.run for the result.
+
+    Timings include opening the websocket.
+    """
+    with Session(base_url, http=http, timeout=timeout) as session:
+        result = session.run(query_string, fetch_media=fetch_media)
+    for key in ("seconds", "first_delta_seconds", "script_seconds"):
+        if result[key] is not None:
+            result[key] += session.connect_seconds
+    return result
+
+
+def wait_until_healthy(base_url, timeout=60):
+    """Blocks until the server answers /_stcore/health, raising TimeoutError otherwise."""
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        try:
+            if requests.get(base_url.rstrip("/") + "/_stcore/health", timeout=1).ok:
+                return
+        except requests.RequestException:
+            pass
+        time.sleep(0.2)
+    raise TimeoutError(f"Streamlit server at {base_url} did not become healthy")
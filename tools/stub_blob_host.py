@@ -0,0 +1,186 @@
+"""Local stand-in for the screenshot blob store, with configurable latency, bandwidth and faults.
+
+    python tools/stub_blob_host.py [--port 8765] [--latency-ms 80] [--bandwidth-kbps 2000]
+
+Serves every asset in images/manifest.json under the same path it has on the blob
+store, with ETag/Last-Modified validators and 304 responses, so the app can run
+against it by setting
+
+    METSYS_URL_REWRITE=https://hebbkx1anhila5yf.public.blob.vercel-storage.com=http://127.0.0.1:8765
+
+The benchmark and load-test tools start it in-process via StubBlobHost.
+"""
+import argparse
+import email.utils
+import hashlib
+import os
+import random
+import sys
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import urlsplit
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from assets import IMAGES_DIR, load_manifest  # noqa: E402
+
+BLOB_STORE = "https://hebbkx1anhila5yf.public.blob.vercel-storage.com"
+
+
+class _Server(ThreadingHTTPServer):
+    # The default listen backlog of 5 drops bursts of concurrent connects, which then
+    # wait about a second for a SYN retransmit and show up as latency.
+    request_queue_size = 128
+    daemon_threads = True
+
+
+class StubBlobHost:
+    """Threaded HTTP server serving manifest assets by their blob-store path.
+
+    `latency` (seconds) is added before each response and `bandwidth` (bytes per
+    second, 0 for unlimited) throttles bodies. `error_rate` answers that fraction
+    of requests with a 503, and `stall_rate` holds them for `stall` seconds first.
+    With a `seed`, whether the n-th request for a path fails or stalls is fixed by
+    (seed, path, n) (see fault), so a run's faults do not depend on thread timing.
+    """
+
+    def __init__(self, port=0, latency=0.0, bandwidth=0, error_rate=0.0, stall_rate=0.0, stall=30.0,
+                 images_dir=IMAGES_DIR, manifest=None, seed=None):
+        self.seed = seed
+        self._requests_by_path = {}
+        self.latency = latency
+        self.bandwidth = bandwidth
+        self.error_rate = error_rate
+        self.stall_rate = stall_rate
+        self.stall = stall
+        self.files = {}
+        for name, entry in (manifest or load_manifest())["assets"].items():
+            path = os.path.join(images_dir, name)
+            if entry.get("url") and os.path.isfile(path):
+                self.files[urlsplit(entry["url"]).path] = path
+        self._bodies = {}
+        self._lock = threading.Lock()
+        self.reset_counts()
+        self.server = _Server(("127.0.0.1", port), self._handler())
+        self.port = self.server.server_address[1]
+        self.base_url = f"http://127.0.0.1:{self.port}"
+
+    def reset_counts(self):
+        with self._lock:
+            self.counts = {"requests": 0, "ok": 0, "not_modified": 0, "errors": 0, "bytes_sent": 0}
+
+    def _count(self, name, amount=1):
+        with self._lock:
+            self.counts[name] += amount
+
+    def fault(self, path, n):
+        """Returns (stall, error) for the n-th (from 0) request for `path`."""
+        rng = random.Random(f"{self.seed}:{path}:{n}") if self.seed is not None else random
+        return rng.random() < self.stall_rate, rng.random() < self.error_rate
+
+    def _next_fault(self, path):
+        with self._lock:
+            n = self._requests_by_path.get(path, 0)
+            self._requests_by_path[path] = n + 1
+        return self.fault(path, n)
+
+    def _body(self, path):
+        body = self._bodies.get(path)
+        if body is None:
+            with open(self.files[path], "rb") as f:
+                data = f.read()
+            mtime = os.path.getmtime(self.files[path])
+            body = self._bodies[path] = (
+                data,
+                '"' + hashlib.sha256(data).hexdigest()[:32] + '"',
+                email.utils.formatdate(mtime, usegmt=True),
+            )
+        return body
+
+    def _handler(self):
+        host = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+
+            def log_message(self, *args):
+                pass
+
+            def do_GET(self):
+                host._count("requests")
+                time.sleep(host.latency)
+                path = urlsplit(self.path).path
+                stall, error = host._next_fault(path)
+                if stall:
+                    time.sleep(host.stall)
+                if error:
+                    host._count("errors")
+                    self.send_response(503)
+                    self.send_header("Content-Length", "0")
+                    self.end_headers()
+                    return
+                if path not in host.files:
+                    self.send_response(404)
+                    self.send_header("Content-Length", "0")
+                    self.end_headers()
+                    return
+                data, etag, last_modified = host._body(path)
+                if self.headers.get("If-None-Match") == etag:
+                    host._count("not_modified")
+                    self.send_response(304)
+                    self.send_header("ETag", etag)
+                    self.send_header("Content-Length", "0")
+                    self.end_headers()
+                    return
+                self.send_response(200)
+                self.send_header("Content-Type", "image/png")
+                self.send_header("Content-Length", str(len(data)))
+                self.send_header("ETag", etag)
+                self.send_header("Last-Modified", last_modified)
+                self.end_headers()
+                chunk = 64 * 1024
+                for offset in range(0, len(data), chunk):
+                    piece = data[offset:offset + chunk]
+                    self.wfile.write(piece)
+                    if host.bandwidth:
+                        time.sleep(len(piece) / host.bandwidth)
+                host._count("ok")
+                host._count("bytes_sent", len(data))
+
+        return Handler
+
+    def rewrite_rule(self):
+        """Returns the METSYS_URL_REWRITE value that points the app at this host."""
+        return f"{BLOB_STORE}={self.base_url}"
+
+    def start(self):
+        threading.Thread(target=self.server.serve_forever, daemon=True).start()
+        return self
+
+    def stop(self):
+        self.server.shutdown()
+        self.server.server_close()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--latency-ms", type=float, default=0)
+    parser.add_argument("--bandwidth-kbps", type=float, default=0, help="0 for unlimited")
+    parser.add_argument("--error-rate", type=float, default=0)
+    parser.add_argument("--stall-rate", type=float, default=0)
+    args = parser.parse_args()
+    host = StubBlobHost(
+        args.port, args.latency_ms / 1000, int(args.bandwidth_kbps * 125), args.error_rate, args.stall_rate
+    )
+    print(f"serving {len(host.files)} assets on {host.base_url}")
+    print(f"METSYS_URL_REWRITE={host.rewrite_rule()}")
+    try:
+        host.server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()